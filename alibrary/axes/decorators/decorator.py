@@ -1,6 +1,7 @@
 """Module defining an axis decorator."""
 from alibrary.axes.interface import AxisInterface
 from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.abstract.motor import Motor
 
 class AxisDecorator(AxisInterface):
@@ -27,9 +28,11 @@ class AxisDecorator(AxisInterface):
         """Returns this axis infos."""
         return self._axis.get_command()
 
-    def start_motion(self, command: MotionCommand) -> None:
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """STarts a motion on this axis."""
-        self._axis.start_motion(command)
+        return self._axis.start_motion(command, track)
 
     def stop_motion(self) -> None:
         """Stops a motion on this axis."""
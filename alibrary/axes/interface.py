@@ -2,6 +2,7 @@
 """
 from abc import ABC
 from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.abstract.motor import Motor
 
 class AxisInterface(ABC):
@@ -24,14 +25,21 @@ class AxisInterface(ABC):
         """
         return self.motor.get_command()
 
-    def start_motion(self, command: MotionCommand) -> None:
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion on this axis.
 
         Args:
             command: A MotionCommand object that will be send to this axis
             motor.
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
         """
-        self.motor.start(command)
+        return self.motor.start(command, track)
 
     def stop_motion(self) -> None:
         """Stops any currently running motion on this axis motor."""
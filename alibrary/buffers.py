@@ -0,0 +1,118 @@
+"""Module defining a preallocated ring buffer of numeric samples.
+
+The samples are rows of a NumPy array allocated once, at the creation of the
+buffer. Appending a sample only writes its values in place and moves an index,
+so a background thread can record hundreds of samples per second without
+allocating memory. Once full, the oldest samples are overwritten.
+
+The first column holds the timestamps, used to select the samples of a time
+window.
+
+Typical usage example:
+
+buffer = RingBuffer(1000, ("timestamp", "position", "speed"))
+buffer.append((time.monotonic(), position, speed))
+positions = buffer.column("position")
+"""
+import threading
+
+import numpy as np
+
+
+class RingBuffer:
+    """A fixed-size buffer of timestamped samples.
+
+    Attributes:
+        capacity: The maximum number of samples kept
+        columns: The name of each column, the first one being the timestamp
+    """
+
+    def __init__(self,
+                 capacity: int,
+                 columns: tuple[str, ...],
+                 dtype: np.dtype = np.float64) -> None:
+        if capacity <= 0:
+            raise ValueError("The capacity of a ring buffer must be positive")
+
+        self.capacity = capacity
+        self.columns = tuple(columns)
+
+        self.__lock = threading.Lock()
+        self.__data = np.zeros((capacity, len(self.columns)), dtype=dtype)
+        # Index of the next sample to write
+        self.__index = 0
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def is_full(self) -> bool:
+        """Returns True if the oldest samples are being overwritten."""
+        return self.__count == self.capacity
+
+    def append(self, values):
+        """Writes a sample in place of the oldest one.
+
+        Args:
+            values: A sequence with a value for each column
+        """
+        with self.__lock:
+            self.__data[self.__index] = values
+            self.__index = (self.__index + 1) % self.capacity
+            if self.__count < self.capacity:
+                self.__count += 1
+
+    def clear(self):
+        """Removes every sample, keeping the allocated memory."""
+        with self.__lock:
+            self.__index = 0
+            self.__count = 0
+
+    def get_samples(self,
+                    start: float | None = None,
+                    end: float | None = None) -> np.ndarray:
+        """Returns a copy of the samples, from the oldest to the newest.
+
+        Args:
+            start: The minimum timestamp of the samples, None for no limit
+            end: The maximum timestamp of the samples, None for no limit
+
+        Returns:
+            A 2D array with one row per sample and one column per name
+        """
+        with self.__lock:
+            if self.__count < self.capacity:
+                samples = self.__data[:self.__count].copy()
+            else:
+                samples = np.roll(self.__data, -self.__index, axis=0)
+
+        if start is not None or end is not None:
+            timestamps = samples[:, 0]
+            first = (0 if start is None else
+                     np.searchsorted(timestamps, start, side="left"))
+            last = (len(samples) if end is None else
+                    np.searchsorted(timestamps, end, side="right"))
+            samples = samples[first:last]
+        return samples
+
+    def column(self, name: str, start: float | None = None,
+               end: float | None = None) -> np.ndarray:
+        """Returns a copy of one column, from the oldest to the newest sample.
+
+        Args:
+            name: The name of the column
+            start: The minimum timestamp of the samples, None for no limit
+            end: The maximum timestamp of the samples, None for no limit
+
+        Returns:
+            A 1D array with the values of the column
+        """
+        return self.get_samples(start, end)[:, self.columns.index(name)]
+
+    def latest(self) -> np.ndarray | None:
+        """Returns a copy of the newest sample, None if the buffer is empty."""
+        with self.__lock:
+            if self.__count == 0:
+                return None
+            return self.__data[self.__index - 1].copy()
@@ -3,6 +3,8 @@
 It is the gateway between Python and the various PLC.
 """
 
+from alibrary.electronics.async_modbus import AsyncModbusComponent
+from alibrary.electronics.connection import ConnectionManager, ConnectionState
 from alibrary.electronics.controllino import (
     ControllinoError,
     ControllinoPacket,
@@ -11,10 +13,31 @@ from alibrary.electronics.controllino import (
     Controllino,
 )
 from alibrary.electronics.ethernet import EthernetComponent
-from alibrary.electronics.modbus import ModbusComponent, ModbusError
-from alibrary.electronics.pcb import PssPCB, PssPCBError
+from alibrary.electronics.modbus import (
+    ModbusComponent,
+    ModbusError,
+    modbus_operation,
+)
+from alibrary.electronics.modbus_cache import ModbusRegisterCache
+from alibrary.electronics.modbus_pipeline import (
+    ModbusPipeline,
+    ModbusPipelineError,
+)
+from alibrary.electronics.pcb import (
+    PressureSnapshot,
+    PssPCB,
+    PssPCBError,
+    PssPCBOpcode,
+    StepperStatus,
+)
+from alibrary.electronics.pressure_sampler import PressureSampler
+from alibrary.electronics.register_map import ModbusField, ModbusRegisterMap
+from alibrary.electronics.stats import TransactionStats
 
 __all__ = [
+    "AsyncModbusComponent",
+    "ConnectionManager",
+    "ConnectionState",
     "Controllino",
     "ControllinoPLC",
     "ControllinoError",
@@ -23,6 +46,17 @@ __all__ = [
     "EthernetComponent",
     "ModbusComponent",
     "ModbusError",
+    "ModbusField",
+    "ModbusPipeline",
+    "ModbusPipelineError",
+    "ModbusRegisterCache",
+    "ModbusRegisterMap",
+    "PressureSampler",
+    "PressureSnapshot",
     "PssPCB",
     "PssPCBError",
+    "PssPCBOpcode",
+    "StepperStatus",
+    "TransactionStats",
+    "modbus_operation",
 ]
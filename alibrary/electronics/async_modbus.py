@@ -0,0 +1,315 @@
+"""Module defining an asynchronous interface to a Modbus component.
+
+It is the asyncio counterpart of ModbusComponent, built on the pymodbus
+asyncio client. Requests sent to different components can be awaited
+concurrently, so polling N components costs about one round trip instead of N.
+
+Typical usage example:
+
+component = AsyncModbusComponent(ip="10.10.192.90")
+await component.connect()
+value = await component.read_register(address=1234)
+component.close()
+"""
+import struct
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
+
+from alibrary.electronics.ethernet import EthernetComponent
+from alibrary.electronics.modbus import ModbusError
+from alibrary.electronics.register_map import MAX_BLOCK_SIZE, ModbusRegisterMap
+from alibrary.logger import logger
+
+
+class AsyncModbusComponent(EthernetComponent):
+    """An asynchronous interface to a Modbus component.
+
+    It exposes awaitable versions of the ModbusComponent methods. The
+    connection is not opened in the constructor because it is bound to the
+    event loop running it, `connect` must be awaited inside that loop.
+    """
+
+    def __init__(self,
+                 ip: str,
+                 port: int = 502,
+                 timeout: int = 2,
+                 offline: bool = False) -> None:
+        super().__init__(ip, port, timeout, offline)
+
+        self.client: AsyncModbusTcpClient | None = None
+
+    async def connect(self) -> None:
+        """Creates a TCP Modbus client and connects it to the component.
+
+        Raises:
+            ModbusError: The connection to the Modbus component failed.
+        """
+        if self.offline:
+            return
+
+        self.client = AsyncModbusTcpClient(host=self.ip,
+                                           port=self.port,
+                                           timeout=self.timeout)
+        if await self.client.connect():
+            logger.debug(
+                "(Modbus) Async connection to the Modbus component "
+                "(%s:%d) succeeded.", self.ip, self.port)
+            return
+        raise ModbusError("Async connection to the Modbus component "
+                          f"({self.ip}:{self.port}) failed.")
+
+    def close(self) -> None:
+        """Closes the connection to the component."""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    async def read_coil(self, address: int) -> bool:
+        """Reads and returns the value stored inside the coil at the given
+        address.
+
+        Args:
+            address: The Modbus address of the coil to read
+
+        Returns:
+            The boolean value of the coil
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            response = await self.__request("read_coils", address)
+            if response.isError():
+                raise ModbusError(
+                    f"(Modbus) Error while reading coil at {address}")
+
+            value = response.bits[0]
+        else:
+            value = False
+
+        logger.debug("(Modbus) Read %s in coil at address %d", value, address)
+
+        return value
+
+    async def read_coils(self, address: int) -> list[bool]:
+        """Reads and returns the values stored inside the coils at the given
+        address.
+
+        Args:
+            address: The Modbus address of the coils to read
+
+        Returns:
+            The list of boolean values of the coils
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            response = await self.__request("read_coils", address)
+            if response.isError():
+                raise ModbusError(
+                    f"(Modbus) Error while reading coils at {address}")
+
+            values = response.bits
+        else:
+            values = []
+
+        logger.debug("(Modbus) Read %s in coils at address %d", values,
+                     address)
+
+        return values
+
+    async def read_register(self, address: int) -> int:
+        """Reads the register at the given address and returns this value.
+
+        Args:
+            address: The Modbus address of the register to read
+
+        Returns:
+            The value read in the register
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        return (await self.read_block(address, 1))[0]
+
+    async def read_registers(self, address: int) -> int:
+        """Reads two consecutive registers and returns the value they represent.
+
+        Args:
+            address: the Modbus address of the first register. It will be
+            incremented by one for the second.
+
+        Returns:
+            The value stored in the two registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        msb_word, lsb_word = await self.read_block(address, 2)
+
+        return struct.unpack(">i", struct.pack(">HH", msb_word, lsb_word))[0]
+
+    async def read_block(self, address: int, count: int) -> list[int]:
+        """Reads a range of consecutive registers in a single request.
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not 0 < count <= MAX_BLOCK_SIZE:
+            raise ModbusError(f"Cannot read {count} registers in one request, "
+                              f"must be between 1 and {MAX_BLOCK_SIZE}")
+
+        if not self.offline:
+            response = await self.__request("read_input_registers",
+                                            address,
+                                            count=count)
+            if response.isError():
+                raise ModbusError("(Modbus) Error while reading registers "
+                                  f"at {address}(+{count - 1}): {response}")
+
+            values = response.registers[:count]
+        else:
+            values = [0] * count
+
+        logger.debug("(Modbus) Read %s in registers at addresses %d(+%d)",
+                     values, address, count - 1)
+
+        return values
+
+    async def read_map(self, register_map: ModbusRegisterMap) -> dict[str, int]:
+        """Reads and decodes every field of the given register map.
+
+        Args:
+            register_map: The ModbusRegisterMap describing the fields to read
+
+        Returns:
+            A dictionary with the value of each field of the map
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        values = {}
+        for block in register_map.blocks:
+            values.update(
+                block.decode(await self.read_block(block.address,
+                                                   block.count)))
+        return values
+
+    async def write_coil(self, address: int, value: bool) -> None:
+        """Writes a value inside the coil at the given address.
+
+        Args:
+            address: The Modbus address of the coil to write to.
+            value: The value to write
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            response = await self.__request("write_coil", address, value)
+            if response.isError():
+                raise ModbusError(
+                    f"(Modbus) Error while writing coil at {address}")
+
+        logger.debug("(Modbus) Written %s in coil at address %d", value,
+                     address)
+
+    async def write_coils(self, address: int, values: list[bool]) -> None:
+        """Writes values inside the coils at the given address.
+
+        Args:
+            address: The Modbus address of the coils to write to.
+            values: The list of values to write
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if len(values) > 16:
+            raise ModbusError(
+                "Cannot write more than 16 coils at the same address")
+
+        if not self.offline:
+            response = await self.__request("write_coils", address, values)
+            if response.isError():
+                raise ModbusError(
+                    f"(Modbus) Error while writing coils at {address}")
+
+        logger.debug("(Modbus) Written %s in coils at address %d", values,
+                     address)
+
+    async def write_register(self, address: int, value: int) -> None:
+        """Writes a value inside the register at the given address.
+
+        Args:
+            address: The address of the register to write to
+            value: The value to write
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            response = await self.__request("write_registers", address,
+                                           [value])
+            if response.isError():
+                raise ModbusError(f"(Modbus) Error while writing register "
+                                  f"at {address}: {response}")
+
+        logger.debug("(Modbus) Written %s in register at address %d", value,
+                     address)
+
+    async def write_registers(self, address: int, value: int) -> None:
+        """Writes a value into two consecutive registers.
+
+        Args:
+            address: The modbus address of the first register. It will be
+            incremented by one for the second.
+            value: The value to write
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            msb_word, lsb_word = struct.unpack(">HH", struct.pack(">i", value))
+
+            response = await self.__request("write_registers", address,
+                                           [msb_word, lsb_word])
+            if response.isError():
+                raise ModbusError(f"(Modbus) Error while writing registers "
+                                  f"at {address}(+1)")
+
+        logger.debug("(Modbus) Written %s in registers at address %d(+1)",
+                     value, address)
+
+    async def __request(self, name: str, *args, **kwargs):
+        """Sends a request through the client and converts its failures.
+
+        Args:
+            name: The name of the client method sending the request
+            args: The positional arguments of the method
+            kwargs: The keyword arguments of the method
+
+        Returns:
+            The pymodbus response to the request
+
+        Raises:
+            ModbusError: The component is not connected or the request failed
+            at the transport level
+        """
+        if self.client is None:
+            raise ModbusError(f"(Modbus) Component ({self.ip}:{self.port}) is "
+                              "not connected")
+
+        try:
+            return await getattr(self.client, name)(*args, **kwargs)
+        except ModbusException as error:
+            raise ModbusError(f"(Modbus) Request to ({self.ip}:{self.port}) "
+                              f"failed: {error}") from error
@@ -0,0 +1,137 @@
+"""Module defining a connection manager for the Ethernet components.
+
+It keeps track of the state of a connection. When the connection is reported
+as lost, it tries to restore it in a background thread with a bounded
+exponential backoff. While the connection is down, the callers can fail fast
+instead of waiting for a timeout.
+
+Typical usage example:
+
+manager = ConnectionManager("PLC 10.10.192.90:502", reconnect=client.connect)
+if not manager.is_connected:
+    raise SomeError("Component is down")
+manager.mark_disconnected("Connection reset by peer")
+"""
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum, auto
+
+from alibrary.logger import logger
+
+
+class ConnectionState(Enum):
+    """States of a connection to an Ethernet component"""
+    CONNECTED = auto()
+    RECONNECTING = auto()
+    CLOSED = auto()
+
+
+class ConnectionManager:
+    """Tracks a connection and restores it in the background when it is lost.
+
+    The `reconnect` callable is called from a background thread until it
+    returns True. The delay between two attempts is doubled after each failure,
+    starting at `min_delay` and bounded by `max_delay`.
+
+    Attributes:
+        name: A name identifying the connection in the logs
+        state: The current ConnectionState
+        reconnect_count: The number of successful reconnections
+        failure_count: The number of times the connection was reported as lost
+        last_error: The last error reported when the connection was lost
+    """
+
+    def __init__(self,
+                 name: str,
+                 reconnect: Callable[[], bool],
+                 min_delay: float = 0.1,
+                 max_delay: float = 5.0) -> None:
+        self.name = name
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+        self.state = ConnectionState.CONNECTED
+        self.reconnect_count = 0
+        self.failure_count = 0
+        self.last_error: str | None = None
+
+        self.__reconnect = reconnect
+        self.__lock = threading.Lock()
+        self.__closed = threading.Event()
+        self.__down_since: float | None = None
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Returns True if the connection is currently up."""
+        return self.state == ConnectionState.CONNECTED
+
+    def mark_disconnected(self, error: str):
+        """Reports that the connection has been lost.
+
+        It starts the background reconnection if it is not already running.
+
+        Args:
+            error: A description of the error that revealed the lost connection
+        """
+        with self.__lock:
+            self.last_error = error
+            if self.state != ConnectionState.CONNECTED:
+                return
+
+            self.state = ConnectionState.RECONNECTING
+            self.failure_count += 1
+            self.__down_since = time.monotonic()
+            self.__thread = threading.Thread(target=self.__reconnect_loop,
+                                             name=f"reconnect {self.name}",
+                                             daemon=True)
+            self.__thread.start()
+
+        logger.warning("(%s) Connection lost (%s), reconnecting", self.name,
+                       error)
+
+    def close(self):
+        """Stops any background reconnection and marks the connection closed."""
+        with self.__lock:
+            self.state = ConnectionState.CLOSED
+            self.__closed.set()
+
+    def get_info(self) -> dict[str,]:
+        """Returns a JSON representation of the connection health.
+
+        Returns:
+            A JSON object describing the connection state and counters
+        """
+        down_for = None
+        if self.__down_since is not None and not self.is_connected:
+            down_for = time.monotonic() - self.__down_since
+
+        return {
+            "state": self.state.name.lower(),
+            "reconnects": self.reconnect_count,
+            "failures": self.failure_count,
+            "last_error": self.last_error,
+            "down_for": down_for,
+        }
+
+    def __reconnect_loop(self):
+        """Tries to reconnect until it succeeds or the manager is closed."""
+        delay = self.min_delay
+        while not self.__closed.wait(delay):
+            try:
+                restored = self.__reconnect()
+            except Exception as error:  # pylint: disable=broad-except
+                self.last_error = str(error)
+                restored = False
+
+            if restored:
+                with self.__lock:
+                    if self.state == ConnectionState.RECONNECTING:
+                        self.state = ConnectionState.CONNECTED
+                        self.reconnect_count += 1
+                logger.info("(%s) Connection restored after %.3fs", self.name,
+                            time.monotonic() - self.__down_since)
+                return
+
+            delay = min(2 * delay, self.max_delay)
@@ -7,20 +7,104 @@ Typical usage example:
 
 component = ModbusComponent()
 value = component.read_register(address=1234)
+values = component.read_map(register_map)
 """
 
+import functools
+import math
 import struct
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import contextmanager
 
 from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ModbusException, ModbusIOException
 
+from alibrary.electronics.connection import ConnectionManager
 from alibrary.electronics.ethernet import EthernetComponent
+from alibrary.electronics.modbus_cache import ModbusRegisterCache
+from alibrary.electronics.modbus_pipeline import (
+    ModbusPipeline,
+    ModbusPipelineError,
+)
+from alibrary.electronics.register_map import (
+    MAX_BLOCK_SIZE,
+    MAX_WRITE_BLOCK_SIZE,
+    ModbusRegisterMap,
+)
+from alibrary.electronics.stats import TransactionStats
 from alibrary.logger import logger
 
+# Function code of the requests sent by each pymodbus client method
+FUNCTION_CODES = {
+    "read_coils": 1,
+    "read_input_registers": 4,
+    "write_coil": 5,
+    "write_coils": 15,
+    "write_registers": 16,
+    "readwrite_registers": 23,
+}
+
+# Size of the Modbus TCP header (MBAP) plus the function code [bytes]
+HEADER_SIZE = 8
+
+
+def _frame_sizes(name: str, args: tuple, kwargs: dict) -> tuple[int, int]:
+    """Returns the size of the request and response frames of a request.
+
+    Args:
+        name: The name of the pymodbus client method sending the request
+        args: The positional arguments of the method
+        kwargs: The keyword arguments of the method
+
+    Returns:
+        The number of bytes sent and the number of bytes received
+    """
+    if name == "read_coils":
+        return HEADER_SIZE + 4, HEADER_SIZE + 1 + math.ceil(
+            kwargs.get("count", 1) / 8)
+    if name == "read_input_registers":
+        return HEADER_SIZE + 4, HEADER_SIZE + 1 + 2 * kwargs.get("count", 1)
+    if name == "write_coil":
+        return HEADER_SIZE + 4, HEADER_SIZE + 4
+    if name == "write_coils":
+        return HEADER_SIZE + 5 + math.ceil(len(args[1]) / 8), HEADER_SIZE + 4
+    if name == "write_registers":
+        n_values = len(args[1]) if isinstance(args[1], list) else 1
+        return HEADER_SIZE + 5 + 2 * n_values, HEADER_SIZE + 4
+    # Read/write multiple registers
+    return (HEADER_SIZE + 9 + 2 * len(kwargs["values"]),
+            HEADER_SIZE + 1 + 2 * kwargs["read_count"])
+
 
 class ModbusError(Exception):
     """Exception raised by the Modbus interface when an error occurs."""
 
 
+def modbus_operation(name: str) -> Callable:
+    """Decorator tagging the requests sent by a ModbusComponent method with
+    the given operation name.
+
+    Args:
+        name: The name of the operation
+
+    Returns:
+        The decorator to apply to a method of a ModbusComponent subclass
+    """
+
+    def decorator(method: Callable) -> Callable:
+
+        @functools.wraps(method)
+        def wrapper(self: "ModbusComponent", *args, **kwargs):
+            with self.operation(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 class ModbusComponent(EthernetComponent):
     """An interface to a Modbus component.
 
@@ -29,18 +113,53 @@ class ModbusComponent(EthernetComponent):
     It is generic enough to allow communication to multiple PLC.
     By default, it will create a connection on port 502 with a timeout of 2
     seconds.
+
+    If the connection is lost after its creation, it is restored in the
+    background by a ConnectionManager. Meanwhile, every request fails
+    immediately with a ModbusError instead of waiting for the timeout.
+
+    Reads of input registers can optionally go through a read-through cache,
+    see `configure_cache`.
+
+    Every request is counted, with its size and latency, in `get_stats`.
+
+    With a `pipeline_window` greater than one, independent block reads and
+    writes can be submitted without waiting for the previous responses, see
+    `submit_read_block` and `submit_write_block`. They are sent through a
+    second connection with up to `pipeline_window` outstanding transactions.
     """
+    # Delay before the first reconnection attempt [s]
+    RECONNECT_MIN_DELAY = 0.1
+    # Maximum delay between two reconnection attempts [s]
+    RECONNECT_MAX_DELAY = 5.0
 
     def __init__(self,
                  ip: str,
                  port: int = 502,
                  timeout: int = 2,
-                 offline: bool = False) -> None:
+                 offline: bool = False,
+                 pipeline_window: int = 0) -> None:
         super().__init__(ip, port, timeout, offline)
 
+        self.cache: ModbusRegisterCache | None = None
+        self.pipeline: ModbusPipeline | None = None
+        self.stats = TransactionStats()
+        self.connection = ConnectionManager(f"Modbus {self.ip}:{self.port}",
+                                            self.__reconnect,
+                                            self.RECONNECT_MIN_DELAY,
+                                            self.RECONNECT_MAX_DELAY)
+
         if not self.offline:
             self.client = self.__connect()
 
+            if pipeline_window > 1:
+                self.pipeline = ModbusPipeline(self.ip,
+                                               self.port,
+                                               self.timeout,
+                                               pipeline_window,
+                                               stats=self.stats)
+                self.pipeline.connect()
+
     def __connect(self) -> ModbusTcpClient:
         """Creates and returns a TCP Modbus client.
 
@@ -65,6 +184,247 @@ class ModbusComponent(EthernetComponent):
         raise ModbusError("Connection to the Modbus component "
                           f"({self.ip}:{self.port}) failed.")
 
+    def __reconnect(self) -> bool:
+        """Closes and reopens the connection of the client.
+
+        Returns:
+            True if the connection has been restored, False otherwise
+        """
+        self.client.close()
+        return self.client.connect()
+
+    def __request(self, method: Callable, *args, **kwargs):
+        """Sends a request through the client if the connection is up.
+
+        A request failing at the transport level (closed socket, timeout)
+        marks the connection as lost, which starts its restoration.
+
+        Args:
+            method: The client method sending the request
+            args: The positional arguments of the method
+            kwargs: The keyword arguments of the method
+
+        Returns:
+            The pymodbus response to the request
+
+        Raises:
+            ModbusError: The connection is down or the request failed
+        """
+        key = f"FC{FUNCTION_CODES[method.__name__]} {method.__name__}"
+        bytes_sent, bytes_received = _frame_sizes(method.__name__, args, kwargs)
+
+        if self.connection.is_connected and not self.client.connected:
+            self.connection.mark_disconnected("Socket closed")
+
+        if not self.connection.is_connected:
+            self.stats.record(key, 0.0, error=True)
+            raise ModbusError(f"(Modbus) Component ({self.ip}:{self.port}) is "
+                              f"disconnected: {self.connection.last_error}")
+
+        start = time.perf_counter()
+        try:
+            response = method(*args, **kwargs)
+        except ModbusException as error:
+            self.stats.record(key,
+                              time.perf_counter() - start,
+                              bytes_sent,
+                              timeout=isinstance(error, ModbusIOException),
+                              error=True)
+            self.connection.mark_disconnected(str(error))
+            raise ModbusError(f"(Modbus) Request to ({self.ip}:{self.port}) "
+                              f"failed: {error}") from error
+
+        self.stats.record(key,
+                          time.perf_counter() - start,
+                          bytes_sent,
+                          bytes_received,
+                          error=response.isError())
+        return response
+
+    @contextmanager
+    def operation(self, name: str):
+        """Tags the requests sent by the current thread with an operation.
+
+        This allows to count the requests and their latency per high level
+        operation in `get_stats`. Nested operations tag the requests with every
+        active one, so an outer operation counts the requests of the inner
+        ones.
+
+        Args:
+            name: The name of the operation
+        """
+        previous = self.stats.begin_operation(name)
+        try:
+            yield
+        finally:
+            self.stats.end_operation(previous)
+
+    def get_stats(self) -> dict[str,]:
+        """Returns the statistics of the requests sent to this component.
+
+        Returns:
+            A JSON object with the request counters, exchanged bytes, errors,
+            timeouts and latency histograms, in total, per function code and
+            per operation
+        """
+        stats = self.stats.get_stats()
+        stats["device"] = f"{self.ip}:{self.port}"
+        return stats
+
+    def reset_stats(self):
+        """Resets the statistics of the requests sent to this component."""
+        self.stats.reset_stats()
+
+    def __read_input_registers(self, address: int, count: int) -> list[int]:
+        """Reads consecutive input registers, through the cache if enabled.
+
+        When the registers belong to a cached range, the whole range is read
+        on a cache miss and stored for the following reads.
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        cached_range = None
+        if self.cache is not None:
+            cached_range = self.cache.find(address, count)
+
+        if cached_range is None:
+            return self.__request_input_registers(address, count)
+
+        registers = self.cache.get(cached_range, address, count)
+        if registers is None:
+            timestamp = time.monotonic()
+            range_registers = self.__request_input_registers(
+                cached_range.address, cached_range.count)
+            self.cache.store(cached_range, range_registers, timestamp)
+
+            start = address - cached_range.address
+            registers = range_registers[start:start + count]
+
+        return registers
+
+    def __request_input_registers(self, address: int,
+                                  count: int) -> list[int]:
+        """Sends a request reading consecutive input registers.
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        response = self.__request(self.client.read_input_registers,
+                                  address,
+                                  count=count)
+        if response.isError():
+            raise ModbusError("(Modbus) Error while reading registers "
+                              f"at {address}(+{count - 1}): {response}")
+
+        return response.registers[:count]
+
+    def __use_pipeline(self) -> bool:
+        """Checks if the requests can be sent through the pipeline.
+
+        A lost pipelined connection is reopened once the main connection is
+        up. Until then, the requests are sent through the regular client.
+
+        Returns:
+            True if the pipeline is enabled and connected
+        """
+        if self.pipeline is None or not self.connection.is_connected:
+            return False
+        return self.pipeline.connected or self.pipeline.connect()
+
+    def __chain(self, future: Future,
+                transform: Callable[[list[int] | None], list[int] | None],
+                message: str) -> Future:
+        """Returns a future resolved with the transformed pipelined response.
+
+        Args:
+            future: The future of a pipelined request
+            transform: The function applied to the response
+            message: The description of the request, used in the error
+
+        Returns:
+            A Future resolved with the transformed response, or failed with a
+            ModbusError
+        """
+        chained = Future()
+
+        def resolve(done: Future):
+            try:
+                chained.set_result(transform(done.result()))
+            except ModbusPipelineError as error:
+                chained.set_exception(
+                    ModbusError(f"(Modbus) Error while {message}: {error}"))
+
+        future.add_done_callback(resolve)
+        return chained
+
+    def __invalidate(self, address: int, count: int):
+        """Invalidates the cached ranges related to the written registers.
+
+        Args:
+            address: The Modbus address of the first written register
+            count: The number of written registers
+        """
+        if self.cache is not None:
+            self.cache.invalidate(address, count)
+
+    def configure_cache(
+            self,
+            address: int,
+            count: int,
+            ttl: float,
+            invalidated_by: list[tuple[int, int]] | None = None):
+        """Caches the reads of the given range of registers.
+
+        The first call enables the read-through cache of this component. Any
+        read inside the range then fetches the whole range and the following
+        reads are served from memory during `ttl` seconds. A write to the range
+        itself or to one of the `invalidated_by` ranges drops the stored values.
+
+        Args:
+            address: The Modbus address of the first register of the range
+            count: The number of registers of the range
+            ttl: The time to live of the read values [s]
+            invalidated_by: The (address, count) ranges whose writes
+            invalidate the range. If None, any write invalidates it.
+        """
+        if self.cache is None:
+            self.cache = ModbusRegisterCache()
+
+        self.cache.add_range(address, count, ttl, invalidated_by)
+
+    def get_cache_stats(self) -> dict[str,]:
+        """Returns the hits, misses and invalidations counters of the cache.
+
+        Returns:
+            A JSON object with the cache counters, empty if it is disabled
+        """
+        if self.cache is None:
+            return {}
+        return self.cache.get_stats()
+
+    def get_connection_info(self) -> dict[str,]:
+        """Returns the state of the connection and its reconnection counters.
+
+        Returns:
+            A JSON object describing the connection health
+        """
+        return self.connection.get_info()
+
     def read_coil(self, address: int) -> bool:
         """Reads and returns the value stored inside the coil at the given
         address.
@@ -79,7 +439,7 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.read_coils(address)
+            response = self.__request(self.client.read_coils, address)
             if response.isError():
                 raise ModbusError(
                     f"(Modbus) Error while reading coil at {address}")
@@ -106,7 +466,7 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.read_coils(address)
+            response = self.__request(self.client.read_coils, address)
             if response.isError():
                 raise ModbusError(
                     f"(Modbus) Error while reading coils at {address}")
@@ -133,12 +493,7 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.read_input_registers(address)
-            if response.isError():
-                raise ModbusError("(Modbus) Error while reading register "
-                                  "at {address}: {response}")
-
-            value = response.registers[0]
+            value = self.__read_input_registers(address, 1)[0]
         else:
             value = 0
 
@@ -164,13 +519,7 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.read_input_registers(address, count=2)
-            if response.isError():
-                raise ModbusError("(Modbus) Error while reading registers "
-                                  f"at {address}(+1): {response}")
-
-            msb_word = response.registers[0]
-            lsb_word = response.registers[1]
+            msb_word, lsb_word = self.__read_input_registers(address, 2)
 
             value = struct.unpack(">i", struct.pack(">HH", msb_word,
                                                     lsb_word))[0]
@@ -182,6 +531,119 @@ class ModbusComponent(EthernetComponent):
 
         return value
 
+    def read_block(self, address: int, count: int) -> list[int]:
+        """Reads a range of consecutive registers in a single request.
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not 0 < count <= MAX_BLOCK_SIZE:
+            raise ModbusError(f"Cannot read {count} registers in one request, "
+                              f"must be between 1 and {MAX_BLOCK_SIZE}")
+
+        if not self.offline:
+            values = self.__read_input_registers(address, count)
+        else:
+            values = [0] * count
+
+        logger.debug("(Modbus) Read %s in registers at addresses %d(+%d)",
+                     values, address, count - 1)
+
+        return values
+
+    def submit_read_block(self, address: int, count: int) -> Future:
+        """Reads a range of consecutive registers without waiting for the
+        response.
+
+        With a pipeline, the request is sent and the method returns at once.
+        Otherwise the read is done synchronously. Cached registers are served
+        from the cache in both cases.
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            A Future resolved with the list of the raw 16 bits values of the
+            registers, or failed with a ModbusError
+
+        Raises:
+            ModbusError: The request could not be sent
+        """
+        if self.offline or not self.__use_pipeline():
+            future = Future()
+            try:
+                future.set_result(self.read_block(address, count))
+            except ModbusError as error:
+                future.set_exception(error)
+            return future
+
+        if not 0 < count <= MAX_BLOCK_SIZE:
+            raise ModbusError(f"Cannot read {count} registers in one request, "
+                              f"must be between 1 and {MAX_BLOCK_SIZE}")
+
+        message = f"reading registers at {address}(+{count - 1})"
+        cached_range = None
+        if self.cache is not None:
+            cached_range = self.cache.find(address, count)
+
+        try:
+            if cached_range is None:
+                return self.__chain(self.pipeline.submit_read(address, count),
+                                    lambda registers: registers, message)
+
+            registers = self.cache.get(cached_range, address, count)
+            if registers is not None:
+                future = Future()
+                future.set_result(registers)
+                return future
+
+            timestamp = time.monotonic()
+            start = address - cached_range.address
+
+            def store(range_registers: list[int]) -> list[int]:
+                self.cache.store(cached_range, range_registers, timestamp)
+                return range_registers[start:start + count]
+
+            return self.__chain(
+                self.pipeline.submit_read(cached_range.address,
+                                          cached_range.count), store, message)
+        except ModbusPipelineError as error:
+            raise ModbusError(str(error)) from error
+
+    def read_map(self, register_map: ModbusRegisterMap) -> dict[str, int]:
+        """Reads and decodes every field of the given register map.
+
+        Each block of contiguous registers of the map is fetched in a single
+        request. With a pipeline, the requests of every block are in flight
+        together.
+
+        Args:
+            register_map: The ModbusRegisterMap describing the fields to read
+
+        Returns:
+            A dictionary with the value of each field of the map
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        futures = [
+            self.submit_read_block(block.address, block.count)
+            for block in register_map.blocks
+        ]
+
+        values = {}
+        for block, future in zip(register_map.blocks, futures):
+            values.update(block.decode(future.result()))
+        return values
+
     def write_coil(self, address: int, value: bool) -> None:
         """Writes a value inside the coil at the given address.
 
@@ -193,7 +655,7 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.write_coil(address, value)
+            response = self.__request(self.client.write_coil, address, value)
             if response.isError():
                 raise ModbusError(
                     f"(Modbus) Error while writing coil at {address}")
@@ -216,7 +678,8 @@ class ModbusComponent(EthernetComponent):
                 "Cannot write more than 16 coils at the same address")
 
         if not self.offline:
-            response = self.client.write_coils(address, values)
+            response = self.__request(self.client.write_coils, address,
+                                      values)
             if response.isError():
                 raise ModbusError(
                     f"(Modbus) Error while writing coils at {address}")
@@ -235,7 +698,9 @@ class ModbusComponent(EthernetComponent):
             ModbusError: An error occurs in the Modbus communication
         """
         if not self.offline:
-            response = self.client.write_registers(address, value)
+            response = self.__request(self.client.write_registers, address,
+                                      value)
+            self.__invalidate(address, 1)
             if response.isError():
                 raise ModbusError(f"(Modbus) Error while writing register "
                                   f"at {address}: {response}")
@@ -260,11 +725,147 @@ class ModbusComponent(EthernetComponent):
         if not self.offline:
             msb_word, lsb_word = struct.unpack(">HH", struct.pack(">i", value))
 
-            response = self.client.write_registers(address,
-                                                   [msb_word, lsb_word])
+            response = self.__request(self.client.write_registers, address,
+                                      [msb_word, lsb_word])
+            self.__invalidate(address, 2)
             if response.isError():
                 raise ModbusError(f"(Modbus) Error while writing registers "
                                   f"at {address}(+1)")
 
         logger.debug("(Modbus) Written %s in registers at address %d(+1)",
                      value, address)
+
+    def write_block(self, address: int, values: list[int]) -> None:
+        """Writes consecutive registers in a single request.
+
+        Args:
+            address: The Modbus address of the first register to write to
+            values: The raw 16 bits values to write
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        count = len(values)
+        if not 0 < count <= MAX_WRITE_BLOCK_SIZE:
+            raise ModbusError(f"Cannot write {count} registers in one request,"
+                              f" must be between 1 and {MAX_WRITE_BLOCK_SIZE}")
+
+        if not self.offline:
+            response = self.__request(self.client.write_registers, address,
+                                      list(values))
+            self.__invalidate(address, count)
+            if response.isError():
+                raise ModbusError(f"(Modbus) Error while writing registers "
+                                  f"at {address}(+{count - 1}): {response}")
+
+        logger.debug("(Modbus) Written %s in registers at address %d(+%d)",
+                     values, address, count - 1)
+
+    def submit_write_block(self, address: int, values: list[int]) -> Future:
+        """Writes consecutive registers without waiting for the response.
+
+        With a pipeline, the request is sent and the method returns at once.
+        Otherwise the write is done synchronously.
+
+        Args:
+            address: The Modbus address of the first register to write to
+            values: The raw 16 bits values to write
+
+        Returns:
+            A Future resolved with None once the write is acknowledged, or
+            failed with a ModbusError
+
+        Raises:
+            ModbusError: The request could not be sent
+        """
+        if self.offline or not self.__use_pipeline():
+            future = Future()
+            try:
+                future.set_result(self.write_block(address, values))
+            except ModbusError as error:
+                future.set_exception(error)
+            return future
+
+        count = len(values)
+        if not 0 < count <= MAX_WRITE_BLOCK_SIZE:
+            raise ModbusError(f"Cannot write {count} registers in one request,"
+                              f" must be between 1 and {MAX_WRITE_BLOCK_SIZE}")
+
+        try:
+            future = self.pipeline.submit_write(address, list(values))
+        except ModbusPipelineError as error:
+            raise ModbusError(str(error)) from error
+        self.__invalidate(address, count)
+
+        logger.debug("(Modbus) Submitted %s in registers at address %d(+%d)",
+                     values, address, count - 1)
+
+        # Invalidated again on the acknowledgement, a read done meanwhile may
+        # have cached the values from before the write
+        return self.__chain(future, lambda _: self.__invalidate(address, count),
+                            f"writing registers at {address}(+{count - 1})")
+
+    def write_map(self, register_map: ModbusRegisterMap,
+                  values: dict[str, int]) -> None:
+        """Encodes and writes every field of the given register map.
+
+        Each block of contiguous registers of the map is written in a single
+        request. With a pipeline, the requests of every block are in flight
+        together.
+
+        Args:
+            register_map: The ModbusRegisterMap describing the fields to write
+            values: A dictionary with the value of each field of the map
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        futures = [
+            self.submit_write_block(block.address, block.encode(values))
+            for block in register_map.blocks
+        ]
+        for future in futures:
+            future.result()
+
+    def write_read_block(self, write_address: int, values: list[int],
+                         read_address: int, read_count: int) -> list[int]:
+        """Writes then reads consecutive registers in a single request.
+
+        It uses the Modbus function 23 (read/write multiple registers). The
+        write is performed before the read by the component.
+
+        Args:
+            write_address: The Modbus address of the first register to write
+            values: The raw 16 bits values to write
+            read_address: The Modbus address of the first register to read
+            read_count: The number of registers to read
+
+        Returns:
+            The list of the raw 16 bits values of the read registers
+
+        Raises:
+            ModbusError: An error occurs in the Modbus communication
+        """
+        if not self.offline:
+            response = self.__request(self.client.readwrite_registers,
+                                      read_address=read_address,
+                                      read_count=read_count,
+                                      write_address=write_address,
+                                      values=list(values))
+            self.__invalidate(write_address, len(values))
+            if response.isError():
+                raise ModbusError(
+                    f"(Modbus) Error while writing registers at "
+                    f"{write_address} and reading registers at "
+                    f"{read_address}: {response}")
+
+            registers = response.registers[:read_count]
+        else:
+            registers = [0] * read_count
+
+        logger.debug(
+            "(Modbus) Written %s in registers at address %d and read %s in "
+            "registers at address %d", values, write_address, registers,
+            read_address)
+
+        return registers
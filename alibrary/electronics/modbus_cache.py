@@ -0,0 +1,179 @@
+"""Module defining a read-through cache of Modbus registers.
+
+Ranges of registers are declared with a time to live. A read inside a
+declared range fetches the whole range once and serves the following reads
+from memory until the time to live expires or a write to a related address
+invalidates it.
+
+Typical usage example:
+
+cache = ModbusRegisterCache()
+cache.add_range(5000, 2, ttl=0.02, invalidated_by=[(6000, 2)])
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CachedRange:
+    """A range of registers stored in the cache.
+
+    Attributes:
+        address: The Modbus address of the first register of the range
+        count: The number of registers of the range
+        ttl: The time to live of the stored values [s]
+        invalidated_by: The (address, count) ranges whose writes invalidate
+        this range, None if any write invalidates it
+        registers: The stored values, None if nothing is stored
+        timestamp: The monotonic time at which the values were read
+    """
+    address: int
+    count: int
+    ttl: float
+    invalidated_by: tuple[tuple[int, int], ...] | None = None
+    registers: list[int] | None = None
+    timestamp: float = 0.0
+
+    def contains(self, address: int, count: int) -> bool:
+        """Checks if the given registers are all inside this range."""
+        return (self.address <= address and
+                address + count <= self.address + self.count)
+
+    def is_invalidated_by(self, address: int, count: int) -> bool:
+        """Checks if a write to the given registers invalidates this range."""
+        if self.invalidated_by is None:
+            return True
+
+        ranges = ((self.address, self.count),) + self.invalidated_by
+        return any(address < start + length and start < address + count
+                   for start, length in ranges)
+
+
+class ModbusRegisterCache:
+    """A read-through cache of Modbus registers with write invalidation.
+
+    Attributes:
+        hits: The number of reads served from the cache
+        misses: The number of reads that required a Modbus request
+        invalidations: The number of ranges invalidated by writes
+    """
+
+    def __init__(self) -> None:
+        self.ranges: list[CachedRange] = []
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self.__lock = threading.Lock()
+
+    def add_range(self,
+                  address: int,
+                  count: int,
+                  ttl: float,
+                  invalidated_by: list[tuple[int, int]] | None = None):
+        """Declares a range of registers to cache.
+
+        Args:
+            address: The Modbus address of the first register of the range
+            count: The number of registers of the range
+            ttl: The time to live of the read values [s]
+            invalidated_by: The (address, count) ranges whose writes
+            invalidate this range, in addition to the range itself. If None,
+            any write to the component invalidates it.
+        """
+        if invalidated_by is not None:
+            invalidated_by = tuple(invalidated_by)
+
+        with self.__lock:
+            self.ranges.append(
+                CachedRange(address, count, ttl, invalidated_by))
+
+    def find(self, address: int, count: int) -> CachedRange | None:
+        """Returns the declared range containing the given registers.
+
+        Args:
+            address: The Modbus address of the first register
+            count: The number of registers
+
+        Returns:
+            A CachedRange or None if the registers are not cached
+        """
+        for cached_range in self.ranges:
+            if cached_range.contains(address, count):
+                return cached_range
+        return None
+
+    def get(self, cached_range: CachedRange, address: int,
+            count: int) -> list[int] | None:
+        """Returns the stored values of the given registers if still valid.
+
+        Args:
+            cached_range: The range containing the registers
+            address: The Modbus address of the first register
+            count: The number of registers
+
+        Returns:
+            The list of the register values or None on a cache miss
+        """
+        with self.__lock:
+            registers = cached_range.registers
+            if (registers is None or time.monotonic() - cached_range.timestamp
+                    > cached_range.ttl):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        start = address - cached_range.address
+        return registers[start:start + count]
+
+    def store(self, cached_range: CachedRange, registers: list[int],
+              timestamp: float):
+        """Stores the values read for the given range.
+
+        Args:
+            cached_range: The range that has been read
+            registers: The values of every register of the range
+            timestamp: The monotonic time at which the read request was sent
+        """
+        with self.__lock:
+            if timestamp >= cached_range.timestamp:
+                cached_range.registers = list(registers)
+                cached_range.timestamp = timestamp
+
+    def invalidate(self, address: int, count: int):
+        """Invalidates the ranges affected by a write to the given registers.
+
+        Args:
+            address: The Modbus address of the first written register
+            count: The number of written registers
+        """
+        with self.__lock:
+            for cached_range in self.ranges:
+                if (cached_range.registers is not None and
+                        cached_range.is_invalidated_by(address, count)):
+                    cached_range.registers = None
+                    cached_range.timestamp = time.monotonic()
+                    self.invalidations += 1
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the cache counters.
+
+        Returns:
+            A JSON object with the hits, misses and invalidations counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        """Resets the cache counters."""
+        with self.__lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
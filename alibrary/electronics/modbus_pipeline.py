@@ -0,0 +1,338 @@
+"""Module defining a pipelined Modbus TCP connection.
+
+Each Modbus TCP request carries a transaction identifier that the component
+copies in its response. This connection sends the requests without waiting
+for the previous responses, up to a window of outstanding transactions, and
+matches the responses by transaction identifier in a background thread.
+Independent requests then cost about one round trip in total instead of one
+round trip each.
+
+Typical usage example:
+
+pipeline = ModbusPipeline("10.10.192.90", 502, window=4)
+pipeline.connect()
+futures = [pipeline.submit_read(2008, 8), pipeline.submit_read(5000, 2)]
+motion, status = (future.result() for future in futures)
+"""
+import itertools
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from alibrary.electronics.stats import TransactionStats
+from alibrary.logger import logger
+
+# Modbus TCP header: transaction id, protocol id, length, unit id
+MBAP = struct.Struct(">HHHB")
+
+# Function codes of the pipelined requests
+READ_INPUT_REGISTERS = 4
+WRITE_REGISTERS = 16
+
+# Name of the requests in the statistics, as in ModbusComponent
+REQUEST_NAMES = {
+    READ_INPUT_REGISTERS: "read_input_registers",
+    WRITE_REGISTERS: "write_registers",
+}
+
+
+class ModbusPipelineError(Exception):
+    """Exception raised by a pipelined request when it fails."""
+
+
+@dataclass
+class _Transaction:
+    """A request waiting for its response."""
+    function_code: int
+    count: int
+    bytes_sent: int
+    operations: tuple[str, ...]
+    sent_at: float = 0.0
+    future: Future = field(default_factory=Future)
+
+
+class ModbusPipeline:
+    """A Modbus TCP connection with several outstanding transactions.
+
+    The requests are sent in the order of submission. The component may
+    process them concurrently, so only independent requests should be in
+    flight together. A caller needing an ordering waits for the future of the
+    first request before submitting the second one.
+
+    Attributes:
+        ip: The IP address of the Modbus component
+        port: The port of the Modbus component
+        timeout: The time to wait for a response [s]
+        window: The maximum number of outstanding transactions
+        unit: The Modbus unit identifier of the component
+        stats: The TransactionStats recording the transactions, if any
+    """
+
+    def __init__(self,
+                 ip: str,
+                 port: int = 502,
+                 timeout: float = 2,
+                 window: int = 4,
+                 unit: int = 1,
+                 stats: TransactionStats | None = None) -> None:
+        if window < 1:
+            raise ValueError("The pipeline window must be at least 1")
+
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.window = window
+        self.unit = unit
+        self.stats = stats
+
+        self.__socket: socket.socket | None = None
+        self.__reader: threading.Thread | None = None
+        self.__send_lock = threading.Lock()
+        self.__pending_lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(window)
+        self.__pending: dict[int, _Transaction] = {}
+        self.__transaction_ids = itertools.count()
+
+    @property
+    def connected(self) -> bool:
+        """Returns True if the connection is open."""
+        return self.__socket is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Returns the number of outstanding transactions."""
+        return len(self.__pending)
+
+    def connect(self) -> bool:
+        """Opens the connection and starts the response reader.
+
+        Returns:
+            True if the connection succeeded, False otherwise
+        """
+        self.close()
+        try:
+            sock = socket.create_connection((self.ip, self.port),
+                                            timeout=self.timeout)
+        except OSError as error:
+            logger.warning("(Modbus) Pipelined connection to %s:%d failed: "
+                           "%s", self.ip, self.port, error)
+            return False
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.__socket = sock
+        self.__reader = threading.Thread(target=self.__read_responses,
+                                         args=(sock,),
+                                         name=f"modbus pipeline {self.ip}",
+                                         daemon=True)
+        self.__reader.start()
+        return True
+
+    def close(self):
+        """Closes the connection and fails the outstanding transactions."""
+        sock, self.__socket = self.__socket, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self.__fail_pending("Connection closed")
+
+    def submit_read(self, address: int, count: int) -> Future:
+        """Sends a request reading consecutive input registers (function 4).
+
+        Args:
+            address: The Modbus address of the first register to read
+            count: The number of registers to read
+
+        Returns:
+            A Future resolved with the list of the register values
+        """
+        return self.__submit(READ_INPUT_REGISTERS,
+                             struct.pack(">HH", address, count), count)
+
+    def submit_write(self, address: int, values: list[int]) -> Future:
+        """Sends a request writing consecutive registers (function 16).
+
+        Args:
+            address: The Modbus address of the first register to write
+            values: The raw 16 bits values to write
+
+        Returns:
+            A Future resolved with None once the write is acknowledged
+        """
+        payload = struct.pack(f">HHB{len(values)}H", address, len(values),
+                              2 * len(values), *values)
+        return self.__submit(WRITE_REGISTERS, payload, 0)
+
+    def __submit(self, function_code: int, payload: bytes,
+                 count: int) -> Future:
+        """Sends a request as soon as a slot of the window is free.
+
+        Args:
+            function_code: The Modbus function code of the request
+            payload: The request data following the function code
+            count: The number of registers expected in the response
+
+        Returns:
+            A Future resolved with the decoded response
+
+        Raises:
+            ModbusPipelineError: The connection is closed or no slot was freed
+            before the timeout
+        """
+        if not self.__slots.acquire(timeout=self.timeout):
+            raise ModbusPipelineError(
+                f"(Modbus) No pipeline slot freed on {self.ip}:{self.port} "
+                f"within {self.timeout}s")
+
+        frame_size = MBAP.size + 1 + len(payload)
+        operations = () if self.stats is None else self.stats.operations
+        transaction = _Transaction(function_code, count, frame_size,
+                                   operations)
+
+        with self.__send_lock:
+            sock = self.__socket
+            if sock is None:
+                self.__slots.release()
+                raise ModbusPipelineError(
+                    f"(Modbus) Pipeline to {self.ip}:{self.port} is closed")
+
+            transaction_id = next(self.__transaction_ids) % 0x10000
+            frame = MBAP.pack(transaction_id, 0, len(payload) + 2,
+                              self.unit) + bytes((function_code,)) + payload
+
+            transaction.sent_at = time.perf_counter()
+            with self.__pending_lock:
+                self.__pending[transaction_id] = transaction
+            try:
+                sock.sendall(frame)
+            except OSError as error:
+                self.__complete(transaction_id,
+                                error=f"Send failed: {error}",
+                                timeout=isinstance(error, TimeoutError))
+
+        return transaction.future
+
+    def __read_responses(self, sock: socket.socket):
+        """Reads the responses and resolves the matching futures.
+
+        It runs in a background thread until the connection is closed.
+        """
+        header = bytearray(MBAP.size)
+        while True:
+            try:
+                self.__receive_into(sock, header)
+                transaction_id, _, length, _ = MBAP.unpack(header)
+                body = bytearray(length - 1)
+                # The header is consumed, the next bytes must be the body
+                self.__receive_into(sock, body, started=True)
+            except TimeoutError:
+                self.__expire_pending()
+                continue
+            except OSError as error:
+                if self.__socket is sock:
+                    logger.warning("(Modbus) Pipelined connection to %s:%d "
+                                   "lost: %s", self.ip, self.port, error)
+                    self.__socket = None
+                    sock.close()
+                self.__fail_pending(f"Connection lost: {error}")
+                return
+
+            self.__complete(transaction_id, response=body)
+            self.__expire_pending()
+
+    @staticmethod
+    def __receive_into(sock: socket.socket,
+                       buffer: bytearray,
+                       started: bool = False):
+        """Fills the given buffer from the socket.
+
+        Args:
+            sock: The socket to read
+            buffer: The buffer to fill
+            started: A flag indicating if the buffer continues a frame whose
+            first bytes are already received. A timeout then truncates the
+            frame, even before the first byte of the buffer.
+
+        Raises:
+            TimeoutError: Nothing was received before the timeout
+            OSError: The connection is closed or broke in the middle of a
+            frame
+        """
+        view = memoryview(buffer)
+        while view:
+            try:
+                received = sock.recv_into(view)
+            except TimeoutError as error:
+                if not started and len(view) == len(buffer):
+                    raise
+                raise ConnectionAbortedError("Truncated frame") from error
+            if received == 0:
+                raise ConnectionResetError("Connection closed by peer")
+            view = view[received:]
+
+    def __complete(self,
+                   transaction_id: int,
+                   response: bytearray | None = None,
+                   error: str | None = None,
+                   timeout: bool = False):
+        """Resolves the future of a transaction with its response or error."""
+        with self.__pending_lock:
+            transaction = self.__pending.pop(transaction_id, None)
+        if transaction is None:
+            # Late response to an expired transaction
+            return
+        self.__slots.release()
+
+        latency = time.perf_counter() - transaction.sent_at
+        bytes_received = 0
+        result = None
+        if error is None:
+            bytes_received = MBAP.size + len(response)
+            function_code = response[0]
+            if function_code != transaction.function_code:
+                error = (f"Exception code {response[1]} for function "
+                         f"{transaction.function_code}")
+            elif transaction.count:
+                result = list(
+                    struct.unpack_from(f">{transaction.count}H", response, 2))
+
+        if self.stats is not None:
+            name = REQUEST_NAMES[transaction.function_code]
+            self.stats.record(f"FC{transaction.function_code} {name}",
+                              latency,
+                              transaction.bytes_sent,
+                              bytes_received,
+                              error=error is not None,
+                              timeout=timeout,
+                              operations=transaction.operations)
+
+        if error is None:
+            transaction.future.set_result(result)
+        else:
+            transaction.future.set_exception(
+                ModbusPipelineError(f"(Modbus) Pipelined request to "
+                                    f"{self.ip}:{self.port} failed: {error}"))
+
+    def __expire_pending(self):
+        """Fails the transactions waiting for longer than the timeout."""
+        deadline = time.perf_counter() - self.timeout
+        with self.__pending_lock:
+            expired = [
+                transaction_id
+                for transaction_id, transaction in self.__pending.items()
+                if transaction.sent_at < deadline
+            ]
+        for transaction_id in expired:
+            self.__complete(transaction_id, error="Timeout", timeout=True)
+
+    def __fail_pending(self, error: str):
+        """Fails every outstanding transaction with the given error."""
+        with self.__pending_lock:
+            transaction_ids = list(self.__pending)
+        for transaction_id in transaction_ids:
+            self.__complete(transaction_id, error=error)
@@ -1,9 +1,40 @@
 """Module defining an interface to the pressure sensors and steppers PCB.
+
+Each command is encoded as a single frame, from a precompiled layout of its
+opcode, and sent in one call. Commands addressed to several steppers can be
+batched into a single frame, sharing one round trip. The replies of the PCB are
+received as exact-length frames into a buffer allocated once, and multi-value
+replies are decoded in one step. The latency of each command is recorded per
+opcode.
+
+A lost connection is restored in the background by a ConnectionManager, the
+new socket discarding any partially read frame. An idle connection is checked
+by a periodic heartbeat command, so that a dead link is detected before the
+next real command.
+
+The pressures of every sensor are kept in a shared snapshot. The callers
+asking for pressures while a read is in flight wait for its result instead
+of reading the whole sensor bank again, and the raw measures are converted
+into pressures for every sensor at once. The busy and homing bitmasks of the
+steppers are shared the same way, so that every actuator of the PCB reads its
+own bit from one exchange.
 """
 import socket
-from threading import Lock
-
+import struct
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from threading import Event, Lock, Thread
+
+import numpy as np
+
+from alibrary.electronics.connection import ConnectionManager
 from alibrary.electronics.ethernet import EthernetComponent
+from alibrary.electronics.pressure_sampler import PressureSampler
+from alibrary.electronics.stats import TransactionStats
 from alibrary.logger import logger
 
 
@@ -12,9 +43,209 @@ class PssPCBError(Exception):
     """
 
 
+class PssPCBOpcode(IntEnum):
+    """Opcodes of the commands understood by the PCB."""
+    GET_PRESSURES = 1
+    PERFORM_HOMING = 2
+    CHECK_HOMING = 3
+    DISTANCE_MOTION = 4
+    SET_ACTUAL_POSITION = 5
+    START_PRESSURE_CONTROL = 6
+    STOP_PRESSURE_CONTROL = 7
+    CHECK_DRIVER_COMMUNICATION = 8
+    GET_ACTUAL_POSITION = 9
+    CHECK_BUSY = 10
+    SET_INTEGRAL_GAIN = 11
+    SET_PROPORTIONAL_GAIN = 12
+    SET_RMS_POSITION = 14
+    SET_RMS_CONTROL = 15
+    SET_REGULATING_VALVE = 16
+    CHECKED_DISTANCE_MOTION = 19
+    CHECK_ACTUAL_POSITION = 20
+
+
+# Big-endian layout of the frame of each command, opcode included
+COMMAND_STRUCTS = {
+    PssPCBOpcode.GET_PRESSURES: struct.Struct(">B"),
+    PssPCBOpcode.PERFORM_HOMING: struct.Struct(">BB"),
+    PssPCBOpcode.CHECK_HOMING: struct.Struct(">B"),
+    PssPCBOpcode.DISTANCE_MOTION: struct.Struct(">BBBi"),
+    PssPCBOpcode.SET_ACTUAL_POSITION: struct.Struct(">BBi"),
+    PssPCBOpcode.START_PRESSURE_CONTROL: struct.Struct(">BBH"),
+    PssPCBOpcode.STOP_PRESSURE_CONTROL: struct.Struct(">BB"),
+    PssPCBOpcode.CHECK_DRIVER_COMMUNICATION: struct.Struct(">B"),
+    PssPCBOpcode.GET_ACTUAL_POSITION: struct.Struct(">BB"),
+    PssPCBOpcode.CHECK_BUSY: struct.Struct(">B"),
+    PssPCBOpcode.SET_INTEGRAL_GAIN: struct.Struct(">BBi"),
+    PssPCBOpcode.SET_PROPORTIONAL_GAIN: struct.Struct(">BBi"),
+    PssPCBOpcode.SET_RMS_POSITION: struct.Struct(">BH"),
+    PssPCBOpcode.SET_RMS_CONTROL: struct.Struct(">BBH"),
+    PssPCBOpcode.SET_REGULATING_VALVE: struct.Struct(">BB"),
+    PssPCBOpcode.CHECKED_DISTANCE_MOTION: struct.Struct(">BBi"),
+    PssPCBOpcode.CHECK_ACTUAL_POSITION: struct.Struct(">BB"),
+}
+
+
+@dataclass(frozen=True)
+class PressureSnapshot:
+    """The measures of every pressure sensor, read together.
+
+    The arrays are read-only, they are shared by every caller.
+
+    Attributes:
+        timestamp: The monotonic time at which the read was requested
+        raw: The raw measure of each sensor
+        pressures: The pressure of each sensor, the raw measure for the
+        sensors without range
+    """
+    timestamp: float
+    raw: np.ndarray
+    pressures: np.ndarray
+
+    @property
+    def age(self) -> float:
+        """Returns the age of this snapshot [s]."""
+        return time.monotonic() - self.timestamp
+
+
+@dataclass(frozen=True)
+class StepperStatus:
+    """The busy and homing bitmasks of every stepper, read together.
+
+    Attributes:
+        timestamp: The monotonic time at which the read was requested
+        busy: The bitmask of the running steppers
+        homed: The bitmask of the homed steppers
+    """
+    timestamp: float
+    busy: int
+    homed: int
+
+    @property
+    def age(self) -> float:
+        """Returns the age of this snapshot [s]."""
+        return time.monotonic() - self.timestamp
+
+    def is_busy(self, stepper_index: int) -> bool:
+        """Returns True if the given stepper is running."""
+        return (self.busy >> stepper_index) % 2 == 1
+
+    def is_homed(self, stepper_index: int) -> bool:
+        """Returns True if the homing of the given stepper has been done."""
+        return (self.homed >> stepper_index) % 2 == 1
+
+
+class _SharedSnapshot:
+    """The last snapshot of a PCB read and the read in flight, if any.
+
+    The callers asking for a snapshot while a read is in flight wait for its
+    result instead of reading again.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot = None
+        self.counters = {"reads": 0, "hits": 0, "joins": 0}
+
+        self.__lock = Lock()
+        self.__flight: Future | None = None
+        # Incremented when the state of the PCB changes, to drop the reads
+        # started before the change
+        self.__generation = 0
+
+    def get(self, max_age: float, read: Callable[[], object]):
+        """Returns the last snapshot if it is younger than `max_age`, or the
+        result of a new or in flight read.
+
+        Args:
+            max_age: The maximum age of the returned snapshot [s]
+            read: The function reading a new snapshot
+
+        Returns:
+            The snapshot
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        with self.__lock:
+            snapshot = self.snapshot
+            if snapshot is not None and snapshot.age <= max_age:
+                self.counters["hits"] += 1
+                return snapshot
+
+            flight = self.__flight
+            leader = flight is None
+            if leader:
+                flight = self.__flight = Future()
+                generation = self.__generation
+                self.counters["reads"] += 1
+            else:
+                self.counters["joins"] += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            snapshot = read()
+        except BaseException as error:
+            self.__land(flight)
+            flight.set_exception(error)
+            raise
+
+        with self.__lock:
+            if generation == self.__generation:
+                self.snapshot = snapshot
+        self.__land(flight)
+        flight.set_result(snapshot)
+        return snapshot
+
+    def __land(self, flight: Future):
+        """Clears the read in flight if it is still the given one.
+
+        After an invalidation, a newer read may already be in flight, it is
+        kept so that its followers still join it.
+        """
+        with self.__lock:
+            if self.__flight is flight:
+                self.__flight = None
+
+    def invalidate(self):
+        """Drops the last snapshot and the result of the read in flight."""
+        with self.__lock:
+            self.snapshot = None
+            self.__generation += 1
+            # The next caller starts a new read
+            self.__flight = None
+
+
 class PssPCB(EthernetComponent):
     """An interface to the pressure sensors and steppers PCB.
+
+    Every command is counted, with its size and latency from the sending of
+    its frame to the reception of its reply, in `get_stats`.
+
+    If a command fails, the connection is marked as lost and restored in the
+    background. Meanwhile, every command fails immediately with a PssPCBError
+    instead of waiting for the timeout.
+
+    Attributes:
+        n_sensors: The number of pressure sensors
+        pressure_max_age: The maximum age of the pressure snapshot returned
+        without reading the sensors [s]
+        status_max_age: The maximum age of the stepper status returned
+        without reading the bitmasks [s]
+        heartbeat_period: The idle time after which the connection is checked
+        [s], None to disable the heartbeat
+        sampler: The PressureSampler of this PCB, if started
     """
+    # Data type of the raw pressures, unsigned 16 bits big-endian
+    PRESSURE_DTYPE = np.dtype(">u2")
+    # Size of the longest scalar reply [bytes]
+    MAX_SCALAR_SIZE = 4
+
+    # Delay before the first reconnection attempt [s]
+    RECONNECT_MIN_DELAY = 0.1
+    # Maximum delay between two reconnection attempts [s]
+    RECONNECT_MAX_DELAY = 5.0
 
     def __init__(
         self,
@@ -23,21 +254,52 @@ class PssPCB(EthernetComponent):
         port: int,
         timeout: int = 2,
         offline: bool = False,
+        pressure_max_age: float = 0.05,
+        heartbeat_period: float | None = 1.0,
+        status_max_age: float = 0.05,
     ) -> None:
         super().__init__(ip, port, timeout, offline)
 
         self.n_sensors = n_sensors
+        self.pressure_max_age = pressure_max_age
+        self.status_max_age = status_max_age
+        self.heartbeat_period = heartbeat_period
         self.lock = Lock()
 
-        self._cache = [0 for _ in range(self.n_sensors)]
-        self._cache_timestamp = 0
+        # Last pressure snapshot and stepper status, shared by the callers
+        self.__pressure_snapshot = _SharedSnapshot()
+        self.__stepper_status = _SharedSnapshot()
+        # Linear conversion of the raw measures into pressures
+        self.__pressure_scale = np.ones(self.n_sensors)
+        self.__pressure_offset = np.zeros(self.n_sensors)
+        self.sampler: PressureSampler | None = None
+        # Monotonic time of the last start of each pressure control
+        self.__control_starts: dict[int, float] = {}
+
+        # Receive buffer, large enough for the longest reply
+        self.__buffer = bytearray(
+            max(self.n_sensors * self.PRESSURE_DTYPE.itemsize,
+                self.MAX_SCALAR_SIZE))
+        self.__view = memoryview(self.__buffer)
+        # Number of bytes received by the current command
+        self.__received = 0
+
+        self.stats = TransactionStats()
+        self.connection = ConnectionManager(f"PssPCB {self.ip}:{self.port}",
+                                            self.__reconnect,
+                                            self.RECONNECT_MIN_DELAY,
+                                            self.RECONNECT_MAX_DELAY)
+
+        # Monotonic time of the last successful command
+        self.__last_success = time.monotonic()
+        self.__heartbeat_counters = {"count": 0, "failures": 0}
+        self.__heartbeat_latency: float | None = None
+        self.__heartbeat_stop = Event()
+        self.__heartbeat_thread: Thread | None = None
 
         if not self.offline:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(self.timeout)
             try:
-                self.socket.connect((self.ip, self.port))
-
+                self.socket = self.__connect()
             except socket.timeout as error:
                 logger.error("(PssPCB) Connection timeout while reading (%s)",
                              error)
@@ -46,6 +308,153 @@ class PssPCB(EthernetComponent):
                 logger.error("(PssPCB) Error while reading (%s)", error)
                 raise PssPCBError(str(error)) from error
 
+            if self.heartbeat_period is not None:
+                self.__heartbeat_thread = Thread(
+                    target=self.__heartbeat_loop,
+                    name=f"heartbeat PssPCB {self.ip}:{self.port}",
+                    daemon=True)
+                self.__heartbeat_thread.start()
+
+    def __connect(self) -> socket.socket:
+        """Opens a new connection to the PCB.
+
+        Returns:
+            A connected socket
+
+        Raises:
+            OSError: The connection failed
+        """
+        soc = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        soc.settimeout(self.timeout)
+        # The frames are complete, they must not wait for more data
+        soc.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            soc.connect((self.ip, self.port))
+        except OSError:
+            soc.close()
+            raise
+        return soc
+
+    def __reconnect(self) -> bool:
+        """Replaces the socket by a new connection.
+
+        The bytes left in the old socket, e.g. the end of a frame whose read
+        timed out, are discarded with it. The old socket is closed before the
+        new connection is opened, the TCP stack of the PCB accepting a single
+        client.
+
+        Returns:
+            True if the connection has been restored, False otherwise
+        """
+        with self.lock:
+            self.socket.close()
+            try:
+                self.socket = self.__connect()
+            except OSError as error:
+                self.connection.last_error = str(error)
+                return False
+            self.__last_success = time.monotonic()
+        return True
+
+    def close(self):
+        """Stops the heartbeat and any reconnection and closes the socket."""
+        self.stop_pressure_sampler()
+        self.__heartbeat_stop.set()
+        if self.__heartbeat_thread is not None:
+            self.__heartbeat_thread.join()
+            self.__heartbeat_thread = None
+        self.connection.close()
+        if not self.offline:
+            with self.lock:
+                self.socket.close()
+
+    def heartbeat(self) -> float:
+        """Checks the connection with a lightweight command.
+
+        The busy status of the steppers is requested and its reply discarded.
+
+        Returns:
+            The round trip time of the command [s]
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        start = time.perf_counter()
+        try:
+            with self.__command(PssPCBOpcode.CHECK_BUSY):
+                self.__receive(2)
+        except PssPCBError:
+            self.__heartbeat_counters["failures"] += 1
+            raise
+        finally:
+            self.__heartbeat_counters["count"] += 1
+
+        self.__heartbeat_latency = time.perf_counter() - start
+        return self.__heartbeat_latency
+
+    def get_connection_info(self) -> dict[str,]:
+        """Returns the health of the connection.
+
+        Returns:
+            A JSON object describing the connection state, its reconnection
+            counters and the heartbeat results
+        """
+        info = self.connection.get_info()
+        info["idle_for"] = time.monotonic() - self.__last_success
+        info["heartbeat"] = {
+            **self.__heartbeat_counters,
+            "period": self.heartbeat_period,
+            "latency": self.__heartbeat_latency,
+        }
+        return info
+
+    def __heartbeat_loop(self):
+        """Checks the connection each time it has been idle for a period."""
+        while not self.__heartbeat_stop.wait(self.heartbeat_period):
+            idle = time.monotonic() - self.__last_success
+            if not self.connection.is_connected or idle < self.heartbeat_period:
+                continue
+            try:
+                self.heartbeat()
+            except PssPCBError as error:
+                logger.debug("(PssPCB) Heartbeat failed: %s", error)
+
+    def __receive(self, n_bytes: int) -> memoryview:
+        """Receives a frame of exactly `n_bytes` bytes from the PCB.
+
+        The bytes are written in the receive buffer, the returned view is only
+        valid until the next reception.
+
+        Args:
+            n_bytes: The length of the frame
+
+        Returns:
+            A memoryview on the received frame
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        assert self.offline is False
+
+        frame = self.__view[:n_bytes]
+        received = 0
+        try:
+            while received < n_bytes:
+                count = self.socket.recv_into(frame[received:])
+                if count == 0:
+                    raise PssPCBError("Connection closed by the PCB after "
+                                      f"{received}/{n_bytes} bytes")
+                received += count
+                self.__received += count
+        except socket.timeout as error:
+            logger.error("(PssPCB) Timeout while reading (%s)", error)
+            raise PssPCBError(str(error)) from error
+        except OSError as error:
+            logger.error("(PssPCB) Error while reading (%s)", error)
+            raise PssPCBError(str(error)) from error
+
+        return frame
+
     def __read(self, n_bytes: int = 1, signed: bool = False) -> int:
         """Reads and returns an integer from the PCB.
 
@@ -55,57 +464,290 @@ class PssPCB(EthernetComponent):
             n_bytes: The number of bytes to read
             signed: A flag indicating if the two's complement should be used in
             the conversion
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
         """
-        assert self.offline is False
+        return int.from_bytes(self.__receive(n_bytes),
+                              byteorder="big",
+                              signed=signed)
 
-        data = b""
-        for _ in range(n_bytes):
-            data += self.socket.recv(1)
+    @contextmanager
+    def __command(self, opcode: PssPCBOpcode, *values) -> Iterator[None]:
+        """Sends the frame of a command and holds the lock while its reply is
+        read in the context.
 
-        return int.from_bytes(data, byteorder="big", signed=signed)
+        The frame is encoded with the layout of the opcode and sent in a
+        single call. The command is recorded in the statistics when the
+        context is closed.
 
-    def __send(self, value: int, n_bytes: int = 1, signed: bool = False):
-        """Sends the given integer to the PCB.
+        Args:
+            opcode: The PssPCBOpcode of the command
+            values: The arguments of the command
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        frame = COMMAND_STRUCTS[opcode].pack(opcode, *values)
+        with self.__exchange(opcode.name.lower(), frame):
+            yield
+
+    @contextmanager
+    def __batch(self, key: str,
+                commands: list[tuple[PssPCBOpcode, tuple]]) -> Iterator[None]:
+        """Sends the frames of several commands at once and holds the lock
+        while their replies are read in the context, in the same order.
 
-        It converts the given int to bytes using the given number of bytes and
-        the signed flag. It then sends all bytes to the PCB through a socket.
+        The PCB executes the commands one after the other, as if they were
+        sent separately, but they share a single send call and round trip.
 
         Args:
-            value: The integer to send
-            n_bytes: The number of bytes the integer should be converted to
-            signed: A flag indicating if the two's complement should be used in
-            the conversion
+            key: The name of the batch in the statistics
+            commands: The PssPCBOpcode and the arguments of each command
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        frame = b"".join(COMMAND_STRUCTS[opcode].pack(opcode, *values)
+                         for opcode, values in commands)
+        with self.__exchange(key, frame):
+            yield
+
+    @contextmanager
+    def __exchange(self, key: str, frame: bytes) -> Iterator[None]:
+        """Sends a frame and holds the lock while its reply is read in the
+        context.
+
+        Args:
+            key: The name of the exchange in the statistics
+            frame: The encoded commands
 
         Raises:
             PssPCBError: An error occurs in th communication with the PCB
         """
         assert self.offline is False
 
-        data = value.to_bytes(n_bytes, byteorder="big", signed=signed)
-        self.socket.sendall(data)
+        with self.lock:
+            self.__received = 0
+            start = time.perf_counter()
+            error = None
+            try:
+                if not self.connection.is_connected:
+                    raise PssPCBError(
+                        f"(PssPCB) {self.ip}:{self.port} is disconnected: "
+                        f"{self.connection.last_error}")
+                try:
+                    self.socket.sendall(frame)
+                except OSError as exception:
+                    logger.error("(PssPCB) Error while sending (%s)",
+                                 exception)
+                    raise PssPCBError(str(exception)) from exception
+                yield
+            except PssPCBError as exception:
+                error = exception
+                # The stream may hold a partial frame, it is not reused
+                if self.connection.is_connected:
+                    self.connection.mark_disconnected(str(exception))
+                raise
+            else:
+                self.__last_success = time.monotonic()
+            finally:
+                self.stats.record(
+                    key,
+                    time.perf_counter() - start,
+                    len(frame),
+                    self.__received,
+                    error=error is not None,
+                    timeout=isinstance(getattr(error, "__cause__", None),
+                                       socket.timeout))
+
+    def __execute(self, opcode: PssPCBOpcode, *values):
+        """Sends a command without reply.
+
+        Args:
+            opcode: The PssPCBOpcode of the command
+            values: The arguments of the command
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        with self.__command(opcode, *values):
+            pass
+
+    def get_stats(self) -> dict[str,]:
+        """Returns the statistics of the commands sent to the PCB.
 
-    def get_raw_pressures(self) -> list[int]:
+        Returns:
+            A JSON object with the total counters and the counters of each
+            opcode
+        """
+        stats = self.stats.get_stats()
+        stats["device"] = f"{self.ip}:{self.port}"
+        stats["pressure_snapshot"] = dict(self.__pressure_snapshot.counters)
+        stats["stepper_status"] = dict(self.__stepper_status.counters)
+        return stats
+
+    def set_sensor_range(self, sensor_index: int, p_range: tuple[float, float],
+                         n_max: int):
+        """Sets the conversion of the raw measures of a sensor.
+
+        The raw measures from 10% to 90% of `n_max` are mapped linearly to
+        the pressure range.
+
+        Args:
+            sensor_index: The index of the sensor
+            p_range: The minimum and maximum pressures of the sensor
+            n_max: The full scale of the raw measures
+        """
+        p_min, p_max = p_range
+        scale = (p_max - p_min) / (0.8 * n_max)
+        self.__pressure_scale[sensor_index] = scale
+        self.__pressure_offset[sensor_index] = p_min - 0.1 * n_max * scale
+
+    def get_pressure_snapshot(self,
+                              max_age: float | None = None
+                              ) -> PressureSnapshot:
+        """Returns the measures of every pressure sensor.
+
+        The last snapshot is returned if it is younger than `max_age`.
+        Otherwise, the sensors are read, unless a read is already in flight,
+        in which case its result is returned.
+
+        Args:
+            max_age: The maximum age of the returned snapshot [s], by default
+            `pressure_max_age`
+
+        Returns:
+            A PressureSnapshot
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        if max_age is None:
+            max_age = self.pressure_max_age
+        return self.__pressure_snapshot.get(max_age,
+                                            self.__read_pressure_snapshot)
+
+    def get_stepper_status(self,
+                           max_age: float | None = None) -> StepperStatus:
+        """Returns the busy and homing bitmasks of every stepper.
+
+        The last status is returned if it is younger than `max_age`.
+        Otherwise, both bitmasks are read in one exchange, unless a read is
+        already in flight, in which case its result is returned. The status
+        is dropped by every command moving or homing a stepper.
+
+        Args:
+            max_age: The maximum age of the returned status [s], by default
+            `status_max_age`
+
+        Returns:
+            A StepperStatus
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        if max_age is None:
+            max_age = self.status_max_age
+        return self.__stepper_status.get(max_age, self.__read_stepper_status)
+
+    def __read_stepper_status(self) -> StepperStatus:
+        """Reads the busy and homing bitmasks of every stepper.
+
+        Returns:
+            A new StepperStatus
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        timestamp = time.monotonic()
+        busy, homed = self.check_steppers()
+        return StepperStatus(timestamp, busy, homed)
+
+    def start_pressure_sampler(self,
+                               rate: float = 50.0,
+                               duration: float = 60.0) -> PressureSampler:
+        """Starts sampling every pressure sensor in the background.
+
+        While it runs, the pressure readers are served from its samples.
+
+        Args:
+            rate: The sampling rate [Hz]
+            duration: The duration of the kept history [s]
+
+        Returns:
+            The started PressureSampler
+        """
+        if self.sampler is None:
+            self.sampler = PressureSampler(self, rate, duration)
+        self.sampler.start()
+        return self.sampler
+
+    def stop_pressure_sampler(self):
+        """Stops the pressure sampler of this PCB."""
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def get_raw_pressures(self, max_age: float | None = None) -> np.ndarray:
         """Returns all the measured pressures.
 
+        Args:
+            max_age: The maximum age of the measures [s], by default
+            `pressure_max_age`
+
         Returns:
-            A list of float representing the pressures
+            A read-only array of int representing the raw pressures
 
         Raises:
             PssPCBError: An error occurs in th communication with the PCB
         """
-        pressures = [0 for _ in range(self.n_sensors)]
+        return self.get_pressure_snapshot(max_age).raw
 
-        if not self.offline:
-            with self.lock:
-                self.__send(1)
+    def get_pressures(self, max_age: float | None = None) -> np.ndarray:
+        """Returns the pressures of every sensor.
 
-                # Reading
-                for i in range(self.n_sensors):
-                    data = self.__read(2)
-                    pressures[i] = data
+        Args:
+            max_age: The maximum age of the measures [s], by default
+            `pressure_max_age`
 
-        logger.debug("(PCB) Reading raw pressures %s", pressures)
-        return pressures
+        Returns:
+            A read-only array of float representing the pressures
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        return self.get_pressure_snapshot(max_age).pressures
+
+    def __read_pressure_snapshot(self) -> PressureSnapshot:
+        """Reads every pressure sensor and converts the raw measures.
+
+        The reply of every sensor is received as a single frame and decoded
+        at once.
+
+        Returns:
+            A new PressureSnapshot
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        timestamp = time.monotonic()
+        if self.offline:
+            raw = np.zeros(self.n_sensors, dtype=np.int64)
+        else:
+            with self.__command(PssPCBOpcode.GET_PRESSURES):
+                frame = self.__receive(self.n_sensors *
+                                       self.PRESSURE_DTYPE.itemsize)
+                # Copied out of the receive buffer, in the native byte order
+                raw = np.frombuffer(frame,
+                                    dtype=self.PRESSURE_DTYPE).astype(np.int64)
+
+        pressures = raw * self.__pressure_scale + self.__pressure_offset
+        raw.flags.writeable = False
+        pressures.flags.writeable = False
+
+        logger.debug("(PCB) Reading raw pressures %s", raw)
+        return PressureSnapshot(timestamp, raw, pressures)
 
     def perform_homing(self, index: int):
         """Performs the homing of the requested component.
@@ -119,9 +761,8 @@ class PssPCB(EthernetComponent):
         """
         logger.debug("(PCB) Performing homing of %s", bin(index))
         if not self.offline:
-            with self.lock:
-                self.__send(2)
-                self.__send(index)
+            self.__execute(PssPCBOpcode.PERFORM_HOMING, index)
+        self.__stepper_status.invalidate()
 
     def check_homing_done(self) -> int:
         """Checks on all component if the homing has been performed.
@@ -141,8 +782,7 @@ class PssPCB(EthernetComponent):
         """
         logger.debug("(PCB) Checking homing")
         if not self.offline:
-            with self.lock:
-                self.__send(3)
+            with self.__command(PssPCBOpcode.CHECK_HOMING):
                 return self.__read(2)
         return 65535
 
@@ -159,11 +799,50 @@ class PssPCB(EthernetComponent):
         logger.debug("(PCB) Performing distance motion to %s on %s", target,
                      stepper_index)
         if not self.offline:
-            with self.lock:
-                self.__send(4)
-                self.__send(1)
-                self.__send(stepper_index)
-                self.__send(target, n_bytes=4, signed=True)
+            self.__execute(PssPCBOpcode.DISTANCE_MOTION, 1, stepper_index,
+                           target)
+        self.__stepper_status.invalidate()
+
+    def perform_distance_motions(self, targets: dict[int, int]):
+        """Starts absolute distance motions on several steppers at once.
+
+        The commands of every stepper are sent in a single frame.
+
+        Args:
+            targets: The absolute target distance of each stepper, by index
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        logger.debug("(PCB) Performing distance motions to %s", targets)
+        if not self.offline and targets:
+            commands = [(PssPCBOpcode.DISTANCE_MOTION, (1, index, target))
+                        for index, target in targets.items()]
+            with self.__batch("distance_motions", commands):
+                pass
+        self.__stepper_status.invalidate()
+
+    def check_steppers(self) -> tuple[int, int]:
+        """Checks on all steppers if they are running and if they are homed.
+
+        Both commands are sent in a single frame and their replies are read
+        together.
+
+        Returns:
+            The busy bitmask, as returned by `check_busy`, and the homing
+            bitmask, as returned by `check_homing_done`
+
+        Raises:
+            PssPCBError: An error occurs in th communication with the PCB
+        """
+        logger.debug("(PCB) Checking busy and homing")
+        if not self.offline:
+            commands = [(PssPCBOpcode.CHECK_BUSY, ()),
+                        (PssPCBOpcode.CHECK_HOMING, ())]
+            with self.__batch("check_steppers", commands):
+                busy, homed = struct.unpack(">HH", self.__receive(4))
+                return busy, homed
+        return 65535, 65535
 
     def set_actual_position(self, stepper_index: int, position: int):
         """Sets the actual position of the specified stepper.
@@ -182,10 +861,9 @@ class PssPCB(EthernetComponent):
         logger.debug("(PCB) Setting actual position to %s on stepper %s",
                      position, stepper_index)
         if not self.offline:
-            with self.lock:
-                self.__send(5)
-                self.__send(stepper_index)
-                self.__send(position, n_bytes=4, signed=True)
+            self.__execute(PssPCBOpcode.SET_ACTUAL_POSITION, stepper_index,
+                           position)
+        self.__stepper_status.invalidate()
 
     def start_pressure_control(self, control_index: int, data: int):
         """Starts the pressure control to maintain the requested pressure in
@@ -203,10 +881,23 @@ class PssPCB(EthernetComponent):
         logger.debug("(PCB) Starting pressure control of %s for %s", data,
                      control_index)
         if not self.offline:
-            with self.lock:
-                self.__send(6)
-                self.__send(control_index)
-                self.__send(data, n_bytes=2)
+            self.__execute(PssPCBOpcode.START_PRESSURE_CONTROL, control_index,
+                           data)
+        self.__control_starts[control_index] = time.monotonic()
+
+    def get_control_start(self, control_index: int) -> float | None:
+        """Returns the time of the last start of a pressure control.
+
+        It is the reference of the settling times of the PressureSampler.
+
+        Args:
+            control_index: The destination of the pressure control
+
+        Returns:
+            The monotonic time at which the last start command was sent, None
+            if the control was never started
+        """
+        return self.__control_starts.get(control_index)
 
     def stop_pressure_control(self, control_index: int):
         """Stops the pressure control of the given component
@@ -219,9 +910,7 @@ class PssPCB(EthernetComponent):
         """
         logger.debug("(PCB) Stopping pressure control for %s", control_index)
         if not self.offline:
-            with self.lock:
-                self.__send(7)
-                self.__send(control_index)
+            self.__execute(PssPCBOpcode.STOP_PRESSURE_CONTROL, control_index)
 
     # def check_driver_communication(self):
     #     self.__send(8)
@@ -238,9 +927,9 @@ class PssPCB(EthernetComponent):
         Returns:
         """
         if not self.offline:
-            self.__send(9)
-            self.__send(stepper_index)
-            return self.__read(4, signed=True)
+            with self.__command(PssPCBOpcode.GET_ACTUAL_POSITION,
+                                stepper_index):
+                return self.__read(4, signed=True)
         return 0
 
     def check_busy(self) -> int:
@@ -260,8 +949,7 @@ class PssPCB(EthernetComponent):
         """
         logger.debug("(PCB) Checking busy")
         if not self.offline:
-            with self.lock:
-                self.__send(10)
+            with self.__command(PssPCBOpcode.CHECK_BUSY):
                 return self.__read(2)
         return 65535
 
@@ -271,10 +959,7 @@ class PssPCB(EthernetComponent):
         Args:
         """
         if not self.offline:
-            with self.lock:
-                self.__send(11)
-                self.__send(control_index)
-                self.__send(gain, n_bytes=4, signed=True)
+            self.__execute(PssPCBOpcode.SET_INTEGRAL_GAIN, control_index, gain)
 
     def set_proportional_gain(self, control_index, gain):
         """Sets the proportional gain of the given controlled valve.
@@ -282,10 +967,8 @@ class PssPCB(EthernetComponent):
         Args:
         """
         if not self.offline:
-            with self.lock:
-                self.__send(12)
-                self.__send(control_index)
-                self.__send(gain, n_bytes=4, signed=True)
+            self.__execute(PssPCBOpcode.SET_PROPORTIONAL_GAIN, control_index,
+                           gain)
 
     # 250
     def set_rms_position(self, current):
@@ -295,9 +978,7 @@ class PssPCB(EthernetComponent):
 
         """
         if not self.offline:
-            with self.lock:
-                self.__send(14)
-                self.__send(current, n_bytes=2)
+            self.__execute(PssPCBOpcode.SET_RMS_POSITION, current)
 
     # 200
     def set_rms_control(self, control_index, current):
@@ -307,10 +988,8 @@ class PssPCB(EthernetComponent):
 
         """
         if not self.offline:
-            with self.lock:
-                self.__send(15)
-                self.__send(control_index)
-                self.__send(current, n_bytes=2)
+            self.__execute(PssPCBOpcode.SET_RMS_CONTROL, control_index,
+                           current)
 
     def set_regulating_valve(self, index):
         """Sets if the leveler pressure is regulated using the leveler valve or
@@ -320,19 +999,14 @@ class PssPCB(EthernetComponent):
 
         """
         if not self.offline:
-            with self.lock:
-                self.__send(16)
-                self.__send(index)
+            self.__execute(PssPCBOpcode.SET_REGULATING_VALVE, index)
 
     def perform_distance_motion_new(self, stepper_index, position):
         """Send values and then check if the ones read are the same."""
         logger.warning(self.check_actual_position(stepper_index))
         if not self.offline:
-            with self.lock:
-                self.__send(19)
-                self.__send(stepper_index)
-                self.__send(position, n_bytes=4, signed=True)
-
+            with self.__command(PssPCBOpcode.CHECKED_DISTANCE_MOTION,
+                                stepper_index, position):
                 pcb_stepper_index = self.__read()
                 pcb_position = self.__read(n_bytes=4, signed=True)
 
@@ -344,13 +1018,13 @@ class PssPCB(EthernetComponent):
                         pcb_stepper_index, pcb_position)
                 else:
                     logger.debug("Communication checked")
+        self.__stepper_status.invalidate()
         logger.warning(self.check_actual_position(stepper_index))
 
     def check_actual_position(self, stepper_index):
         if not self.offline:
-            with self.lock:
-                self.__send(20)
-                self.__send(stepper_index)
+            with self.__command(PssPCBOpcode.CHECK_ACTUAL_POSITION,
+                                stepper_index):
                 position = self.__read(n_bytes=4, signed=True)
                 return position
         return 0.0
@@ -0,0 +1,229 @@
+"""Module defining a background sampler of the pressure sensors of a PssPCB.
+
+A PressureSampler reads every pressure sensor of a PCB at a fixed rate and
+keeps the pressures in a preallocated RingBuffer, one column per sensor. Each
+read refreshes the pressure snapshot of the PCB, whose max age is raised while
+the sampler runs, so that the valves, the leveler and the drums read their
+pressure from the sampler instead of the sensors.
+
+The history gives windowed statistics and settling times, used to tune the
+pressure regulation.
+
+Typical usage example:
+
+sampler = pcb.start_pressure_sampler(rate=100)
+pcb.set_proportional_gain(control_index, gain)
+valve.set_pressure(0.2)
+time.sleep(5)
+settling = sampler.get_settling_time(
+    valve.sensor_index, 0.2, 0.01, pcb.get_control_start(valve.control_index))
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+from alibrary.buffers import RingBuffer
+from alibrary.logger import logger
+
+
+class PressureSampler:
+    """Samples the pressure sensors of a PssPCB in the background.
+
+    The buffer keeps the last `duration` seconds of samples. While the
+    sampler runs, the PCB snapshot max age is raised to three periods.
+
+    Attributes:
+        pcb: The sampled PssPCB
+        rate: The sampling rate [Hz]
+        buffer: The RingBuffer of the samples
+        samples: The number of samples recorded
+        errors: The number of failed reads
+        overruns: The number of samples taken late
+    """
+
+    def __init__(self, pcb, rate: float = 50.0,
+                 duration: float = 60.0) -> None:
+        self.pcb = pcb
+        self.rate = rate
+        self.buffer = RingBuffer(
+            math.ceil(rate * duration),
+            ("timestamp",) + tuple(f"sensor_{index}"
+                                   for index in range(pcb.n_sensors)))
+        self.samples = 0
+        self.errors = 0
+        self.overruns = 0
+
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+        # Max age of the PCB snapshot before the start of the sampler
+        self.__pcb_max_age: float | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if the sampling thread is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self):
+        """Starts the sampling thread."""
+        if self.is_running:
+            return
+
+        self.__pcb_max_age = self.pcb.pressure_max_age
+        self.pcb.pressure_max_age = max(self.__pcb_max_age, 3 / self.rate)
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name="pressure sampler",
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stops the sampling thread and waits for its end."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+            self.pcb.pressure_max_age = self.__pcb_max_age
+
+    def get_history(self, window: float | None = None) -> np.ndarray:
+        """Returns the samples of the last `window` seconds.
+
+        Args:
+            window: The duration of the history [s], None for every sample
+
+        Returns:
+            A 2D array with one row per sample, the timestamp then the
+            pressure of each sensor
+        """
+        start = None if window is None else time.monotonic() - window
+        return self.buffer.get_samples(start)
+
+    def get_statistics(self, window: float) -> dict[str,]:
+        """Returns the statistics of each sensor over the last `window`
+        seconds.
+
+        Args:
+            window: The duration of the statistics window [s]
+
+        Returns:
+            A JSON object with the number of samples and the mean, minimum,
+            maximum and variance of the pressure of each sensor
+        """
+        pressures = self.get_history(window)[:, 1:]
+        if len(pressures) == 0:
+            return {"samples": 0, "window": window, "sensors": []}
+
+        statistics = np.stack([
+            pressures.mean(axis=0),
+            pressures.min(axis=0),
+            pressures.max(axis=0),
+            pressures.var(axis=0),
+        ], axis=1)
+        sensors = [
+            dict(zip(("mean", "min", "max", "variance"), values))
+            for values in statistics.tolist()
+        ]
+        return {"samples": len(pressures), "window": window, "sensors": sensors}
+
+    def get_settling_time(self, sensor_index: int, target: float,
+                          tolerance: float, since: float) -> float | None:
+        """Returns the time taken by a pressure to settle around a target.
+
+        The pressure is settled from the first sample after which it stays
+        within the tolerance of the target until the last sample. The time
+        is measured from `since`, typically the start of the regulation
+        returned by `PssPCB.get_control_start`.
+
+        Args:
+            sensor_index: The index of the sensor
+            target: The target pressure
+            tolerance: The maximum distance to the target of a settled
+            pressure
+            since: The monotonic time of the regulation step
+
+        Returns:
+            The time from `since` to the settling [s], None if there is no
+            sample since then or if the pressure is not settled at the last
+            sample
+        """
+        history = self.buffer.get_samples(since)
+        if len(history) == 0:
+            return None
+
+        outside = np.flatnonzero(
+            np.abs(history[:, sensor_index + 1] - target) > tolerance)
+        if len(outside) == 0:
+            return float(history[0, 0] - since)
+        if outside[-1] == len(history) - 1:
+            return None
+        return float(history[outside[-1] + 1, 0] - since)
+
+    def to_json(self,
+                window: float | None = None,
+                max_points: int = 500) -> dict[str,]:
+        """Returns a JSON representation of the history.
+
+        The samples are decimated so that at most `max_points` are returned.
+        The timestamps are given relative to the newest sample.
+
+        Args:
+            window: The duration of the history [s], None for every sample
+            max_points: The maximum number of samples returned
+
+        Returns:
+            A JSON object with the timestamps and the pressures of each sensor
+        """
+        history = self.get_history(window)
+        step = max(1, math.ceil(len(history) / max_points))
+        history = history[::step]
+        timestamps = history[:, 0]
+        if len(timestamps):
+            timestamps = timestamps - timestamps[-1]
+        return {
+            "samples": len(history),
+            "step": step,
+            "timestamp": timestamps.tolist(),
+            "pressures": history[:, 1:].T.tolist(),
+        }
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the sampler counters.
+
+        Returns:
+            A JSON object with the sampling counters
+        """
+        return {
+            "running": self.is_running,
+            "rate": self.rate,
+            "buffered": len(self.buffer),
+            "samples": self.samples,
+            "errors": self.errors,
+            "overruns": self.overruns,
+        }
+
+    def __run(self):
+        """Samples every sensor once per period until stopped."""
+        period = 1 / self.rate
+        sample = np.zeros(self.pcb.n_sensors + 1)
+
+        next_sample = time.monotonic()
+        while not self.__stop.wait(max(0.0, next_sample - time.monotonic())):
+            try:
+                snapshot = self.pcb.get_pressure_snapshot(max_age=0)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                self.errors += 1
+                logger.debug("(Pressure sampler) Read of %s failed: %s",
+                             self.pcb.ip, error)
+            else:
+                sample[0] = snapshot.timestamp
+                sample[1:] = snapshot.pressures
+                self.buffer.append(sample)
+                self.samples += 1
+
+            next_sample += period
+            now = time.monotonic()
+            if next_sample < now:
+                self.overruns += 1
+                next_sample = now
@@ -0,0 +1,171 @@
+"""Module defining a declarative description of Modbus registers.
+
+A register map lists named fields stored in Modbus registers. The fields are
+grouped into contiguous blocks so that a ModbusComponent can fetch each block
+in a single request and decode it at once with a precompiled struct layout.
+
+Typical usage example:
+
+motion_map = ModbusRegisterMap([
+    ModbusField("position", 2008),
+    ModbusField("speed", 2010),
+])
+values = component.read_map(motion_map)
+"""
+import struct
+from dataclasses import dataclass
+
+# Number of 16 bits registers used by each supported struct format
+FIELD_SIZES = {"h": 1, "H": 1, "i": 2, "I": 2}
+
+# Maximum number of registers that can be read in one Modbus request
+MAX_BLOCK_SIZE = 125
+
+# Maximum number of registers that can be written in one Modbus request
+MAX_WRITE_BLOCK_SIZE = 123
+
+
+@dataclass(frozen=True)
+class ModbusField:
+    """A named value stored in one or two consecutive Modbus registers.
+
+    32 bits values are stored with the most significant word first, as in
+    ModbusComponent.read_registers.
+
+    Attributes:
+        name: The name of the field, used as key in the decoded values
+        address: The Modbus address of the first register of the field
+        fmt: The struct format of the value, "h" or "H" for a signed or
+        unsigned 16 bits value, "i" or "I" for a signed or unsigned 32 bits
+        value
+    """
+    name: str
+    address: int
+    fmt: str = "i"
+
+    def __post_init__(self):
+        if self.fmt not in FIELD_SIZES:
+            raise ValueError(f"Unsupported format '{self.fmt}' for field "
+                             f"{self.name}")
+
+    @property
+    def size(self) -> int:
+        """Returns the number of registers used by this field."""
+        return FIELD_SIZES[self.fmt]
+
+
+class ModbusBlock:
+    """A contiguous range of registers holding one or more fields.
+
+    The struct layout used to decode the registers is compiled once, when the
+    block is created.
+
+    Attributes:
+        fields: The fields of this block, sorted by address
+        address: The Modbus address of the first register of this block
+        count: The number of registers covered by this block
+        has_gaps: A flag indicating if the block contains unused registers
+    """
+
+    def __init__(self, fields: list[ModbusField]) -> None:
+        self.fields = tuple(sorted(fields, key=lambda field: field.address))
+        self.address = self.fields[0].address
+
+        layout = ">"
+        cursor = self.address
+        for field in self.fields:
+            if field.address < cursor:
+                raise ValueError(f"Field {field.name} overlaps another field "
+                                 f"at address {field.address}")
+            if field.address > cursor:
+                layout += f"{2 * (field.address - cursor)}x"
+            layout += field.fmt
+            cursor = field.address + field.size
+
+        self.count = cursor - self.address
+        self.names = tuple(field.name for field in self.fields)
+        self.has_gaps = sum(field.size for field in self.fields) != self.count
+
+        self.__layout = struct.Struct(layout)
+        self.__words = struct.Struct(f">{self.count}H")
+
+    def decode(self, registers: list[int]) -> dict[str, int]:
+        """Decodes the registers of this block into the values of its fields.
+
+        Args:
+            registers: The values of the registers, starting at this block
+            address
+
+        Returns:
+            A dictionary with the value of each field
+        """
+        words = self.__words.pack(*registers)
+        return dict(zip(self.names, self.__layout.unpack(words)))
+
+    def encode(self, values: dict[str, int]) -> list[int]:
+        """Encodes the values of this block fields into register values.
+
+        Args:
+            values: A dictionary with the value of each field of this block
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+
+        Raises:
+            ValueError: The block contains unused registers, which would be
+            overwritten
+        """
+        if self.has_gaps:
+            raise ValueError(f"Cannot encode block at {self.address}, it "
+                             "contains unused registers")
+
+        words = self.__layout.pack(*(values[name] for name in self.names))
+        return list(self.__words.unpack(words))
+
+
+class ModbusRegisterMap:
+    """A set of named fields, grouped into blocks of contiguous registers.
+
+    Fields separated by at most `max_gap` unused registers are merged into
+    the same block. The unused registers are then read but ignored. By default
+    only strictly contiguous fields are merged.
+
+    Attributes:
+        fields: The fields of this map
+        blocks: The blocks of contiguous registers covering every field
+    """
+
+    def __init__(self, fields: list[ModbusField], max_gap: int = 0) -> None:
+        self.fields = tuple(sorted(fields, key=lambda field: field.address))
+        self.max_gap = max_gap
+
+        if len({field.name for field in self.fields}) != len(self.fields):
+            raise ValueError("Register map fields must have unique names")
+
+        blocks: list[list[ModbusField]] = []
+        end = None
+        for field in self.fields:
+            if (end is None or field.address - end > max_gap or
+                    field.address + field.size - blocks[-1][0].address >
+                    MAX_BLOCK_SIZE):
+                blocks.append([])
+            blocks[-1].append(field)
+            end = field.address + field.size
+
+        self.blocks = tuple(ModbusBlock(block) for block in blocks)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Returns the names of the fields of this map."""
+        return tuple(field.name for field in self.fields)
+
+    def with_fields(self, fields: list[ModbusField]) -> "ModbusRegisterMap":
+        """Returns a new map containing this map fields and the given ones.
+
+        Args:
+            fields: The fields to add
+
+        Returns:
+            A new ModbusRegisterMap
+        """
+        return ModbusRegisterMap(list(self.fields) + list(fields), self.max_gap)
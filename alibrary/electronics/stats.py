@@ -0,0 +1,238 @@
+"""Module defining lightweight transaction statistics.
+
+It records the number of transactions, the exchanged bytes, the errors and a
+latency histogram with fixed buckets. Recording a transaction only increments
+a few counters so it can be done on every request of a hot path.
+
+Typical usage example:
+
+stats = TransactionStats()
+stats.record("read_registers", latency=0.0012, bytes_sent=12, bytes_received=13)
+print(stats.get_stats())
+"""
+import threading
+from bisect import bisect_left
+from collections.abc import Hashable
+
+# Upper bounds of the latency histogram buckets [ms], the last bucket gathers
+# every longer transaction
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+class TransactionCounter:
+    """Counters of a group of transactions.
+
+    Attributes:
+        count: The number of transactions
+        errors: The number of transactions that failed
+        timeouts: The number of transactions that timed out
+        bytes_sent: The number of bytes sent
+        bytes_received: The number of bytes received
+        total_latency: The sum of the transactions latency [s]
+        max_latency: The longest transaction latency [s]
+        histogram: The number of transactions in each latency bucket
+    """
+    __slots__ = ("count", "errors", "timeouts", "bytes_sent",
+                 "bytes_received", "total_latency", "max_latency", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self,
+               latency: float,
+               bytes_sent: int = 0,
+               bytes_received: int = 0,
+               error: bool = False,
+               timeout: bool = False):
+        """Records one transaction.
+
+        Args:
+            latency: The duration of the transaction [s]
+            bytes_sent: The number of bytes sent
+            bytes_received: The number of bytes received
+            error: A flag indicating if the transaction failed
+            timeout: A flag indicating if the transaction timed out
+        """
+        self.count += 1
+        self.errors += error or timeout
+        self.timeouts += timeout
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency * 1000)] += 1
+
+    def to_json(self) -> dict[str,]:
+        """Returns a JSON representation of these counters.
+
+        Latencies are given in milliseconds. The histogram keys are the upper
+        bounds of the buckets.
+
+        Returns:
+            A JSON object with the counters
+        """
+        buckets = [f"<={bound}ms" for bound in LATENCY_BUCKETS]
+        buckets.append(f">{LATENCY_BUCKETS[-1]}ms")
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_latency_ms": (1000 * self.total_latency /
+                                self.count if self.count else 0.0),
+            "max_latency_ms": 1000 * self.max_latency,
+            "histogram": dict(zip(buckets, self.histogram)),
+        }
+
+
+class TransactionStats:
+    """Transaction counters grouped by key and by high level operation.
+
+    The key identifies the kind of transaction, e.g. a Modbus function code.
+    The operation is the high level action that caused the transaction. It is
+    set per thread with `begin_operation` and `end_operation`. Operations may
+    be nested, a transaction then counts for every active operation of its
+    thread, e.g. the requests of a stop run inside a start count for both.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__counters: dict[Hashable, TransactionCounter] = {}
+        self.__operations: dict[str, TransactionCounter] = {}
+        self.__operation_calls: dict[str, int] = {}
+
+    @property
+    def operation(self) -> str | None:
+        """Returns the innermost operation currently tagged in this thread."""
+        operations = self.operations
+        return operations[-1] if operations else None
+
+    @property
+    def operations(self) -> tuple[str, ...]:
+        """Returns the operations currently tagged in this thread, from the
+        outermost to the innermost one."""
+        return getattr(self.__local, "operations", ())
+
+    def begin_operation(self, name: str) -> tuple[str, ...]:
+        """Tags the following transactions of this thread with an operation,
+        in addition to the ones already active.
+
+        An operation already active in this thread, i.e. a re-entrant call,
+        does not count as a new call.
+
+        Args:
+            name: The name of the operation
+
+        Returns:
+            The previous operations, to give back to `end_operation`
+        """
+        previous = self.operations
+        if name not in previous:
+            self.__local.operations = previous + (name,)
+            with self.__lock:
+                self.__operation_calls[name] = self.__operation_calls.get(
+                    name, 0) + 1
+        return previous
+
+    def end_operation(self, previous: tuple[str, ...]):
+        """Restores the operation tags that were active before
+        `begin_operation`.
+
+        Args:
+            previous: The value returned by `begin_operation`
+        """
+        self.__local.operations = previous
+
+    def record(self,
+               key: Hashable,
+               latency: float,
+               bytes_sent: int = 0,
+               bytes_received: int = 0,
+               error: bool = False,
+               timeout: bool = False,
+               operations: tuple[str, ...] | None = None):
+        """Records one transaction.
+
+        Args:
+            key: The kind of transaction
+            latency: The duration of the transaction [s]
+            bytes_sent: The number of bytes sent
+            bytes_received: The number of bytes received
+            error: A flag indicating if the transaction failed
+            timeout: A flag indicating if the transaction timed out
+            operations: The operations that caused the transaction, by
+            default the ones tagged in this thread. They are given when the
+            transaction completes in another thread.
+        """
+        if operations is None:
+            operations = self.operations
+        with self.__lock:
+            counter = self.__counters.get(key)
+            if counter is None:
+                counter = self.__counters[key] = TransactionCounter()
+            counter.record(latency, bytes_sent, bytes_received, error, timeout)
+
+            for operation in operations:
+                counter = self.__operations.get(operation)
+                if counter is None:
+                    counter = self.__operations[operation] = (
+                        TransactionCounter())
+                counter.record(latency, bytes_sent, bytes_received, error,
+                               timeout)
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the recorded statistics.
+
+        Returns:
+            A JSON object with the total counters, the counters of each
+            transaction key and the counters of each operation
+        """
+        with self.__lock:
+            total = TransactionCounter()
+            for counter in self.__counters.values():
+                total.count += counter.count
+                total.errors += counter.errors
+                total.timeouts += counter.timeouts
+                total.bytes_sent += counter.bytes_sent
+                total.bytes_received += counter.bytes_received
+                total.total_latency += counter.total_latency
+                total.max_latency = max(total.max_latency,
+                                        counter.max_latency)
+                total.histogram = [
+                    a + b for a, b in zip(total.histogram, counter.histogram)
+                ]
+
+            operations = {}
+            for name, calls in self.__operation_calls.items():
+                counter = self.__operations.get(name, TransactionCounter())
+                operations[name] = counter.to_json()
+                operations[name]["calls"] = calls
+                operations[name]["transactions_per_call"] = (counter.count /
+                                                             calls)
+
+            return {
+                "total": total.to_json(),
+                "by_key": {
+                    str(key): counter.to_json()
+                    for key, counter in self.__counters.items()
+                },
+                "by_operation": operations,
+            }
+
+    def reset_stats(self):
+        """Resets every counter."""
+        with self.__lock:
+            self.__counters.clear()
+            self.__operations.clear()
+            self.__operation_calls.clear()
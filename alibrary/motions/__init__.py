@@ -2,10 +2,14 @@
 machine.
 """
 from alibrary.motions.abstract.command import MotionCommand, MotionType
-from alibrary.motions.abstract.motor import Motor
+from alibrary.motions.abstract.completion import MotionHandle, MotionWatcher
+from alibrary.motions.abstract.motor import Motor, MotorSnapshot
 
 __all__ = [
     "MotionCommand",
+    "MotionHandle",
     "MotionType",
+    "MotionWatcher",
     "Motor",
+    "MotorSnapshot",
 ]
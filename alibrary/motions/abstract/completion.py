@@ -0,0 +1,168 @@
+"""Module defining the completion handles of the motions and the watcher
+resolving them.
+
+A motor started with `track=True` returns a MotionHandle, a Future resolved
+once the motion is over. Every pending handle is checked by a single
+background MotionWatcher, with a polling interval growing geometrically from
+the start of each motion, so the sequencing code can wait on the handles
+instead of polling the motors itself.
+
+Typical usage example:
+
+handle = motor.start(command, track=True)
+duration = handle.result(timeout=30)
+"""
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+from alibrary.logger import logger
+
+
+class MotionHandle(Future):
+    """A Future resolved with the duration of a motion [s] once it is over.
+
+    It fails with the error raised while checking the motor, e.g. when the
+    driver reports a fault. Cancelling the handle only stops its watching,
+    not the motion.
+
+    Attributes:
+        motor: The Motor running the motion
+        command: The MotionCommand of the motion
+        started_at: The monotonic time at which the motion was started
+    """
+
+    def __init__(self, motor, command) -> None:
+        super().__init__()
+        self.motor = motor
+        self.command = command
+        self.started_at = time.monotonic()
+
+    def complete(self):
+        """Resolves this handle with the time elapsed since its start."""
+        try:
+            self.set_result(time.monotonic() - self.started_at)
+        except InvalidStateError:
+            # Already cancelled or resolved
+            pass
+
+    def fail(self, error: Exception):
+        """Fails this handle with the given error."""
+        try:
+            self.set_exception(error)
+        except InvalidStateError:
+            # Already cancelled or resolved
+            pass
+
+
+class MotionWatcher:
+    """Checks the pending motion handles in a background thread.
+
+    Each handle is checked with its motor `is_motion_done` method, first
+    after `initial_interval`, then after intervals multiplied by `backoff` up
+    to `max_interval`. The thread stops when no handle is pending and is
+    started again by the next one.
+
+    Attributes:
+        initial_interval: The first checking interval of a motion [s]
+        max_interval: The maximum checking interval of a motion [s]
+        backoff: The growth factor of the checking interval
+        checks: The number of completion checks
+        errors: The number of motions failed by an error
+    """
+
+    def __init__(self,
+                 initial_interval: float = 0.005,
+                 max_interval: float = 0.05,
+                 backoff: float = 2.0) -> None:
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.checks = 0
+        self.errors = 0
+
+        self.__condition = threading.Condition()
+        # Pending handles with their next check time and interval
+        self.__pending: list[list] = []
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of motions being watched."""
+        return len(self.__pending)
+
+    def watch(self, handle: MotionHandle):
+        """Starts watching the given handle.
+
+        Args:
+            handle: The MotionHandle to resolve
+        """
+        with self.__condition:
+            self.__pending.append([
+                handle,
+                time.monotonic() + self.initial_interval,
+                self.initial_interval,
+            ])
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 name="motion watcher",
+                                                 daemon=True)
+                self.__thread.start()
+            self.__condition.notify()
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the watcher counters.
+
+        Returns:
+            A JSON object with the checking counters
+        """
+        return {
+            "pending": self.pending,
+            "checks": self.checks,
+            "errors": self.errors,
+        }
+
+    def __run(self):
+        """Checks the due handles until none is pending."""
+        while True:
+            with self.__condition:
+                self.__pending = [
+                    entry for entry in self.__pending if not entry[0].done()
+                ]
+                if not self.__pending:
+                    self.__thread = None
+                    return
+
+                now = time.monotonic()
+                next_check = min(entry[1] for entry in self.__pending)
+                if next_check > now:
+                    self.__condition.wait(next_check - now)
+                    continue
+                due = [entry for entry in self.__pending if entry[1] <= now]
+
+            for entry in due:
+                self.__check(entry)
+
+    def __check(self, entry: list):
+        """Checks the motion of a handle and schedules its next check."""
+        handle, _, interval = entry
+        self.checks += 1
+        try:
+            done = handle.motor.is_motion_done()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self.errors += 1
+            logger.warning("Motion %s failed: %s", handle.command, error)
+            handle.fail(error)
+            return
+
+        if done:
+            handle.complete()
+            return
+
+        interval = min(interval * self.backoff, self.max_interval)
+        entry[1] = time.monotonic() + interval
+        entry[2] = interval
+
+
+# Watcher shared by every motor
+motion_watcher = MotionWatcher()
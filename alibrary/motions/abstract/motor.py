@@ -8,11 +8,25 @@ advantages for the motors and motions.
 """
 import math
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
 from alibrary.motions.abstract.command import MotionCommand, MotionType
+from alibrary.motions.abstract.completion import MotionHandle, motion_watcher
 from alibrary.server import BadRequestError, ConflictError
 
 
+@dataclass(frozen=True, slots=True)
+class MotorSnapshot:
+    """The running status and the position of a motor, read together.
+
+    Attributes:
+        running: True if a motion was running
+        position: The current position
+    """
+    running: bool
+    position: float
+
+
 class Motor(ABC):
     """Abstract class representing an motor.
 
@@ -41,18 +55,47 @@ class Motor(ABC):
             InternalServerError: An error occurs in the process
         """
 
-    def validate_command(self, command: MotionCommand, min_abs_distance: float,
-                         max_abs_distance: float):
+    def get_snapshot(self, max_age: float | None = None) -> MotorSnapshot:
+        """Returns the running status and the position of this motor.
+
+        The motion admission checks run against this snapshot instead of
+        reading the motor for each check. By default, it is built from
+        `is_busy` and `get_position`, and the max age is ignored.
+
+        Args:
+            max_age: The maximum age of a cached snapshot to return [s], None
+            to read the motor
+
+        Returns:
+            An object with at least the running and position attributes
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return MotorSnapshot(self.is_busy(), self.get_position())
+
+    def validate_command(self,
+                         command: MotionCommand,
+                         min_abs_distance: float,
+                         max_abs_distance: float,
+                         position: float | None = None):
         """Checks if the command is valid regarding to the motor current state
         and parameters.
 
+        Args:
+            command: The MotionCommand to check
+            min_abs_distance: The minimum absolute distance of the motor
+            max_abs_distance: The maximum absolute distance of the motor
+            position: The current position, read from the motor if None
+
         Raises:
             BadRequestError: The given command is not valid
             InternalServerError: An error occurs in the process
         """
         # Distance must be in the good range
         if command.motion_type == MotionType.RELATIVE:
-            crt_position = self.get_position()
+            crt_position = (self.get_position()
+                            if position is None else position)
             min_distance = min_abs_distance - crt_position
             max_distance = max_abs_distance - crt_position
         elif command.motion_type == MotionType.ABSOLUTE:
@@ -66,17 +109,60 @@ class Motor(ABC):
             raise BadRequestError("Wrong distance value, must be between "
                                   f"{min_distance} and {max_distance} mm")
 
+    def is_motion_done(self) -> bool:
+        """Checks if the last started motion is over.
+
+        It is called by the motion watcher to resolve the motion handles. By
+        default, the motion is over when the motor is not busy anymore.
+
+        Returns:
+            True if the motion is over, False otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process or the motion
+            failed
+        """
+        return not self.is_busy()
+
+    def _track(self, command: MotionCommand) -> MotionHandle:
+        """Returns a handle of the started motion, resolved by the shared
+        motion watcher.
+
+        Args:
+            command: The MotionCommand of the started motion
+
+        Returns:
+            A pending MotionHandle
+        """
+        handle = MotionHandle(self, command)
+        motion_watcher.watch(handle)
+        return handle
+
     @abstractmethod
-    def start(self, command: MotionCommand):
+    def start(self,
+              command: MotionCommand,
+              track: bool = False,
+              snapshot: MotorSnapshot | None = None) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+            snapshot: A snapshot from `get_snapshot` to run the admission
+            checks against, the motor is read if None
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
         # If there is already a motion running
-        if self.is_busy():
+        running = self.is_busy() if snapshot is None else snapshot.running
+        if running:
             raise ConflictError("There is already a motion running. Stop it "
                                 "before starting a new one.")
 
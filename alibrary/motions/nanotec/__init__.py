@@ -5,25 +5,62 @@ generic NanotecDriver class and motor specific objects.
 
 List of motor types currently available:
     - BLDC (Brushless DC motor)
+    - Stepper motor
+    - Any motor driven through the Process Data Interface (PDI)
 """
 
+from alibrary.motions.nanotec.async_driver import (
+    AsyncNanotecDriver,
+    gather_info,
+    gather_telemetry,
+)
+from alibrary.motions.nanotec.bldc.async_motor import AsyncNanotecBldc
 from alibrary.motions.nanotec.bldc.command import NanotecBldcMotionCommand
 from alibrary.motions.nanotec.bldc.motor import NanotecBldc, NanotecBldcConfig
 from alibrary.motions.nanotec.driver import NanotecDriver
+from alibrary.motions.nanotec.pdi.command import NanotecPdiMotionCommand
+from alibrary.motions.nanotec.pdi.motor import (
+    NanotecPdiCommand,
+    NanotecPdiConfig,
+    NanotecPdiFeedback,
+    NanotecPdiMotor,
+    NanotecPdiStatus,
+)
+from alibrary.motions.nanotec.recorder import NanotecCapture, NanotecRecorder
 from alibrary.motions.nanotec.state import NanotecDriverState
+from alibrary.motions.nanotec.stepper.async_motor import AsyncNanotecStepper
 from alibrary.motions.nanotec.stepper.command import NanotecStepperMotionCommand
 from alibrary.motions.nanotec.stepper.motor import (
     NanotecStepper,
     NanotecStepperConfig,
 )
+from alibrary.motions.nanotec.sync import NanotecSyncReport, start_synchronized
+from alibrary.motions.nanotec.telemetry import NanotecMonitor, NanotecTelemetry
 
 __all__ = [
+    "AsyncNanotecBldc",
+    "AsyncNanotecDriver",
+    "AsyncNanotecStepper",
     "NanotecBldcMotionCommand",
+    "NanotecCapture",
     "NanotecBldc",
     "NanotecBldcConfig",
     "NanotecDriver",
     "NanotecDriverState",
+    "NanotecMonitor",
+    "NanotecPdiCommand",
+    "NanotecPdiConfig",
+    "NanotecPdiFeedback",
+    "NanotecPdiMotionCommand",
+    "NanotecPdiMotor",
+    "NanotecPdiStatus",
+    "NanotecRecorder",
     "NanotecStepperMotionCommand",
     "NanotecStepper",
     "NanotecStepperConfig",
+    "NanotecSyncReport",
+    "NanotecTelemetry",
+    "gather_info",
+    "gather_telemetry",
+    "start_synchronized",
 ]
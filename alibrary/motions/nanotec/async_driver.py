@@ -0,0 +1,170 @@
+"""Module describing a generic asynchronous Nanotec motor driver.
+
+It is the asyncio counterpart of NanotecDriver, used to poll the status of
+several drivers concurrently. Motions are still started through the blocking
+NanotecDriver subclasses.
+
+Typical usage example:
+
+drivers = [AsyncNanotecBldc(ip) for ip in drum_ips]
+for driver in drivers:
+    await driver.connect()
+infos = await gather_info(drivers)
+"""
+import asyncio
+
+from alibrary.electronics.async_modbus import AsyncModbusComponent
+from alibrary.electronics.modbus import ModbusError
+from alibrary.electronics.register_map import ModbusRegisterMap
+from alibrary.logger import logger
+from alibrary.motions.nanotec.driver import NanotecDriver
+from alibrary.motions.nanotec.state import NanotecDriverState
+from alibrary.server import InternalServerError
+
+
+class AsyncNanotecDriver(AsyncModbusComponent):
+    """Generic asynchronous Nanotec driver
+
+    It exposes awaitable versions of the NanotecDriver status readings.
+    """
+    # Statusword of the Nanotec driver (6041)
+    STATUS_WORD_ADDRESS = NanotecDriver.STATUS_WORD_ADDRESS
+
+    # Position, speed, sensor and information registers, read in one request.
+    # It is defined by the subclasses.
+    MOTION_MAP: ModbusRegisterMap | None = None
+
+    # Motion registers and status word, read as a single telemetry frame.
+    # It is defined by the subclasses.
+    TELEMETRY_MAP: ModbusRegisterMap | None = None
+
+    async def _read_map(self, register_map: ModbusRegisterMap) -> dict[str, int]:
+        """Reads the given register map and converts Modbus errors.
+
+        Args:
+            register_map: The ModbusRegisterMap describing the fields to read
+
+        Returns:
+            A dictionary with the value of each field of the map
+
+        Raises:
+            InternalServerError: An error occurs in the Modbus communication
+        """
+        try:
+            return await self.read_map(register_map)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+    async def _get_state(self) -> NanotecDriverState:
+        """Retrieves the current state of the Nanotec driver.
+
+        Returns:
+            A NanotecDriverState object
+
+        Raises:
+            InternalServerError: An error occurs during the reading of the
+            status word.
+        """
+        if self.offline:
+            return NanotecDriverState.SWITCHED_ON
+        try:
+            status_word = await self.read_registers(self.STATUS_WORD_ADDRESS)
+            return NanotecDriverState.from_status_word(status_word=status_word)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+    async def get_telemetry(self) -> dict[str, int]:
+        """Reads the whole telemetry frame of the driver.
+
+        Returns:
+            A dictionary with the raw value of each telemetry field
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry.
+        """
+        return await self._read_map(self.TELEMETRY_MAP)
+
+    async def get_info(self) -> dict[str,]:
+        """Returns information about this motor and its current motion.
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        motion = await self._read_map(self.MOTION_MAP)
+
+        return {
+            "running": motion["info_word"] % 2 == 1,
+            "position": motion["position"] / 1000,
+        }
+
+    async def is_busy(self) -> bool:
+        """Returns the running status of the motor.
+
+        Returns:
+            True if a motion is running on the motor, false otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return (await self.get_info())["running"]
+
+    async def get_position(self) -> float:
+        """Gets the current position of the Nanotec driver.
+
+        Returns:
+            A float representing the position in mm
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return (await self.get_info())["position"]
+
+    async def get_speed(self) -> float:
+        """Gets the current speed of the Nanotec driver.
+
+        Returns:
+            A float representing the speed in mm/s
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        motion = await self._read_map(self.MOTION_MAP)
+        return motion["speed"] / 1000
+
+
+async def gather_info(drivers: list[AsyncNanotecDriver]) -> list[dict[str,]]:
+    """Returns the information of every given driver.
+
+    The requests are awaited concurrently, the sweep therefore costs about the
+    round trip time of the slowest driver.
+
+    Args:
+        drivers: The list of connected AsyncNanotecDriver to poll
+
+    Returns:
+        The list of the drivers info, in the same order
+
+    Raises:
+        InternalServerError: An error occurs in the process
+    """
+    return list(await asyncio.gather(*(driver.get_info()
+                                       for driver in drivers)))
+
+
+async def gather_telemetry(
+        drivers: list[AsyncNanotecDriver]) -> list[dict[str, int]]:
+    """Returns the telemetry frame of every given driver.
+
+    Args:
+        drivers: The list of connected AsyncNanotecDriver to poll
+
+    Returns:
+        The list of the drivers telemetry, in the same order
+
+    Raises:
+        InternalServerError: An error occurs in the process
+    """
+    return list(await asyncio.gather(*(driver.get_telemetry()
+                                       for driver in drivers)))
@@ -0,0 +1,39 @@
+"""Defines an asynchronous reader of a BLDC motor connected to a Nanotec
+driver.
+
+This class implements the AsyncNanotecDriver class with the registers of the
+NanotecBldc. It allows to poll the motor concurrently with other drivers.
+"""
+from alibrary.motions.nanotec.async_driver import AsyncNanotecDriver
+from alibrary.motions.nanotec.bldc.motor import NanotecBldc, NanotecBldcConfig
+
+
+class AsyncNanotecBldc(AsyncNanotecDriver):
+    """Asynchronous variant of the NanotecBldc class."""
+
+    MOTION_MAP = NanotecBldc.MOTION_MAP
+    TELEMETRY_MAP = NanotecBldc.TELEMETRY_MAP
+
+    def __init__(
+        self,
+        config: NanotecBldcConfig,
+        ip: str,
+        port: int = 502,
+        timeout: int = 2,
+        offline: bool = False,
+    ) -> None:
+        super().__init__(ip, port, timeout, offline)
+
+        self.config = config
+
+    async def is_sensor_triggered(self) -> bool:
+        """Checks if the homing sensor is triggered.
+
+        Returns:
+            A boolean flag with the status of the sensor.
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        motion = await self._read_map(self.MOTION_MAP)
+        return motion["sensor"] == 1
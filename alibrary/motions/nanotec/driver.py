@@ -3,14 +3,22 @@
 This will be specialized to adjust to every kind of motor we use with a Nanotec
 driver.
 """
-# import struct
+import struct
+import threading
 import time
+from collections.abc import Callable
 
-from alibrary.electronics.modbus import ModbusComponent, ModbusError
+from alibrary.electronics.modbus import (ModbusComponent, ModbusError,
+                                         modbus_operation)
+from alibrary.electronics.register_map import ModbusRegisterMap
 from alibrary.logger import logger
+from alibrary.motions.abstract.command import MotionCommand, MotionType
+from alibrary.motions.abstract.completion import MotionHandle, motion_watcher
 from alibrary.motions.abstract.motor import Motor
 from alibrary.motions.nanotec.state import NanotecDriverState
-from alibrary.server import InternalServerError
+from alibrary.motions.nanotec.telemetry import NanotecMonitor, NanotecTelemetry
+from alibrary.server import BadRequestError, ConflictError, InternalServerError
+from alibrary.wait import WaitCancelledError, WaitTimeoutError, wait_until
 
 
 class NanotecDriver(ModbusComponent, Motor):
@@ -18,6 +26,17 @@ class NanotecDriver(ModbusComponent, Motor):
 
     Interface for any Nanotec driver used by Aerosint. It implements both
     ModbusComponent and Motor classes.
+
+    The last telemetry frame read is kept as an immutable snapshot. The read
+    APIs accept a `max_age` to answer from it instead of reading the driver.
+    While a NanotecMonitor refreshes it, `get_info` is served from it by
+    default.
+
+    Attributes:
+        telemetry: The last NanotecTelemetry snapshot, None before any read
+        info_max_age: The maximum age of the snapshot served by `get_info`
+        without an explicit max age, None to always read the driver
+        monitor: The NanotecMonitor dedicated to this driver, if started
     """
     # Statusword of the Nanotec driver (6041)
     STATUS_WORD_ADDRESS = 5000
@@ -31,12 +50,63 @@ class NanotecDriver(ModbusComponent, Motor):
     # Modes of Operation Display of the Nanotec driver (6061)
     OPERATION_MODE_WRITE_ADDRESS = 6001
 
+    # Maximum time to reach a requested state [s]
+    STATE_TIMEOUT = 2.0
+    # Maximum time to apply a new operation mode [s]
+    OPERATION_MODE_TIMEOUT = 2.0
+    # Maximum time to leave the FAULT state after a fault reset [s]
+    FAULT_RESET_TIMEOUT = 5.0
+    # Maximum time for the driver to acknowledge a new set-point [s]
+    SETPOINT_TIMEOUT = 1.0
+    # Maximum time for the motor to come to rest when stopping [s]
+    STOP_TIMEOUT = 5.0
+    # Time added to the travel time of a queued motion before its buffered
+    # set-point is considered lost [s]
+    QUEUE_MARGIN = 2.0
+
+    # Control word enabling the operation with the halt bit (8) set
+    HALT_CONTROL_WORD = 0x10F
+    # Control word disabling the operation, the motor stays switched on
+    DISABLE_OPERATION_CONTROL_WORD = 0x07
+
+    # Control word bits of the profile position mode
+    NEW_SETPOINT_BIT = 0x10
+    CHANGE_SET_IMMEDIATELY_BIT = 0x20
+    CHANGE_ON_SETPOINT_BIT = 0x200
+
+    # Position, speed, sensor and information registers, read in one request.
+    # It is defined by the subclasses.
+    MOTION_MAP: ModbusRegisterMap | None = None
+
+    # Motion registers and status word, read as a single telemetry frame.
+    # It is defined by the subclasses.
+    TELEMETRY_MAP: ModbusRegisterMap | None = None
+
+    # Position, speed, acceleration and deceleration set-points of the
+    # profile position mode. It is defined by the subclasses, as well as the
+    # SPEED_SETPOINT_MAP of the velocity mode, the config with the motion
+    # range, the TARGET_DECELERATION_ADDRESS and the DEFAULT_ACCELERATION,
+    # DEFAULT_DECELERATION and DEFAULT_STOP_DECELERATION [µm/s²].
+    SETPOINT_MAP: ModbusRegisterMap | None = None
+
     def __init__(self,
                  ip: str,
                  port: int = 502,
                  timeout: int = 2,
-                 offline: bool = False) -> None:
-        super().__init__(ip, port, timeout, offline)
+                 offline: bool = False,
+                 cache_ttl: float = 0.0,
+                 pipeline_window: int = 0) -> None:
+        super().__init__(ip, port, timeout, offline, pipeline_window)
+
+        self.telemetry: NanotecTelemetry | None = None
+        self.info_max_age: float | None = None
+        self.monitor: NanotecMonitor | None = None
+
+        self.__queue_thread: threading.Thread | None = None
+        self.__queue_cancel = threading.Event()
+
+        if cache_ttl > 0:
+            self.__configure_cache(cache_ttl)
 
         try:
             # Initialization sequence of the driver
@@ -53,6 +123,27 @@ class NanotecDriver(ModbusComponent, Motor):
         except InternalServerError as error:
             logger.error("Could not initialize Nanotec driver: %s", error)
 
+    def __configure_cache(self, ttl: float):
+        """Caches the status word and the motion registers of the driver.
+
+        The status word is invalidated by writes to the control word and to
+        the operation mode. The motion registers are invalidated by any write
+        to the driver.
+
+        Args:
+            ttl: The time to live of the cached values [s]
+        """
+        self.configure_cache(self.STATUS_WORD_ADDRESS,
+                             2,
+                             ttl,
+                             invalidated_by=[
+                                 (self.CONTROL_WORD_ADDRESS, 2),
+                                 (self.OPERATION_MODE_WRITE_ADDRESS, 2),
+                             ])
+
+        for block in self.MOTION_MAP.blocks:
+            self.configure_cache(block.address, block.count, ttl)
+
     def _get_state(self) -> NanotecDriverState:
         """Retrieves the current state of the Nanotec driver.
 
@@ -102,6 +193,38 @@ class NanotecDriver(ModbusComponent, Motor):
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
+    def _set_control_word_and_check_bit(self, value: int,
+                                        bit_index: int) -> bool:
+        """Sets the control word and checks one bit of the resulting status
+        word in a single Modbus request.
+
+        Args:
+            value: The value to set as the control word
+            bit_index: The index of the status word bit to check, starting at
+            zero
+
+        Returns:
+            The value of the bit in the status word read after the write
+
+        Raises:
+            InternalServerError: An error occurs during the writing of the
+            control word or the reading of the status word.
+        """
+        if self.offline:
+            return True
+
+        try:
+            words = struct.unpack(">HH", struct.pack(">i", value))
+            status_words = self.write_read_block(self.CONTROL_WORD_ADDRESS,
+                                                 words,
+                                                 self.STATUS_WORD_ADDRESS, 2)
+            status_word = struct.unpack(">i",
+                                        struct.pack(">HH", *status_words))[0]
+            return int(status_word / 2**bit_index) % 2 == 1
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
     def __reset_fault(self):
         """Resets the FAULT state of the driver
 
@@ -110,11 +233,36 @@ class NanotecDriver(ModbusComponent, Motor):
         """
         self._set_control_word(0x80)
 
-        while self._get_state() != NanotecDriverState.SWITCH_ON_DISABLED:
-            time.sleep(0.1)
+        self._wait(
+            lambda: self._get_state() == NanotecDriverState.SWITCH_ON_DISABLED,
+            self.FAULT_RESET_TIMEOUT, "fault reset")
 
         self._set_control_word(0x0)
 
+    def _wait(self, predicate: Callable[[], bool], timeout: float,
+              description: str, **kwargs) -> float:
+        """Waits until a condition of the driver is met.
+
+        Args:
+            predicate: The condition to wait for
+            timeout: The maximum time to wait [s]
+            description: A description of the condition
+            kwargs: The polling parameters given to wait_until
+
+        Returns:
+            The time waited [s]
+
+        Raises:
+            InternalServerError: The condition is not met before the timeout
+            or an error occurs while checking it.
+        """
+        try:
+            return wait_until(predicate, timeout, f"Nanotec {description}",
+                              **kwargs)
+        except (WaitTimeoutError, WaitCancelledError) as error:
+            logger.error("(%s:%d) %s", self.ip, self.port, error)
+            raise InternalServerError(str(error)) from error
+
     def __wait_for_state(self, state: NanotecDriverState):
         """Waits until the given state is the current state of the driver.
 
@@ -124,14 +272,8 @@ class NanotecDriver(ModbusComponent, Motor):
         Raises:
             InternalServerError: An error occurs while waiting the state.
         """
-        cnt = 0
-        while self._get_state() != state:
-            cnt += 1
-
-            if cnt > 100:
-                logger.error("Timeout waiting state %s", state)
-                raise InternalServerError(f"Timeout waiting state {state}")
-            time.sleep(0.01)
+        self._wait(lambda: self._get_state() == state, self.STATE_TIMEOUT,
+                   f"state {state.name}")
 
     def __set_state_switch_on_disabled(self) -> bool:
         """Sets the driver's state to SWITCH ON DISABLED.
@@ -197,15 +339,9 @@ class NanotecDriver(ModbusComponent, Motor):
 
     def __wait_for_operation_mode(self, mode: int):
         """Waits for the operation mode to change to the specified value."""
-        cnt = 0
-        while self.read_registers(self.OPERATION_MODE_READ_ADDRESS) != mode:
-            cnt += 1
-
-            if cnt > 100:
-                logger.error("Timeout waiting operation mode %d", mode)
-                raise InternalServerError(
-                    f"Timeout waiting operation mode {mode}")
-            time.sleep(0.01)
+        self._wait(
+            lambda: self.read_registers(self.OPERATION_MODE_READ_ADDRESS) ==
+            mode, self.OPERATION_MODE_TIMEOUT, f"operation mode {mode}")
 
     def _set_operation_mode(self, mode: int):
         """Sets the operation mode of the driver.
@@ -225,6 +361,43 @@ class NanotecDriver(ModbusComponent, Motor):
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
+    def _write_setpoints(self, register_map: ModbusRegisterMap,
+                         values: dict[str, int], mode: int):
+        """Writes the set-points of a motion and sets the operation mode.
+
+        The blocks of set-points and the operation mode are independent. With
+        a pipeline, they are all in flight together, so the upload costs about
+        one round trip before waiting for the operation mode.
+
+        Args:
+            register_map: The ModbusRegisterMap of the set-points
+            values: A dictionary with the value of each set-point
+            mode: An integer representing the mode of operation
+
+        Raises:
+            InternalServerError: An error occurs while writing the set-points
+            or setting the operation mode.
+        """
+        try:
+            futures = [
+                self.submit_write_block(block.address, block.encode(values))
+                for block in register_map.blocks
+            ]
+            if not self.offline:
+                futures.append(
+                    self.submit_write_block(
+                        self.OPERATION_MODE_WRITE_ADDRESS,
+                        struct.unpack(">HH", struct.pack(">i", mode))))
+
+            for future in futures:
+                future.result()
+
+            if not self.offline:
+                self.__wait_for_operation_mode(mode)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
     def _check_bit_of_status_word(self, bit_index: int) -> bool:
         """Checks one bit of the Nanotec driver status word.
 
@@ -244,3 +417,490 @@ class NanotecDriver(ModbusComponent, Motor):
         except ModbusError as error:
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
+
+    @modbus_operation("get_telemetry")
+    def get_telemetry(self) -> dict[str, int]:
+        """Reads the whole telemetry frame of the driver.
+
+        Each contiguous block of the TELEMETRY_MAP is fetched in one Modbus
+        request.
+
+        Returns:
+            A dictionary with the raw value of each telemetry field
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry.
+        """
+        try:
+            return self.read_map(self.TELEMETRY_MAP)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+    def refresh_telemetry(self) -> NanotecTelemetry:
+        """Reads the telemetry frame and publishes it as the last snapshot.
+
+        Returns:
+            The new NanotecTelemetry snapshot
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry.
+        """
+        timestamp = time.monotonic()
+        snapshot = NanotecTelemetry.from_registers(self.get_telemetry(),
+                                                   timestamp)
+
+        previous = self.telemetry
+        if previous is None or previous.timestamp <= timestamp:
+            self.telemetry = snapshot
+        return snapshot
+
+    def get_snapshot(self, max_age: float | None = None) -> NanotecTelemetry:
+        """Returns the last telemetry snapshot if it is fresh enough.
+
+        Otherwise a new telemetry frame is read.
+
+        Args:
+            max_age: The maximum age of the returned snapshot [s], None to
+            always read the driver
+
+        Returns:
+            A NanotecTelemetry snapshot
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry.
+        """
+        snapshot = self.telemetry
+        if max_age is None or snapshot is None or snapshot.age > max_age:
+            snapshot = self.refresh_telemetry()
+        return snapshot
+
+    def is_motion_done(self) -> bool:
+        """Checks if the last started motion is over.
+
+        The motion is over once the driver is not running anymore and reports
+        the target reached. A new telemetry frame is read on each check and
+        published as the last snapshot.
+
+        Returns:
+            True if the motion is over, False otherwise
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry
+            or the driver is in FAULT state
+        """
+        if self.offline:
+            return True
+
+        snapshot = self.refresh_telemetry()
+        if snapshot.state == NanotecDriverState.FAULT:
+            message = (f"Nanotec driver ({self.ip}:{self.port}) in FAULT "
+                       "state during the motion")
+            logger.error(message)
+            raise InternalServerError(message)
+
+        return not snapshot.running and snapshot.target_reached
+
+    def queue_motions(self,
+                      commands: list[MotionCommand],
+                      blend: bool = True) -> MotionHandle:
+        """Runs a sequence of absolute position motions back to back.
+
+        The set-points are fed to the set-point buffer of the driver by a
+        background thread. Each target is written while the previous
+        set-point is still buffered and triggered without the change set
+        immediately bit, so the next motion starts as soon as the running one
+        reaches its target. With `blend`, the change on set-point bit is set
+        and the motor keeps its speed through the intermediate targets
+        instead of stopping on each of them.
+
+        Args:
+            commands: The absolute MotionCommand of each motion, in order
+            blend: If True, the motor does not stop between the motions
+
+        Returns:
+            A MotionHandle resolved at the end of the last motion, failed if
+            a set-point cannot be fed and cancelled by `stop`
+
+        Raises:
+            InternalServerError: An error occurs in the process
+            BadRequestError: A command is not a valid absolute motion
+            ConflictError: The motor is busy with another motion
+        """
+        if not commands:
+            raise BadRequestError("The motion queue is empty")
+        for command in commands:
+            if command.motion_type != MotionType.ABSOLUTE:
+                raise BadRequestError("Only absolute motions can be queued")
+            self.validate_command(command, self.config.min_abs_distance,
+                                  self.config.max_abs_distance)
+
+        if self.__queue_thread is not None and self.__queue_thread.is_alive():
+            raise ConflictError("A motion queue is already running")
+        self._admit(commands[0])
+
+        handle = MotionHandle(self, commands[-1])
+        self.current_command = commands[0]
+        self._write_setpoints(self.SETPOINT_MAP,
+                              self.__get_queued_setpoints(commands[0]), 1)
+        self._set_control_word(0xF)
+
+        self.__queue_cancel.clear()
+        self.__queue_thread = threading.Thread(
+            target=self.__feed_setpoints,
+            args=(commands, blend, handle),
+            name=f"nanotec queue {self.ip}",
+            daemon=True)
+        self.__queue_thread.start()
+        return handle
+
+    @modbus_operation("prepare_motion")
+    def _prepare_motion(self, command: MotionCommand) -> int:
+        """Checks a command and uploads its set-points without starting the
+        motion.
+
+        The operation is enabled with the halt bit set, so that the velocity
+        mode does not start on its set-points before the trigger.
+
+        Args:
+            command: A position or speed MotionCommand
+
+        Returns:
+            The control word starting the motion
+
+        Raises:
+            InternalServerError: An error occurs in the process
+            BadRequestError: The given command is not valid or is a homing
+            ConflictError: The motor is busy with another motion
+        """
+        if command.motion_type == MotionType.HOMING:
+            raise BadRequestError("A homing cannot be started by a trigger")
+        self._admit(command)
+
+        self._set_control_word(self.HALT_CONTROL_WORD)
+        if command.motion_type == MotionType.SPEED:
+            self._write_setpoints(self.SPEED_SETPOINT_MAP, {
+                "speed": int(command.speed * 1000),
+                "acceleration": self.DEFAULT_ACCELERATION,
+            }, 3)
+            return 0xF
+
+        self._write_setpoints(self.SETPOINT_MAP,
+                              self.__get_queued_setpoints(command), 1)
+        is_relative = command.motion_type == MotionType.RELATIVE
+        control_word = 0xF | self.NEW_SETPOINT_BIT
+        control_word |= self.CHANGE_SET_IMMEDIATELY_BIT
+        if is_relative:
+            control_word |= 0x40
+        return control_word
+
+    def _trigger_motion(self, control_word: int) -> bool:
+        """Starts a prepared motion with a single Modbus request.
+
+        Args:
+            control_word: The control word returned by `_prepare_motion`
+
+        Returns:
+            The set-point acknowledge bit read after the write
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return self._set_control_word_and_check_bit(control_word, 12)
+
+    @modbus_operation("finish_motion")
+    def _finish_motion_start(self, command: MotionCommand, control_word: int,
+                             acknowledged: bool):
+        """Completes the set-point handshake of a triggered motion.
+
+        Args:
+            command: The MotionCommand of the triggered motion
+            control_word: The control word which triggered the motion
+            acknowledged: The acknowledge bit returned by `_trigger_motion`
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        self.current_command = command
+        if not control_word & self.NEW_SETPOINT_BIT:
+            return
+
+        if not acknowledged:
+            self._wait(lambda: self._check_bit_of_status_word(12),
+                       self.SETPOINT_TIMEOUT, "set-point acknowledge")
+        self._set_control_word(control_word & ~self.NEW_SETPOINT_BIT)
+
+    def _admit(self,
+               command: MotionCommand,
+               snapshot: NanotecTelemetry | None = None) -> NanotecTelemetry:
+        """Runs the admission checks of a motion against a single telemetry
+        snapshot.
+
+        The running status, the position used by the validation of relative
+        commands and the state of the driver all come from the snapshot, so
+        the checks cost one telemetry read at most.
+
+        Args:
+            command: The MotionCommand to admit
+            snapshot: A telemetry snapshot to check against, a new one is read
+            if None
+
+        Returns:
+            The NanotecTelemetry snapshot the checks ran against
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry
+            or the driver cannot start a motion from its state
+            BadRequestError: The given command is not valid
+            ConflictError: The motor is busy with another motion
+        """
+        if snapshot is None:
+            snapshot = self.get_snapshot()
+
+        Motor.start(self, command, snapshot=snapshot)
+        self.validate_command(command, self.config.min_abs_distance,
+                              self.config.max_abs_distance, snapshot.position)
+
+        # As in _get_state, an offline driver is switched on
+        state = (NanotecDriverState.SWITCHED_ON
+                 if self.offline else snapshot.state)
+        if state not in (NanotecDriverState.SWITCHED_ON,
+                         NanotecDriverState.OPERATION_ENABLED):
+            logger.error("Impossible to perform Nanotec motion from state %s",
+                         state)
+            raise InternalServerError(
+                f"Impossible to perform Nanotec motion from state {state}")
+        return snapshot
+
+    def _cancel_queue(self):
+        """Stops feeding the set-points of a running motion queue.
+
+        The set-point already buffered in the driver is not removed.
+        """
+        self.__queue_cancel.set()
+        thread = self.__queue_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.__queue_thread = None
+
+    def _fast_stop(self) -> float:
+        """Stops the running motion with a halt and waits for the standstill.
+
+        The stop deceleration is written before the halt bit is set. The
+        standstill is confirmed by the target reached bit of the status word
+        and a zero speed, read together in the telemetry frame, before the
+        operation is disabled. Releasing the halt bit instead would resume the
+        interrupted motion.
+
+        Returns:
+            The duration of the stop [s]
+
+        Raises:
+            InternalServerError: An error occurs in the process or the motor
+            is not at rest before the STOP_TIMEOUT
+        """
+        start = time.monotonic()
+        self._cancel_queue()
+
+        try:
+            self.write_registers(self.TARGET_DECELERATION_ADDRESS,
+                                 self.DEFAULT_STOP_DECELERATION)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+        self._set_control_word(self.HALT_CONTROL_WORD)
+        self._wait(self.__is_standstill,
+                   self.STOP_TIMEOUT,
+                   "standstill",
+                   max_interval=0.01)
+        self._set_control_word(self.DISABLE_OPERATION_CONTROL_WORD)
+        self.current_command = None
+
+        duration = time.monotonic() - start
+        logger.info("Nanotec driver (%s:%d) stopped in %.3fs", self.ip,
+                    self.port, duration)
+        return duration
+
+    def __is_standstill(self) -> bool:
+        """Checks if the halted motor is at rest.
+
+        Raises:
+            InternalServerError: An error occurs while reading the telemetry
+            or the driver is in FAULT state
+        """
+        if self.offline:
+            return True
+
+        snapshot = self.refresh_telemetry()
+        if snapshot.state == NanotecDriverState.FAULT:
+            message = (f"Nanotec driver ({self.ip}:{self.port}) in FAULT "
+                       "state while stopping")
+            logger.error(message)
+            raise InternalServerError(message)
+        return snapshot.target_reached and snapshot.speed == 0
+
+    def __get_queued_setpoints(self, command: MotionCommand) -> dict[str, int]:
+        """Returns the SETPOINT_MAP values of a queued motion."""
+        return {
+            "position": int(command.distance * 1000),
+            "speed": int(command.speed * 1000),
+            "acceleration": self.DEFAULT_ACCELERATION,
+            "deceleration": self.DEFAULT_DECELERATION,
+        }
+
+    def __get_travel_time(self, command: MotionCommand) -> float:
+        """Returns the maximum time to reach the target of an absolute motion
+        from the current position.
+
+        If the motor stops before, e.g. on a halt or a limit, the buffered
+        set-points are never taken and the motion queue fails after this time.
+
+        Args:
+            command: The absolute MotionCommand of the motion
+
+        Returns:
+            The travel time at the command speed plus QUEUE_MARGIN [s]
+
+        Raises:
+            InternalServerError: An error occurs while reading the position
+        """
+        if command.speed <= 0:
+            return self.QUEUE_MARGIN
+        distance = abs(command.distance - self.get_position())
+        return distance / command.speed + self.QUEUE_MARGIN
+
+    def __is_setpoint_buffer_free(self) -> bool:
+        """Checks if the driver can accept a new set-point.
+
+        The set-point acknowledge bit stays set while a set-point is
+        buffered behind the running motion.
+
+        Raises:
+            InternalServerError: An error occurs while reading the status word
+            or the driver is in FAULT state
+        """
+        if self.offline:
+            return True
+
+        try:
+            status_word = self.read_registers(self.STATUS_WORD_ADDRESS)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+        if (NanotecDriverState.from_status_word(status_word) ==
+                NanotecDriverState.FAULT):
+            message = (f"Nanotec driver ({self.ip}:{self.port}) in FAULT "
+                       "state during the motion queue")
+            logger.error(message)
+            raise InternalServerError(message)
+        return (status_word >> 12) % 2 == 0
+
+    @modbus_operation("queue")
+    def __feed_setpoints(self, commands: list[MotionCommand], blend: bool,
+                         handle: MotionHandle):
+        """Feeds the set-points of a motion queue, then hands the completion
+        of the last motion over to the motion watcher.
+
+        It runs in a background thread.
+        """
+        control_word = 0xF
+        if blend:
+            control_word |= self.CHANGE_ON_SETPOINT_BIT
+
+        try:
+            for index, command in enumerate(commands):
+                if index > 0:
+                    # The target is latched by the new set-point bit, so it
+                    # can be written while the buffer is still full
+                    try:
+                        self.write_map(self.SETPOINT_MAP,
+                                       self.__get_queued_setpoints(command))
+                    except ModbusError as error:
+                        logger.error(str(error))
+                        raise InternalServerError(str(error)) from error
+                    # The buffer is freed at the end of the running motion,
+                    # the one before the buffered set-point
+                    running = commands[max(index - 2, 0)]
+                    self._wait(self.__is_setpoint_buffer_free,
+                               self.__get_travel_time(running),
+                               "set-point buffer",
+                               cancel_event=self.__queue_cancel)
+
+                if not self._set_control_word_and_check_bit(
+                        control_word | self.NEW_SETPOINT_BIT, 12):
+                    self._wait(lambda: self._check_bit_of_status_word(12),
+                               self.SETPOINT_TIMEOUT,
+                               "set-point acknowledge",
+                               cancel_event=self.__queue_cancel)
+                self._set_control_word(control_word)
+                self.current_command = command
+        except InternalServerError as error:
+            if self.__queue_cancel.is_set():
+                handle.cancel()
+            else:
+                logger.error("(Nanotec driver) Motion queue failed: %s", error)
+                handle.fail(error)
+            return
+
+        motion_watcher.watch(handle)
+
+    def start_monitor(self,
+                      period: float = 0.05,
+                      max_age: float | None = None) -> NanotecMonitor:
+        """Starts a background monitor dedicated to this driver.
+
+        Several drivers can rather share one NanotecMonitor.
+
+        Args:
+            period: The polling period [s]
+            max_age: The maximum age of the snapshots served by `get_info`,
+            by default three periods [s]
+
+        Returns:
+            The started NanotecMonitor
+        """
+        if self.monitor is None:
+            self.monitor = NanotecMonitor([self], period, max_age)
+        self.monitor.start()
+        return self.monitor
+
+    def stop_monitor(self):
+        """Stops the monitor dedicated to this driver."""
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor.remove(self)
+            self.monitor = None
+
+    @modbus_operation("get_info")
+    def get_info(self, max_age: float | None = None) -> dict[str,]:
+        """Returns information about this motor and its current motion.
+
+        The running status and the position are decoded from a single read of
+        the MOTION_MAP registers, or from the last telemetry snapshot if it is
+        younger than the max age.
+
+        Args:
+            max_age: The maximum age of the snapshot to answer from [s], by
+            default `info_max_age`
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        if max_age is None:
+            max_age = self.info_max_age
+        if max_age is not None:
+            snapshot = self.get_snapshot(max_age)
+            return {"running": snapshot.running, "position": snapshot.position}
+
+        try:
+            motion = self.read_map(self.MOTION_MAP)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+        return {
+            "running": motion["info_word"] % 2 == 1,
+            "position": motion["position"] / 1000,
+        }
@@ -0,0 +1,8 @@
+"""Package defining the motion command and motor specific to a motor driven
+through the Process Data Interface (PDI) of a Nanotec driver.
+
+These are implementation of the abstract motion command and motor. Instead of
+the CiA402 control word and set-point registers, the PDI motor sends its
+set-points and a command code in a single block of registers and reads back
+the status, the error code and the position in another one.
+"""
@@ -0,0 +1,63 @@
+"""Modules defining a Nanotec driver motion command for a motor driven
+through the Process Data Interface (PDI).
+
+This is an implementation of the abstract MotionCommand for a Nanotec driver.
+
+To handle the different kind of motors that we might use in the machines, an
+abstract class is defined. This allows to have a template and to benefit from
+OOP advantages for the motors and motions.
+"""
+from alibrary.motions.abstract.command import MotionCommand, MotionType
+
+
+class NanotecPdiMotionCommand(MotionCommand):
+    """Implementation of the MotionCommand class for a motor driven through
+    the PDI of a Nanotec driver.
+
+    Only the absolute and relative motions are supported by the PDI motor.
+
+
+    Attributes:
+        motion_type: The type of motion
+        speed: A float representing the speed of the motion
+        distance: A float representing the distance traveled in the motion
+    """
+
+    @classmethod
+    def from_json(cls, json: dict[str,]) -> "NanotecPdiMotionCommand":
+        """Returns a NanotecPdiMotionCommand from the given JSOn object.
+
+        Args:
+            json: A JSON object to deserialize
+
+        Returns:
+            A NanotecPdiMotionCommand
+        """
+        motion_type = MotionType[str(
+            json["mode"]).upper()] if "mode" in json else MotionType.RELATIVE
+
+        speed = float(json["speed"]) if "speed" in json else 0.0
+
+        distance = float(json["distance"]) if "distance" in json else 0.0
+
+        turns = float(json["turns"]) if "turns" in json else 0.0
+
+        return cls(motion_type=motion_type,
+                   speed=speed,
+                   distance=distance,
+                   turns=turns)
+
+    def to_json(self) -> dict[str,]:
+        """Returns a JSON representation of this command.
+
+        Returns:
+            A JSON object representing this NanotecPdiMotionCommand
+        """
+        json = {
+            "mode": self.motion_type.name.lower(),
+            "speed": self.speed,
+            "distance": self.distance,
+            "turns": self.turns
+        }
+
+        return json
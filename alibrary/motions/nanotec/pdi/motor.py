@@ -0,0 +1,473 @@
+"""Defines a class that controls a motor through the Process Data Interface
+(PDI) of a Nanotec driver.
+
+The PDI replaces the CiA402 state machine by a command code written next to
+its set-values. The drive executes a command when the code changes, so a
+repeated command has to be preceded by a NOP. Here, the set-values and the
+command code are sent in a single block write, and the status block is read
+back in the same request, so a motion costs one or two Modbus round trips
+without any fixed delay.
+
+This class is a subclass of both ModbusComponent and Motor. It has to define
+the Motor methods and can use the ones in ModbusComponent to do so.
+"""
+import struct
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum, IntFlag
+
+from alibrary.electronics.modbus import (ModbusComponent, ModbusError,
+                                         modbus_operation)
+from alibrary.logger import logger
+from alibrary.motions.abstract.command import MotionType
+from alibrary.motions.abstract.completion import MotionHandle
+from alibrary.motions.abstract.motor import Motor
+from alibrary.motions.nanotec.pdi.command import NanotecPdiMotionCommand
+from alibrary.server import BadRequestError, InternalServerError
+from alibrary.wait import WaitTimeoutError, wait_until
+
+
+class NanotecPdiStatus(IntFlag):
+    """Bits of the PDI status register."""
+    VOLTAGE_ENABLED = 0x01
+    FAULT = 0x04
+    TARGET_REACHED = 0x08
+
+
+class NanotecPdiCommand(IntEnum):
+    """Command codes of the PDI command register (low byte)."""
+    NOP = 0
+    SWITCH_OFF = 1
+    CLEAR_ERROR = 2
+    QUICK_STOP = 3
+    MOVE_ABSOLUTE = 20
+    MOVE_RELATIVE = 21
+
+
+@dataclass(frozen=True, slots=True)
+class NanotecPdiFeedback:
+    """An immutable snapshot of the PDI status block of a Nanotec driver.
+
+    Attributes:
+        timestamp: The monotonic time at which the block was requested
+        status: The PDI status flags
+        error_code: The error code reported by the driver
+        value: The raw return value, the actual position [PDI units]
+        position: The actual position [mm]
+        fault: True if the driver reported a fault
+        target_reached: True if the driver reported the target reached
+        running: True if a motion was running, i.e. the power stage was
+        enabled without fault and the target was not reached
+    """
+    timestamp: float
+    status: NanotecPdiStatus
+    error_code: int
+    value: int
+    position: float
+    fault: bool = field(init=False)
+    target_reached: bool = field(init=False)
+    running: bool = field(init=False)
+
+    def __post_init__(self):
+        enabled = NanotecPdiStatus.VOLTAGE_ENABLED in self.status
+        fault = NanotecPdiStatus.FAULT in self.status
+        target_reached = NanotecPdiStatus.TARGET_REACHED in self.status
+        object.__setattr__(self, "fault", fault)
+        object.__setattr__(self, "target_reached", target_reached)
+        # A switched off drive is not moving, even without the target
+        object.__setattr__(self, "running", enabled and not fault and
+                           not target_reached)
+
+    def to_json(self) -> dict[str,]:
+        """Returns a JSON representation of this snapshot."""
+        return {
+            "running": self.running,
+            "position": self.position,
+            "fault": self.fault,
+            "error_code": self.error_code,
+        }
+
+
+@dataclass
+class NanotecPdiConfig:
+    """Configuration variables of a Nanotec motor driven through the PDI.
+
+    Attributes:
+        max_speed: The maximum speed allowed by the motor
+        min_abs_distance: The minimum absolute distance that the motor can reach
+        max_abs_distance: The maximum absolute distance that the motor can reach
+        position_factor: The number of PDI position units per mm
+        speed_factor: The number of PDI speed units per mm/s
+        set_value3: The PDI-SetValue3 sent with the motions
+        position_tolerance: The distance to the target below which a motion
+        is over [PDI units]
+    """
+    max_speed: float = 0.0
+    min_abs_distance: float = 0.0
+    max_abs_distance: float = 0.0
+    position_factor: float = 1000.0
+    speed_factor: float = 1.0
+    set_value3: int = 0
+    position_tolerance: int = 0
+
+
+class NanotecPdiMotor(ModbusComponent, Motor):
+    """Implementation of the Motor class for a motor driven through the PDI of
+    a Nanotec driver.
+
+    The last command code written is remembered, so that a NOP is only sent
+    when the drive would otherwise ignore the next command.
+
+    Attributes:
+        config: The NanotecPdiConfig of the motor
+        feedback: The last NanotecPdiFeedback read, None before any read
+    """
+    # Address of the PDI set-values and command block (5996 to 5999):
+    # SetValue1 (32 bits), SetValue2 (16 bits), SetValue3 in the high byte and
+    # the command code in the low byte of the last register
+    SETVALUE_ADDRESS = 5996
+
+    # Address of the PDI status block (4996 to 4999): status, error code and
+    # return value (32 bits)
+    STATUS_ADDRESS = 4996
+    # Number of registers of the PDI status block
+    STATUS_SIZE = 4
+
+    # Maximum time to leave the fault after a clear error command [s]
+    FAULT_RESET_TIMEOUT = 5.0
+    # Maximum time to reach the standstill after a quick stop [s]
+    STOP_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        config: NanotecPdiConfig,
+        ip: str,
+        port: int = 502,
+        timeout: int = 2,
+        offline: bool = False,
+        pipeline_window: int = 0,
+    ) -> None:
+        super().__init__(ip, port, timeout, offline, pipeline_window)
+
+        self.config = config
+        self.feedback: NanotecPdiFeedback | None = None
+
+        # Last command code written, None while unknown
+        self.__last_command: NanotecPdiCommand | None = None
+        # Target of the last motion [PDI units]
+        self.__target: int | None = None
+
+    def read_feedback(self) -> NanotecPdiFeedback:
+        """Reads the PDI status block in a single request.
+
+        Returns:
+            A NanotecPdiFeedback snapshot
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        timestamp = time.monotonic()
+        try:
+            registers = self.read_block(self.STATUS_ADDRESS, self.STATUS_SIZE)
+        except ModbusError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+        return self.__decode_feedback(registers, timestamp)
+
+    def is_busy(self) -> bool:
+        """Returns the running status of the motor.
+
+        Returns:
+            True if a motion is running on the motor, false otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return self.read_feedback().running
+
+    def get_position(self) -> float:
+        """Gets the current position from the PDI return value.
+
+        Returns:
+            A float representing the position in mm
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return self.read_feedback().position
+
+    def get_snapshot(self,
+                     max_age: float | None = None) -> NanotecPdiFeedback:
+        """Returns the status block of the driver.
+
+        Args:
+            max_age: The maximum age of the last feedback to return [s], None
+            to read the driver
+
+        Returns:
+            A NanotecPdiFeedback snapshot
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        feedback = self.feedback
+        if (max_age is not None and feedback is not None and
+                time.monotonic() - feedback.timestamp <= max_age):
+            return feedback
+        return self.read_feedback()
+
+    def get_info(self) -> dict[str,]:
+        """Returns information about this motor from one status block read.
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        return self.read_feedback().to_json()
+
+    def is_motion_done(self) -> bool:
+        """Checks if the last started motion is over.
+
+        A target reached bit left from the previous motion is not enough: the
+        position must also be at the target of the last motion.
+
+        Returns:
+            True if the motion is over, False otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process or the driver
+            reports a fault
+        """
+        feedback = self.read_feedback()
+        if feedback.fault:
+            raise InternalServerError(
+                f"Nanotec PDI driver {self.ip} fault, error code "
+                f"{feedback.error_code:#06x}")
+
+        if not feedback.target_reached:
+            return False
+        return (self.__target is None or abs(feedback.value - self.__target)
+                <= self.config.position_tolerance)
+
+    @modbus_operation("start")
+    def start(self,
+              command: NanotecPdiMotionCommand,
+              track: bool = False,
+              snapshot: NanotecPdiFeedback | None = None
+              ) -> MotionHandle | None:
+        """Starts an absolute or relative motion.
+
+        The admission checks run against a single status block read. The
+        set-values and the motion command are then sent together.
+
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+            snapshot: A snapshot from `get_snapshot` to run the admission
+            checks against, a new one is read if None
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process
+            BadRequestError: The given command is not valid
+            ConflictError: The motor is busy with another motion
+        """
+        if command.motion_type not in (MotionType.ABSOLUTE,
+                                       MotionType.RELATIVE):
+            raise BadRequestError(
+                f"{command.motion_type.name.lower()} motions are not "
+                "supported through the PDI")
+
+        if snapshot is None:
+            snapshot = self.read_feedback()
+        if snapshot.fault:
+            raise InternalServerError(
+                f"Nanotec PDI driver {self.ip} fault, error code "
+                f"{snapshot.error_code:#06x}. Clear it before starting a "
+                "motion.")
+
+        super().start(command, snapshot=snapshot)
+        self.validate_command(command, self.config.min_abs_distance,
+                              self.config.max_abs_distance, snapshot.position)
+
+        distance = round(command.distance * self.config.position_factor)
+        speed = round(command.speed * self.config.speed_factor)
+        if command.motion_type == MotionType.RELATIVE:
+            pdi_command = NanotecPdiCommand.MOVE_RELATIVE
+            target = snapshot.value + distance
+        else:
+            pdi_command = NanotecPdiCommand.MOVE_ABSOLUTE
+            target = distance
+
+        self.current_command = command
+        self.__target = target
+        self.__send(pdi_command, distance, speed)
+
+        return self._track(command) if track else None
+
+    @modbus_operation("stop")
+    def stop(self) -> float:
+        """Stops any running motion with a quick stop.
+
+        It also delete the registered current command.
+
+        Returns:
+            The duration of the stop [s]
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        start = time.monotonic()
+        feedback = self.__send(NanotecPdiCommand.QUICK_STOP)
+        self.current_command = None
+        self.__target = None
+
+        if feedback.running:
+            try:
+                wait_until(lambda: not self.read_feedback().running,
+                           self.STOP_TIMEOUT, "PDI standstill")
+            except WaitTimeoutError as error:
+                logger.error(str(error))
+                raise InternalServerError(str(error)) from error
+
+        return time.monotonic() - start
+
+    @modbus_operation("switch_off")
+    def switch_off(self):
+        """Switches the motor off, releasing its holding torque.
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        self.__send(NanotecPdiCommand.SWITCH_OFF)
+        self.current_command = None
+
+    @modbus_operation("clear_fault")
+    def clear_fault(self):
+        """Clears the fault of the driver and waits for its end.
+
+        Raises:
+            InternalServerError: An error occurs in the process or the fault
+            remains
+        """
+        feedback = self.__send(NanotecPdiCommand.CLEAR_ERROR)
+        if not feedback.fault:
+            return
+
+        try:
+            wait_until(lambda: not self.read_feedback().fault,
+                       self.FAULT_RESET_TIMEOUT, "PDI fault reset")
+        except WaitTimeoutError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+    def validate_command(self,
+                         command: NanotecPdiMotionCommand,
+                         min_abs_distance: float,
+                         max_abs_distance: float,
+                         position: float | None = None):
+        """Checks if the command is valid regarding to the motor current state
+        and parameters.
+
+        In addition of its parent class validation, it also checks if the given
+        speed is valid
+
+        Raises:
+            BadRequestError: The given command is not valid
+            InternalServerError: An error occurs in the process
+        """
+        # Speed must be in ]0; max_speed]
+        if command.speed <= 0 or command.speed > self.config.max_speed:
+            raise BadRequestError("Wrong speed value, must be below "
+                                  f"{self.config.max_speed} mm/s")
+
+        super().validate_command(command, min_abs_distance, max_abs_distance,
+                                 position)
+
+    def __send(self,
+               command: NanotecPdiCommand,
+               set_value1: int = 0,
+               set_value2: int = 0) -> NanotecPdiFeedback:
+        """Sends a PDI command with its set-values and reads the status block
+        in the same request.
+
+        A NOP carrying the same set-values is written first only if the
+        command is the last one written or if it is unknown.
+
+        Args:
+            command: The NanotecPdiCommand to execute
+            set_value1: The 32 bits set-value, e.g. a position
+            set_value2: The 16 bits set-value, e.g. a speed
+
+        Returns:
+            The NanotecPdiFeedback read right after the command
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        timestamp = time.monotonic()
+        try:
+            if self.__last_command in (None, command):
+                self.write_block(
+                    self.SETVALUE_ADDRESS,
+                    self.__pack(set_value1, set_value2,
+                                NanotecPdiCommand.NOP))
+                self.__last_command = NanotecPdiCommand.NOP
+
+            registers = self.write_read_block(
+                self.SETVALUE_ADDRESS,
+                self.__pack(set_value1, set_value2, command),
+                self.STATUS_ADDRESS, self.STATUS_SIZE)
+            self.__last_command = command
+        except ModbusError as error:
+            # The command written is unknown after a failed request
+            self.__last_command = None
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
+
+        logger.debug("(Nanotec PDI) Command %s sent to %s", command.name,
+                     self.ip)
+        return self.__decode_feedback(registers, timestamp)
+
+    def __pack(self, set_value1: int, set_value2: int,
+               command: NanotecPdiCommand) -> list[int]:
+        """Packs the set-values and a command code into the four registers of
+        the set-values block.
+
+        SetValue1 is a signed 32 bits value, high word first as the other
+        32 bits registers of the drivers. SetValue2 is truncated to 16 bits.
+
+        Raises:
+            BadRequestError: SetValue1 does not fit in 32 bits
+        """
+        try:
+            data = struct.pack(">iHBB", set_value1, set_value2 & 0xFFFF,
+                               self.config.set_value3 & 0xFF, command)
+        except struct.error as error:
+            raise BadRequestError(
+                f"PDI set-value {set_value1} out of range") from error
+        return list(struct.unpack(">4H", data))
+
+    def __decode_feedback(self, registers: list[int],
+                          timestamp: float) -> NanotecPdiFeedback:
+        """Decodes the PDI status block and keeps it as the last feedback.
+
+        An offline driver is reported at rest, at its last target.
+        """
+        if self.offline:
+            value = self.__target or 0
+            registers = [NanotecPdiStatus.TARGET_REACHED, 0,
+                         *struct.unpack(">2H", struct.pack(">i", value))]
+
+        status, error_code, high, low = registers
+        value = struct.unpack(">i", struct.pack(">2H", high, low))[0]
+        self.feedback = NanotecPdiFeedback(
+            timestamp=timestamp,
+            status=NanotecPdiStatus(status),
+            error_code=error_code,
+            value=value,
+            position=value / self.config.position_factor)
+        return self.feedback
@@ -0,0 +1,251 @@
+"""Module defining a recorder of the telemetry of a Nanotec driver.
+
+A NanotecRecorder reads the telemetry frame of one driver at a fixed rate in
+a background thread and keeps the selected values in a preallocated
+RingBuffer, so that the actual position and speed profiles of a motion can be
+analysed afterwards. Each frame read also refreshes the driver snapshot, as a
+NanotecMonitor would.
+
+A capture gathers the samples recorded around a motion. It can be saved as a
+NumPy binary file or exported as downsampled JSON.
+
+Typical usage example:
+
+recorder = NanotecRecorder(drum_motor, rate=200)
+with recorder.capture(pre=0.1, post=0.2) as capture:
+    drum_motor.start(command, track=True).result(timeout=30)
+capture.save("drum_motion.npz")
+"""
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from alibrary.buffers import RingBuffer
+from alibrary.logger import logger
+from alibrary.motions.nanotec.driver import NanotecDriver
+from alibrary.server import InternalServerError
+
+# Telemetry values that can be recorded
+RECORDABLE_FIELDS = ("position", "speed", "sensor", "status_word", "info_word",
+                     "running", "homed", "target_reached")
+# Telemetry values recorded by default
+DEFAULT_FIELDS = ("position", "speed", "status_word")
+
+
+@dataclass
+class NanotecCapture:
+    """The telemetry samples recorded during a time window.
+
+    Attributes:
+        columns: The name of each column, the first one being the timestamp
+        data: A 2D array with one row per sample
+        start: The monotonic time of the start of the window
+        end: The monotonic time of the end of the window, None while recording
+    """
+    columns: tuple[str, ...]
+    data: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    start: float = 0.0
+    end: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns the values of one column.
+
+        The timestamps are given relative to the start of the window.
+
+        Args:
+            name: The name of the column
+
+        Returns:
+            A 1D array with the values of the column
+        """
+        values = self.data[:, self.columns.index(name)]
+        if name == "timestamp":
+            return values - self.start
+        return values
+
+    def save(self, path: str | Path):
+        """Saves the capture as a NumPy binary file.
+
+        A `.npy` file holds the raw 2D array, any other path is written as a
+        compressed `.npz` archive with one array per column.
+
+        Args:
+            path: The path of the file to write
+        """
+        path = Path(path)
+        if path.suffix == ".npy":
+            np.save(path, self.data)
+            return
+
+        np.savez_compressed(path,
+                            start=self.start,
+                            **{
+                                name: self.column(name)
+                                for name in self.columns
+                            })
+
+    def to_json(self, max_points: int = 500) -> dict[str,]:
+        """Returns a JSON representation of this capture.
+
+        The samples are decimated so that at most `max_points` are returned.
+
+        Args:
+            max_points: The maximum number of samples returned
+
+        Returns:
+            A JSON object with the list of values of each column
+        """
+        step = max(1, math.ceil(len(self.data) / max_points))
+        return {
+            "samples": len(self.data),
+            "step": step,
+            **{
+                name: self.column(name)[::step].tolist()
+                for name in self.columns
+            },
+        }
+
+
+class NanotecRecorder:
+    """Records the telemetry of a Nanotec driver in the background.
+
+    The buffer keeps the last `duration` seconds of samples. Reading a frame
+    shares the driver connection, a sample therefore costs the requests of
+    one telemetry frame.
+
+    Attributes:
+        driver: The recorded NanotecDriver
+        rate: The sampling rate [Hz]
+        fields: The telemetry values recorded
+        buffer: The RingBuffer of the samples
+        samples: The number of samples recorded
+        errors: The number of failed reads
+        overruns: The number of samples taken late
+    """
+
+    def __init__(self,
+                 driver: NanotecDriver,
+                 rate: float = 200.0,
+                 duration: float = 30.0,
+                 fields: tuple[str, ...] = DEFAULT_FIELDS) -> None:
+        unknown = set(fields) - set(RECORDABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot record the telemetry values {unknown}")
+
+        self.driver = driver
+        self.rate = rate
+        self.fields = tuple(fields)
+        self.buffer = RingBuffer(math.ceil(rate * duration),
+                                 ("timestamp",) + self.fields)
+        self.samples = 0
+        self.errors = 0
+        self.overruns = 0
+
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if the recording thread is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self):
+        """Starts the recording thread."""
+        if self.is_running:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name="nanotec recorder",
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stops the recording thread and waits for its end."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    @contextmanager
+    def capture(self,
+                pre: float = 0.0,
+                post: float = 0.0) -> Iterator[NanotecCapture]:
+        """Captures the samples recorded while the context is open.
+
+        If the recorder is not running, it is started for the capture and
+        stopped at its end, so no sample is available before it.
+
+        Args:
+            pre: The time recorded before the opening of the context [s]
+            post: The time recorded after the closing of the context [s]
+
+        Yields:
+            A NanotecCapture filled when the context is closed
+        """
+        started = not self.is_running
+        if started:
+            self.start()
+
+        capture = NanotecCapture(self.buffer.columns,
+                                 start=time.monotonic() - pre)
+        try:
+            yield capture
+        finally:
+            capture.end = time.monotonic() + post
+            if post > 0:
+                self.__stop.wait(post)
+            if started:
+                self.stop()
+            capture.data = self.buffer.get_samples(capture.start, capture.end)
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the recorder counters.
+
+        Returns:
+            A JSON object with the recording counters
+        """
+        return {
+            "running": self.is_running,
+            "rate": self.rate,
+            "buffered": len(self.buffer),
+            "samples": self.samples,
+            "errors": self.errors,
+            "overruns": self.overruns,
+        }
+
+    def __run(self):
+        """Records one sample per period until stopped."""
+        period = 1 / self.rate
+        fields = self.fields
+        sample = [0.0] * (len(fields) + 1)
+
+        next_sample = time.monotonic()
+        while not self.__stop.wait(max(0.0, next_sample - time.monotonic())):
+            try:
+                snapshot = self.driver.refresh_telemetry()
+            except InternalServerError as error:
+                self.errors += 1
+                logger.debug("(Nanotec recorder) Read of %s failed: %s",
+                             self.driver.ip, error)
+            else:
+                sample[0] = snapshot.timestamp
+                for index, name in enumerate(fields, 1):
+                    sample[index] = getattr(snapshot, name)
+                self.buffer.append(sample)
+                self.samples += 1
+
+            next_sample += period
+            now = time.monotonic()
+            if next_sample < now:
+                self.overruns += 1
+                next_sample = now
@@ -18,6 +18,9 @@ class NanotecDriverState(Enum):
     def from_status_word(cls, status_word: int) -> "NanotecDriverState":
         """Returns the NanotecDriverState associated with the given status word.
 
+        The state is looked up in a table indexed by the state bits of the
+        status word.
+
         Args:
             status_word: An integer representing the content of the status word
             of the driver
@@ -25,32 +28,47 @@ class NanotecDriverState(Enum):
         Returns:
             A NanotecDriverState object
         """
-        nanotec_driver_state = {
-            0x0: {
-                0: NanotecDriverState.NOT_READY_TO_SWITCH_ON,
-                1: NanotecDriverState.SWITCH_ON_DISABLED
-            },
-            0x1: NanotecDriverState.READY_TO_SWITCH_ON,
-            0x3: NanotecDriverState.SWITCHED_ON,
-            0x7: {
-                1: NanotecDriverState.OPERATION_ENABLED,
-                0: NanotecDriverState.QUICK_STOP_ACTIVE
-            },
-            0xF: NanotecDriverState.FAULT_REACTION_ACTIVE,
-            0x8: NanotecDriverState.FAULT
-        }
-
-        low_four_bits = status_word & 0xF
-
-        if low_four_bits == 0:
-            sod = (status_word & 0x40) >> 6
-
-            return cls(nanotec_driver_state[low_four_bits][sod])
-        if low_four_bits == 0x7:
-            qs = (status_word & 0x20) >> 5
-
-            return cls(nanotec_driver_state[low_four_bits][qs])
-        if low_four_bits in nanotec_driver_state:
-            return cls(nanotec_driver_state[low_four_bits])
-
-        return NanotecDriverState.UNKNOWN
+        return _STATE_TABLE[status_word & STATE_MASK]
+
+
+# Bits of the status word defining the state: the low four bits, the quick
+# stop bit (5) and the switch on disabled bit (6)
+STATE_MASK = 0x6F
+
+
+def _decode_status_word(status_word: int) -> NanotecDriverState:
+    """Decodes the state bits of a status word."""
+    nanotec_driver_state = {
+        0x0: {
+            0: NanotecDriverState.NOT_READY_TO_SWITCH_ON,
+            1: NanotecDriverState.SWITCH_ON_DISABLED
+        },
+        0x1: NanotecDriverState.READY_TO_SWITCH_ON,
+        0x3: NanotecDriverState.SWITCHED_ON,
+        0x7: {
+            1: NanotecDriverState.OPERATION_ENABLED,
+            0: NanotecDriverState.QUICK_STOP_ACTIVE
+        },
+        0xF: NanotecDriverState.FAULT_REACTION_ACTIVE,
+        0x8: NanotecDriverState.FAULT
+    }
+
+    low_four_bits = status_word & 0xF
+
+    if low_four_bits == 0:
+        sod = (status_word & 0x40) >> 6
+
+        return nanotec_driver_state[low_four_bits][sod]
+    if low_four_bits == 0x7:
+        qs = (status_word & 0x20) >> 5
+
+        return nanotec_driver_state[low_four_bits][qs]
+    if low_four_bits in nanotec_driver_state:
+        return nanotec_driver_state[low_four_bits]
+
+    return NanotecDriverState.UNKNOWN
+
+
+# State of every combination of the state bits
+_STATE_TABLE = tuple(
+    _decode_status_word(status_word) for status_word in range(STATE_MASK + 1))
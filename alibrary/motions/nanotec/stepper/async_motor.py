@@ -0,0 +1,40 @@
+"""Defines an asynchronous reader of a stepper motor connected to a Nanotec
+driver.
+
+This class implements the AsyncNanotecDriver class with the registers of the
+NanotecStepper. It allows to poll the motor concurrently with other drivers.
+"""
+from alibrary.motions.nanotec.async_driver import AsyncNanotecDriver
+from alibrary.motions.nanotec.stepper.motor import (NanotecStepper,
+                                                    NanotecStepperConfig)
+
+
+class AsyncNanotecStepper(AsyncNanotecDriver):
+    """Asynchronous variant of the NanotecStepper class."""
+
+    MOTION_MAP = NanotecStepper.MOTION_MAP
+    TELEMETRY_MAP = NanotecStepper.TELEMETRY_MAP
+
+    def __init__(
+        self,
+        config: NanotecStepperConfig,
+        ip: str,
+        port: int = 502,
+        timeout: int = 2,
+        offline: bool = False,
+    ) -> None:
+        super().__init__(ip, port, timeout, offline)
+
+        self.config = config
+
+    async def is_homed(self) -> bool:
+        """Returns the homing status of the motor.
+
+        Returns:
+            True if the homing of the motor has been done, false otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process
+        """
+        motion = await self._read_map(self.MOTION_MAP)
+        return motion["info_word"] & 2 == 2
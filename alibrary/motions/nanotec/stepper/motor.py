@@ -7,12 +7,14 @@ ones in ModbusComponent to do so.
 import time
 from dataclasses import dataclass
 
-from alibrary.electronics.modbus import ModbusError
+from alibrary.electronics.modbus import ModbusError, modbus_operation
+from alibrary.electronics.register_map import ModbusField, ModbusRegisterMap
 from alibrary.logger import logger
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.nanotec.stepper.command import (
     MotionType, NanotecStepperMotionCommand)
 from alibrary.motions.nanotec.driver import NanotecDriver
-from alibrary.motions.nanotec.state import NanotecDriverState
+from alibrary.motions.nanotec.telemetry import NanotecTelemetry
 from alibrary.server import BadRequestError, InternalServerError, ConflictError
 
 
@@ -76,6 +78,35 @@ class NanotecStepper(NanotecDriver):
     # Sensor threshold
     SENSOR_THRESHOLD = 600
 
+    # Motion registers, contiguous from 2008 to 2015
+    MOTION_MAP = ModbusRegisterMap([
+        ModbusField("position", ACTUAL_POSITION_ADDRESS),
+        ModbusField("speed", ACTUAL_SPEED_ADDRESS),
+        ModbusField("sensor", SENSOR_ADDRESS),
+        ModbusField("info_word", READ_INFORMATION_ADDRESS),
+    ])
+    # Telemetry frame, the motion registers and the status word
+    TELEMETRY_MAP = MOTION_MAP.with_fields([
+        ModbusField("status_word", NanotecDriver.STATUS_WORD_ADDRESS),
+    ])
+
+    # Position motion set-points, contiguous from 3006 to 3013
+    SETPOINT_MAP = ModbusRegisterMap([
+        ModbusField("position", TARGET_POSITION_ADDRESS),
+        ModbusField("speed", TARGET_SPEED_ADDRESS),
+        ModbusField("acceleration", TARGET_ACCELERATION_ADDRESS),
+        ModbusField("deceleration", TARGET_DECELERATION_ADDRESS),
+    ])
+    # Speed motion set-points, contiguous from 3008 to 3011
+    SPEED_SETPOINT_MAP = ModbusRegisterMap([
+        ModbusField("speed", TARGET_SPEED_ADDRESS),
+        ModbusField("acceleration", TARGET_ACCELERATION_ADDRESS),
+    ])
+    # Homing set-points, the speed motion ones and the search zero speed
+    HOMING_SETPOINT_MAP = SPEED_SETPOINT_MAP.with_fields([
+        ModbusField("search_zero_speed", SEARCH_ZERO_SPEED_ADDRESS),
+    ])
+
     def __init__(
         self,
         config: NanotecStepperConfig,
@@ -83,20 +114,30 @@ class NanotecStepper(NanotecDriver):
         port: int = 502,
         timeout: int = 2,
         offline: bool = False,
+        cache_ttl: float = 0.0,
+        pipeline_window: int = 0,
     ) -> None:
-        super().__init__(ip, port, timeout, offline)
+        super().__init__(ip, port, timeout, offline, cache_ttl,
+                         pipeline_window)
 
         self.config = config
 
-    def is_busy(self) -> bool:
+    def is_busy(self, max_age: float | None = None) -> bool:
         """Returns the running status of the motor.
 
+        Args:
+            max_age: The maximum age of the telemetry snapshot to answer from
+            [s], None to read the driver
+
         Returns:
             True if a motion is running on the motor, false otherwise
 
         Raises:
             InternalServerError: An error occurs in the process
         """
+        if max_age is not None:
+            return self.get_snapshot(max_age).running
+
         try:
             info_word = self.read_registers(self.READ_INFORMATION_ADDRESS)
             return info_word % 2 == 1
@@ -104,31 +145,45 @@ class NanotecStepper(NanotecDriver):
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
-    def is_homed(self) -> bool:
-        """Returns the running status of the motor.
+    def is_homed(self, max_age: float | None = None) -> bool:
+        """Returns the homing status of the motor.
+
+        Args:
+            max_age: The maximum age of the telemetry snapshot to answer from
+            [s], None to read the driver
 
         Returns:
-            True if a motion is running on the motor, false otherwise
+            True if the homing of the motor has been done, false otherwise
 
         Raises:
             InternalServerError: An error occurs in the process
         """
+        if max_age is not None:
+            return self.get_snapshot(max_age).homed
+
         try:
             info_word = self.read_registers(self.READ_INFORMATION_ADDRESS)
-            return (info_word / 2) % 2 == 1
+            return info_word & 2 == 2
         except ModbusError as error:
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
-    def get_position(self) -> float:
+    def get_position(self, max_age: float | None = None) -> float:
         """Gets the current position of the Nanotec driver.
 
+        Args:
+            max_age: The maximum age of the telemetry snapshot to answer from
+            [s], None to read the driver
+
         Returns:
             A float representing the position in mm
 
         Raises:
             InternalServerError: An error occurs in the process
         """
+        if max_age is not None:
+            return self.get_snapshot(max_age).position
+
         try:
             position = self.read_registers(self.ACTUAL_POSITION_ADDRESS)
             return position / 1000
@@ -136,15 +191,22 @@ class NanotecStepper(NanotecDriver):
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
-    def get_speed(self) -> float:
+    def get_speed(self, max_age: float | None = None) -> float:
         """Gets the current speed of the Nanotec driver.
 
+        Args:
+            max_age: The maximum age of the telemetry snapshot to answer from
+            [s], None to read the driver
+
         Returns:
             A float representing the speed in mm/s
 
         Raises:
             InternalServerError: An error occurs in the process
         """
+        if max_age is not None:
+            return self.get_snapshot(max_age).speed
+
         try:
             speed = self.read_registers(self.ACTUAL_SPEED_ADDRESS)
             return speed / 1000
@@ -152,8 +214,11 @@ class NanotecStepper(NanotecDriver):
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
 
-    def validate_command(self, command: NanotecStepperMotionCommand,
-                         min_abs_distance: float, max_abs_distance: float):
+    def validate_command(self,
+                         command: NanotecStepperMotionCommand,
+                         min_abs_distance: float,
+                         max_abs_distance: float,
+                         position: float | None = None):
         """Checks if the command is valid regarding to the motor current state
         and parameters.
 
@@ -169,26 +234,23 @@ class NanotecStepper(NanotecDriver):
             raise BadRequestError("Wrong speed value, must be below "
                                   f"{self.config.max_speed} mm/s")
 
-        super().validate_command(command, min_abs_distance, max_abs_distance)
+        super().validate_command(command, min_abs_distance, max_abs_distance,
+                                 position)
 
+    @modbus_operation("homing")
     def __perform_homing(self):
         """Runs a homing motion.
 
         Raises:
             InternalServerError: An error occurs in the process
         """
-        try:
-            self.write_registers(self.SEARCH_ZERO_SPEED_ADDRESS,
-                                 self.SEARCH_ZERO_SPEED)
-            self.write_registers(self.TARGET_SPEED_ADDRESS, self.HOMING_SPEED)
-            self.write_registers(self.TARGET_ACCELERATION_ADDRESS,
-                                 self.HOMING_ACCELERATION)
-        except ModbusError as error:
-            logger.error(str(error))
-            raise InternalServerError(str(error)) from error
+        self._write_setpoints(self.HOMING_SETPOINT_MAP, {
+            "speed": self.HOMING_SPEED,
+            "acceleration": self.HOMING_ACCELERATION,
+            "search_zero_speed": self.SEARCH_ZERO_SPEED,
+        }, 6)
 
         # Starts homing motion
-        self._set_operation_mode(6)
         self._set_control_word(0xF)
         self._set_control_word(0x1F)
 
@@ -203,16 +265,13 @@ class NanotecStepper(NanotecDriver):
         Raises:
             InternalServerError: An error occurs in the process
         """
-        # Writes homing parameters
-        try:
-            self.write_registers(self.TARGET_SPEED_ADDRESS, int(speed * 1000))
-            self.write_registers(self.TARGET_ACCELERATION_ADDRESS, acceleration)
-        except ModbusError as error:
-            logger.error(str(error))
-            raise InternalServerError(str(error)) from error
+        # Writes homing parameters and sets the velocity mode
+        self._write_setpoints(self.SPEED_SETPOINT_MAP, {
+            "speed": int(speed * 1000),
+            "acceleration": acceleration,
+        }, 3)
 
         # Starts homing motion
-        self._set_operation_mode(3)
         self._set_control_word(0x0F)
 
     def __perform_position_motion(self,
@@ -229,65 +288,60 @@ class NanotecStepper(NanotecDriver):
         Raises:
             InternalServerError: An error occurs in the process
         """
-        # Writes homing parameters
-        try:
-            self.write_registers(self.TARGET_POSITION_ADDRESS,
-                                 int(distance * 1000))
-            self.write_registers(self.TARGET_SPEED_ADDRESS, int(speed * 1000))
-            self.write_registers(self.TARGET_ACCELERATION_ADDRESS,
-                                 self.DEFAULT_ACCELERATION)
-            self.write_registers(self.TARGET_DECELERATION_ADDRESS,
-                                 self.DEFAULT_DECELERATION)
-        except ModbusError as error:
-            logger.error(str(error))
-            raise InternalServerError(str(error)) from error
+        # Writes homing parameters and sets the profile position mode
+        self._write_setpoints(self.SETPOINT_MAP, {
+            "position": int(distance * 1000),
+            "speed": int(speed * 1000),
+            "acceleration": self.DEFAULT_ACCELERATION,
+            "deceleration": self.DEFAULT_DECELERATION,
+        }, 1)
 
         # Starts homing motion
-        self._set_operation_mode(1)
         self._set_control_word(0xF)
 
         oms = 0b111 if is_relative else 0b011
         control_word = oms * 16 + 0xF
-        self._set_control_word(control_word)
 
         # Waits for set-point to be validated
-        while not self._check_bit_of_status_word(12):
-            time.sleep(0.1)
+        if not self._set_control_word_and_check_bit(control_word, 12):
+            self._wait(lambda: self._check_bit_of_status_word(12),
+                       self.SETPOINT_TIMEOUT, "set-point acknowledge")
 
         # Resets control word
         control_word -= 16
         self._set_control_word(control_word)
 
-    def start(self, command: NanotecStepperMotionCommand):
+    @modbus_operation("start")
+    def start(self,
+              command: NanotecStepperMotionCommand,
+              track: bool = False,
+              snapshot: NanotecTelemetry | None = None) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
-        It will first call the parent method to check if there is no motion
-        currently running. Then it checks if the command is valid before
-        starting the motion.
+        The admission checks run against a single telemetry snapshot: no
+        motion must be running, the command must be valid and the driver must
+        be in a state allowing a motion.
+
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+            snapshot: A snapshot from `get_snapshot` to run the admission
+            checks against, a new one is read if None
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
 
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
-        super().start(command)
+        snapshot = self._admit(command, snapshot)
 
-        # Validates motion command
-        self.validate_command(command, self.config.min_abs_distance,
-                              self.config.max_abs_distance)
-
-        if not self.is_homed() and command.motion_type != MotionType.HOMING:
+        if not snapshot.homed and command.motion_type != MotionType.HOMING:
             raise ConflictError("Homing not donee")
 
-        # Check if the driver is in the right state
-        state = self._get_state()
-        if state not in (NanotecDriverState.SWITCHED_ON,
-                         NanotecDriverState.OPERATION_ENABLED):
-            logger.error("Impossible to perform Nanotec motion from state %s",
-                         state)
-            raise InternalServerError(
-                f"Impossible to perform Nanotec motion from state {state}")
-
         self.current_command = command
 
         # Calls the correct procedure
@@ -300,14 +354,31 @@ class NanotecStepper(NanotecDriver):
             self.__perform_position_motion(command.distance, command.speed,
                                            is_relative)
 
-    def stop(self):
+        return self._track(command) if track else None
+
+    @modbus_operation("stop")
+    def stop(self, fast: bool = False) -> float:
         """Stops any running motion on this motor.
 
-        It also delete the registered current command.
+        It also delete the registered current command. By default, the motor
+        is halted until its speed is zero, then a zero relative motion clears
+        the interrupted target. With `fast`, the halt uses the stop
+        deceleration and the driver is switched on once the status word
+        reports the standstill.
+
+        Args:
+            fast: If True, the fast stop is used
+
+        Returns:
+            The duration of the stop [s]
 
         Raises:
             InternalServerError: An error occurs in the process
         """
+        if fast:
+            return self._fast_stop()
+
+        start = time.monotonic()
         # try:
         #     # Trigger HALT mode
         #     self._set_control_word(0x10F)
@@ -331,12 +402,16 @@ class NanotecStepper(NanotecDriver):
 
         # self.__perform_position_motion(10, self.HOMING_SPEED, True)
 
+        self._cancel_queue()
+
         if self.current_command is not None:
             self._set_control_word(0x10F)
 
-            while self.get_speed() != 0:
-                time.sleep(0.1)
+            self._wait(lambda: self.get_speed() == 0, self.STOP_TIMEOUT,
+                       "motor stop")
 
             self.__perform_position_motion(0, 0, True)
 
             self.current_command = None
+
+        return time.monotonic() - start
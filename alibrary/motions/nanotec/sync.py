@@ -0,0 +1,186 @@
+"""Module defining a synchronized start of motions on several Nanotec drivers.
+
+Starting the drums one after another costs several Modbus round trips per
+drum, so the last one starts tens of milliseconds after the first one. Here,
+the set-points of every driver are uploaded first, concurrently. Then one
+thread per driver waits on a barrier and sends the single control word
+starting its motion, each on the socket of its own driver. The start skew is
+reduced to the spread of these last requests, which is measured and reported.
+
+Typical usage example:
+
+report = start_synchronized([(drum_0, command), (drum_1, command)])
+logger.info("Drums started with a skew of %.3f ms", report.skew * 1000)
+"""
+# pylint: disable=protected-access
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from alibrary.logger import logger
+from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
+from alibrary.motions.nanotec.driver import NanotecDriver
+from alibrary.server import InternalServerError
+
+# Maximum time for the trigger threads to reach the barrier [s]
+BARRIER_TIMEOUT = 2.0
+
+
+@dataclass
+class NanotecSyncReport:
+    """Timing of a synchronized start.
+
+    The times are relative to the first trigger request sent.
+
+    Attributes:
+        preload: The duration of the set-points upload [s]
+        sent: The time at which each trigger request was sent [s]
+        received: The time at which each trigger response was received [s]
+        handles: The MotionHandle of each motion if they are tracked
+    """
+    preload: float
+    sent: list[float]
+    received: list[float]
+    handles: list[MotionHandle | None] = field(default_factory=list)
+
+    @property
+    def skew(self) -> float:
+        """Returns the spread of the trigger requests [s]."""
+        return max(self.sent) - min(self.sent)
+
+    @property
+    def response_skew(self) -> float:
+        """Returns the spread of the trigger responses [s]."""
+        return max(self.received) - min(self.received)
+
+    def to_json(self) -> dict[str,]:
+        """Returns a JSON representation of this report."""
+        return {
+            "preload": self.preload,
+            "skew": self.skew,
+            "response_skew": self.response_skew,
+            "sent": self.sent,
+            "received": self.received,
+        }
+
+
+def start_synchronized(motions: list[tuple[NanotecDriver, MotionCommand]],
+                       track: bool = False) -> NanotecSyncReport:
+    """Starts position or speed motions on several drivers together.
+
+    If a set-point cannot be uploaded, the prepared drivers are switched on
+    without starting. If a trigger fails, every driver is stopped.
+
+    Args:
+        motions: The driver and the MotionCommand of each motion
+        track: If True, the report gives a MotionHandle for each motion
+
+    Returns:
+        A NanotecSyncReport with the timing of the start
+
+    Raises:
+        InternalServerError: An error occurs in the process
+        BadRequestError: A command is not valid or is a homing
+        ConflictError: A motor is busy with another motion
+    """
+    drivers = [driver for driver, _ in motions]
+    if len(set(map(id, drivers))) != len(drivers):
+        raise InternalServerError("A driver appears twice in a synchronized "
+                                  "start")
+
+    with ThreadPoolExecutor(max_workers=len(motions)) as executor:
+        start = time.perf_counter()
+        futures = [
+            executor.submit(driver._prepare_motion, command)
+            for driver, command in motions
+        ]
+        control_words, error = _gather(futures)
+        preload = time.perf_counter() - start
+        if error is not None:
+            for driver, control_word in zip(drivers, control_words):
+                if control_word is not None:
+                    _safe_call(driver._set_control_word,
+                               driver.DISABLE_OPERATION_CONTROL_WORD)
+            raise error
+
+        barrier = threading.Barrier(len(motions), timeout=BARRIER_TIMEOUT)
+        futures = [
+            executor.submit(_trigger, barrier, driver, control_word)
+            for driver, control_word in zip(drivers, control_words)
+        ]
+        timings, error = _gather(futures)
+        if error is None:
+            futures = [
+                executor.submit(driver._finish_motion_start, command,
+                                control_word, acknowledged)
+                for (driver, command), control_word, (_, _, acknowledged)
+                in zip(motions, control_words, timings)
+            ]
+            _, error = _gather(futures)
+
+        if error is not None:
+            for driver in drivers:
+                _safe_call(driver._fast_stop)
+            raise error
+
+    first = min(sent for sent, _, _ in timings)
+    report = NanotecSyncReport(
+        preload=preload,
+        sent=[sent - first for sent, _, _ in timings],
+        received=[received - first for _, received, _ in timings])
+    if track:
+        report.handles = [
+            driver._track(command)
+            for driver, command in motions
+        ]
+
+    logger.info(
+        "Synchronized start of %d Nanotec drivers: preload %.1f ms, skew "
+        "%.3f ms, response skew %.3f ms", len(motions), preload * 1000,
+        report.skew * 1000, report.response_skew * 1000)
+    return report
+
+
+def _trigger(barrier: threading.Barrier, driver: NanotecDriver,
+             control_word: int) -> tuple[float, float, bool]:
+    """Sends the trigger of a driver once every trigger thread is ready.
+
+    Returns:
+        The times of the request and of the response and the acknowledge bit
+    """
+    barrier.wait()
+    sent = time.perf_counter()
+    acknowledged = driver._trigger_motion(control_word)
+    return sent, time.perf_counter(), acknowledged
+
+
+def _gather(futures: list) -> tuple[list, Exception | None]:
+    """Waits for every future.
+
+    Returns:
+        The result of each future, None for the failed ones, and the first
+        error raised
+    """
+    results = []
+    first_error = None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            results.append(None)
+            if first_error is None:
+                first_error = error
+    if isinstance(first_error, threading.BrokenBarrierError):
+        first_error = InternalServerError("Synchronized start aborted, a "
+                                          "trigger thread was not ready")
+    return results, first_error
+
+
+def _safe_call(function, *args):
+    """Calls a recovery function, logging its errors instead of raising."""
+    try:
+        function(*args)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        logger.error("Recovery of a synchronized start failed: %s", error)
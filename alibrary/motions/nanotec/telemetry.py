@@ -0,0 +1,218 @@
+"""Module defining the telemetry snapshots of the Nanotec drivers and a
+background monitor refreshing them.
+
+A NanotecMonitor polls the telemetry frame of one or more drivers at a fixed
+rate in a background thread. Each driver publishes its last frame as an
+immutable NanotecTelemetry snapshot, from which the read APIs can answer
+without any Modbus request while it is fresh enough.
+
+Typical usage example:
+
+monitor = NanotecMonitor([drum_motor, axis_motor], period=0.05)
+monitor.start()
+info = drum_motor.get_info()  # served from the last snapshot
+position = axis_motor.get_position(max_age=0.1)
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+
+from alibrary.logger import logger
+from alibrary.motions.nanotec.state import NanotecDriverState
+from alibrary.server import InternalServerError
+
+
+@dataclass(frozen=True, slots=True)
+class NanotecTelemetry:
+    """An immutable snapshot of the telemetry of a Nanotec driver.
+
+    The flags and the state are decoded once, when the snapshot is created,
+    so that the motion admission checks only read attributes.
+
+    Attributes:
+        timestamp: The monotonic time at which the frame was requested
+        status_word: The status word of the driver
+        position: The actual position [mm]
+        speed: The actual speed [mm/s]
+        sensor: The value of the sensor register
+        info_word: The information word of the driver
+        state: The state of the driver
+        running: True if a motion was running
+        homed: True if the homing was done
+        target_reached: True if the status word reported the target reached
+    """
+    timestamp: float
+    status_word: int
+    position: float
+    speed: float
+    sensor: int
+    info_word: int
+    state: NanotecDriverState = field(init=False)
+    running: bool = field(init=False)
+    homed: bool = field(init=False)
+    target_reached: bool = field(init=False)
+
+    def __post_init__(self):
+        state = NanotecDriverState.from_status_word(self.status_word)
+        object.__setattr__(self, "state", state)
+        object.__setattr__(self, "running", self.info_word & 1 == 1)
+        object.__setattr__(self, "homed", self.info_word & 2 == 2)
+        object.__setattr__(self, "target_reached",
+                           self.status_word & 0x400 == 0x400)
+
+    @classmethod
+    def from_registers(cls, values: dict[str, int],
+                       timestamp: float) -> "NanotecTelemetry":
+        """Creates a snapshot from a decoded telemetry frame.
+
+        Args:
+            values: The raw values of the TELEMETRY_MAP fields
+            timestamp: The monotonic time at which the frame was requested
+
+        Returns:
+            A NanotecTelemetry object
+        """
+        return cls(timestamp=timestamp,
+                   status_word=values["status_word"],
+                   position=values["position"] / 1000,
+                   speed=values["speed"] / 1000,
+                   sensor=values["sensor"],
+                   info_word=values["info_word"])
+
+    @property
+    def age(self) -> float:
+        """Returns the age of this snapshot [s]."""
+        return time.monotonic() - self.timestamp
+
+    def to_json(self) -> dict[str,]:
+        """Returns a JSON representation of this snapshot."""
+        return {
+            "age": self.age,
+            "state": self.state.name,
+            "running": self.running,
+            "homed": self.homed,
+            "position": self.position,
+            "speed": self.speed,
+            "sensor": self.sensor,
+        }
+
+
+class NanotecMonitor:
+    """Refreshes the telemetry snapshots of Nanotec drivers in the background.
+
+    Every `period` seconds, the telemetry frame of each driver is read. While
+    a driver is monitored, its `get_info` is served from the snapshot if it is
+    younger than `max_age`, by default three periods. A driver that cannot be
+    polled keeps its last snapshot, which ages until the reads fall back to
+    Modbus requests.
+
+    Attributes:
+        drivers: The monitored NanotecDriver objects
+        period: The polling period [s]
+        max_age: The maximum age of the snapshots served by `get_info` [s]
+        polls: The number of polling sweeps
+        errors: The number of failed driver polls
+        overruns: The number of sweeps longer than the period
+    """
+
+    def __init__(self,
+                 drivers: list | None = None,
+                 period: float = 0.05,
+                 max_age: float | None = None) -> None:
+        self.drivers = []
+        self.period = period
+        self.max_age = max_age if max_age is not None else 3 * period
+        self.polls = 0
+        self.errors = 0
+        self.overruns = 0
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+        for driver in drivers or []:
+            self.add(driver)
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if the monitor thread is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def add(self, driver):
+        """Starts monitoring the given driver.
+
+        Args:
+            driver: The NanotecDriver to monitor
+        """
+        with self.__lock:
+            if driver not in self.drivers:
+                self.drivers.append(driver)
+        driver.info_max_age = self.max_age
+
+    def remove(self, driver):
+        """Stops monitoring the given driver.
+
+        Its `get_info` then reads the driver again.
+
+        Args:
+            driver: The monitored NanotecDriver
+        """
+        with self.__lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+        driver.info_max_age = None
+
+    def start(self):
+        """Starts the polling thread."""
+        if self.is_running:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name="nanotec monitor",
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stops the polling thread and waits for its end."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the monitor counters.
+
+        Returns:
+            A JSON object with the polling counters
+        """
+        return {
+            "running": self.is_running,
+            "drivers": len(self.drivers),
+            "period": self.period,
+            "polls": self.polls,
+            "errors": self.errors,
+            "overruns": self.overruns,
+        }
+
+    def __run(self):
+        """Polls every driver once per period until stopped."""
+        next_poll = time.monotonic()
+        while not self.__stop.wait(max(0.0, next_poll - time.monotonic())):
+            with self.__lock:
+                drivers = list(self.drivers)
+
+            for driver in drivers:
+                try:
+                    driver.refresh_telemetry()
+                except InternalServerError as error:
+                    self.errors += 1
+                    logger.debug("(Nanotec monitor) Poll of %s failed: %s",
+                                 driver.ip, error)
+            self.polls += 1
+
+            next_poll += self.period
+            now = time.monotonic()
+            if next_poll < now:
+                self.overruns += 1
+                next_poll = now
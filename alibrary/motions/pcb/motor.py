@@ -8,13 +8,53 @@ advantages for the motors and motions.
 """
 import os
 import pickle
+import threading
 from dataclasses import dataclass
 
 from alibrary.electronics.pcb import PssPCB
-from alibrary.motions.abstract.motor import Motor
+from alibrary.motions.abstract.completion import MotionHandle
+from alibrary.motions.abstract.motor import Motor, MotorSnapshot
 from alibrary.motions.pcb.command import MotionType, PCBScrewMotionCommand
 from alibrary.server import ConflictError
 
+# File with the last position of every screw stepper, by index
+POSITIONS_FILE = "./logs/screw_steppers_position"
+# Serializes the updates of the positions file
+_positions_lock = threading.Lock()
+
+
+def load_positions() -> dict[int, float]:
+    """Returns the positions saved in the positions file.
+
+    Returns:
+        The last position of each screw stepper, by index, empty if the file
+        does not exist
+    """
+    if not os.path.exists(POSITIONS_FILE):
+        return {}
+    with open(POSITIONS_FILE, "rb") as f:
+        return pickle.load(f)
+
+
+def save_positions(positions: dict[int, float]):
+    """Updates the positions of some screw steppers in the positions file.
+
+    The positions of the other steppers are kept. The file is replaced at
+    once, so that it is never left half written.
+
+    Args:
+        positions: The new position of each stepper, by index
+    """
+    with _positions_lock:
+        if not os.path.exists("./logs"):
+            os.makedirs("./logs")
+        steppers_position = load_positions()
+        steppers_position.update(positions)
+        temporary_file = f"{POSITIONS_FILE}.tmp"
+        with open(temporary_file, "wb") as f:
+            pickle.dump(steppers_position, f)
+        os.replace(temporary_file, POSITIONS_FILE)
+
 
 @dataclass
 class PCBScrewConfig:
@@ -49,34 +89,44 @@ class PCBScrewMotor(Motor):
         self.__load_position()
 
     def __save_position(self):
-        """Saves the current position into a json object in a file.
+        """Saves the current position into the positions file.
 
         If the file doesn't exist, it will be created
         """
-        if not os.path.exists("./logs"):
-            os.makedirs("./logs")
-        with open(self.file_name, "wb") as f:
-            steppers_position = {}
-            steppers_position[self.index] = self.position
-            pickle.dump(steppers_position, f)
+        save_positions({self.index: self.position})
 
     def __load_position(self):
-        """Loads the current position from a json object in a file.
+        """Loads the current position from the positions file.
+
+        If this screw is not in the positions file, its position is read from
+        its own file, written by the previous versions.
         """
         if self.pcb.offline:
             self.position = 300
             return
 
-        if os.path.exists(self.file_name):
+        steppers_position = load_positions()
+        if self.index not in steppers_position and os.path.exists(
+                self.file_name):
             with open(self.file_name, "rb") as f:
                 steppers_position = pickle.load(f)
-                self.position = steppers_position[self.index]
 
-                raw_position = int(self.position * self.config.steps_per_rev *
-                                   self.config.microsteps_per_step /
-                                   self.config.micron_per_rev)
+        if self.index in steppers_position:
+            self.position = steppers_position[self.index]
+            self.pcb.set_actual_position(self.index,
+                                         self.__to_raw(self.position))
 
-                self.pcb.set_actual_position(self.index, raw_position)
+    def __to_raw(self, distance: float) -> int:
+        """Converts a distance of this screw in microsteps.
+
+        Args:
+            distance: The distance to convert
+
+        Returns:
+            The number of microsteps of the stepper
+        """
+        return int(distance * self.config.steps_per_rev *
+                   self.config.microsteps_per_step / self.config.micron_per_rev)
 
     def is_busy(self) -> bool:
         """Checks if this screw is busy.
@@ -87,8 +137,7 @@ class PCBScrewMotor(Motor):
         Raises:
             PssPCBError: An error occurs in th communication with the PCB
         """
-        return (self.pcb.check_busy() >> self.index) % 2 == 1
-        # return (self.pcb.check_busy() >> self.index) % 2 != 1
+        return self.pcb.get_stepper_status().is_busy(self.index)
 
     def get_position(self) -> float:
         """Returns the current position of the screw.
@@ -118,7 +167,7 @@ class PCBScrewMotor(Motor):
         Raises:
             PssPCBError: An error occurs in th communication with the PCB
         """
-        return (self.pcb.check_homing_done() >> self.index) % 2 == 1
+        return self.pcb.get_stepper_status().is_homed(self.index)
 
     def __perform_homing(self):
         """Performs the homing procedure on this screw.
@@ -140,44 +189,128 @@ class PCBScrewMotor(Motor):
         Raises:
             PssPCBError: An error occurs in th communication with the PCB
         """
-        raw_distance = int(distance * self.config.steps_per_rev *
-                           self.config.microsteps_per_step /
-                           self.config.micron_per_rev)
-
-        self.pcb.perform_distance_motion(self.index, raw_distance)
+        self.pcb.perform_distance_motion(self.index, self.__to_raw(distance))
 
         self.position = distance
         self.__save_position()
 
-    def start(self, command: PCBScrewMotionCommand):
+    def start(self,
+              command: PCBScrewMotionCommand,
+              track: bool = False,
+              snapshot: MotorSnapshot | None = None) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
         It will first call the parent method to check if there is no motion
         currently running. Then it checks if the homing of the screw was done
         and if the command is valid before starting the motion.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+            snapshot: A snapshot from `get_snapshot` to run the admission
+            checks against, the motor is read if None
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
-        super().start(command)
+        super().start(command, snapshot=snapshot)
+        distance = self.__check_motion(command, self.__is_homing_done())
 
-        if not self.__is_homing_done(
-        ) and command.motion_type != MotionType.HOMING:
+        self.current_command = command
+        if command.motion_type == MotionType.HOMING:
+            self.__perform_homing()
+        else:
+            self.__perform_distance_motion(distance)
+
+        return self._track(command) if track else None
+
+    @staticmethod
+    def start_all(motors: list["PCBScrewMotor"],
+                  command: PCBScrewMotionCommand,
+                  track: bool = False) -> list[MotionHandle] | None:
+        """Starts the same motion on several screws of one PCB at once.
+
+        The busy and homing states of every screw are read in one exchange
+        and every command is checked before any motion starts. The distance
+        motions are then sent in a single frame and the new positions are
+        saved in one write.
+
+        Args:
+            motors: The PCBScrewMotor to move, sharing the same PCB
+            command: The MotionCommand to perform on each screw
+            track: If True, the MotionHandle of each screw is returned
+
+        Returns:
+            The list of the screws MotionHandle if the motion is tracked, None
+            otherwise
+
+        Raises:
+            InternalServerError: An error occurs in the process
+            BadRequestError: The given command is not valid
+            ConflictError: A motor is busy with another motion
+        """
+        pcb = motors[0].pcb
+        status = pcb.get_stepper_status(max_age=0)
+        distances = []
+        for motor in motors:
+            Motor.start(motor,
+                        command,
+                        snapshot=MotorSnapshot(status.is_busy(motor.index),
+                                               motor.position))
+            distances.append(
+                motor.__check_motion(command, status.is_homed(motor.index)))
+
+        if command.motion_type == MotionType.HOMING:
+            for motor in motors:
+                pcb.perform_homing(motor.index)
+        else:
+            pcb.perform_distance_motions({
+                motor.index: motor.__to_raw(distance)
+                for motor, distance in zip(motors, distances)
+            })
+
+        for motor, distance in zip(motors, distances):
+            motor.current_command = command
+            motor.position = distance
+        save_positions({motor.index: motor.position for motor in motors})
+
+        if track:
+            return [motor._track(command) for motor in motors]
+        return None
+
+    def __check_motion(self, command: PCBScrewMotionCommand,
+                       homed: bool) -> float:
+        """Checks if a motion can be started and returns its target.
+
+        Args:
+            command: The MotionCommand to check
+            homed: True if the homing of this screw has been done
+
+        Returns:
+            The absolute distance to reach, 0 for a homing
+
+        Raises:
+            BadRequestError: The given command is not valid
+            ConflictError: The homing of the screw has not been done
+        """
+        if not homed and command.motion_type != MotionType.HOMING:
             raise ConflictError("Perform the homing before moving the blade")
 
         self.validate_command(command, self.config.min_abs_distance,
                               self.config.max_abs_distance)
 
-        self.current_command = command
         if command.motion_type == MotionType.HOMING:
-            self.__perform_homing()
-        elif command.motion_type == MotionType.ABSOLUTE:
-            self.__perform_distance_motion(command.distance)
-        else:  #if command.motion_type == PCBScrewMotionType.RELATIVE:
-            crt_position = self.get_position()
-            self.__perform_distance_motion(command.distance + crt_position)
+            return 0.0
+        if command.motion_type == MotionType.ABSOLUTE:
+            return command.distance
+        #if command.motion_type == PCBScrewMotionType.RELATIVE:
+        return command.distance + self.get_position()
 
     def stop(self):
         """Deletes the registered current command."""
@@ -7,7 +7,8 @@ abstract class is used. This allows to have a template and to benefit from OOP
 advantages for the motors and motions.
 """
 from alibrary.electronics.rexroth import RexrothDotNetDriver
-from alibrary.motions.abstract.motor import Motor
+from alibrary.motions.abstract.completion import MotionHandle
+from alibrary.motions.abstract.motor import Motor, MotorSnapshot
 from alibrary.motions.pcb.command import MotionType, PCBScrewMotionCommand
 
 
@@ -47,22 +48,40 @@ class RexrothMotor(Motor):
         """
         return self.driver.get_position()
 
-    def start(self, command: PCBScrewMotionCommand):
+    def start(self,
+              command: PCBScrewMotionCommand,
+              track: bool = False,
+              snapshot: MotorSnapshot | None = None) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
         It will first call the parent method to check if there is no motion
         currently running. Then it checks if the homing of the screw was done
         and if the command is valid before starting the motion.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+            snapshot: A snapshot from `get_snapshot` to run the admission
+            checks against, the motor is read if None
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
-        super().start(command)
+        super().start(command, snapshot=snapshot)
 
-        self.validate_command(command, self.min_abs_distance,
-                              self.max_abs_distance)
+        self.validate_command(
+            command, self.min_abs_distance, self.max_abs_distance,
+            None if snapshot is None else snapshot.position)
+
+        # The driver waits for the end of the motion before returning, so the
+        # handle is resolved at once
+        handle = MotionHandle(self, command) if track else None
 
         self.current_command = command
         if command.motion_type == MotionType.ABSOLUTE:
@@ -70,6 +89,10 @@ class RexrothMotor(Motor):
         elif command.motion_type == MotionType.RELATIVE:
             self.driver.perform_relative_motion(command.distance, command.speed)
 
+        if handle is not None:
+            handle.complete()
+        return handle
+
     def stop(self):
         """Deletes the registered current command."""
         self.current_command = None
@@ -1,15 +1,16 @@
 """Module defining the hood valve.
 """
-import time
-
 from alibrary.electronics.pcb import PssPCB, PssPCBError
 from alibrary.logger import logger
 from alibrary.pneumatic.valve import PneumaticValve
 from alibrary.server import InternalServerError
+from alibrary.wait import WaitTimeoutError, wait_until
 
 
 class HoodValve(PneumaticValve):
     """A valve controlled by a custom PCB"""
+    # Maximum time to wait for the homing of the valve [s]
+    HOMING_TIMEOUT = 60.0
 
     def __init__(
         self,
@@ -33,9 +34,20 @@ class HoodValve(PneumaticValve):
 
         Args:
             initial_position: The initial position of the valve
+
+        Raises:
+            InternalServerError: The homing is not done before the timeout or
+            an error occurs in the communication with the PCB
         """
-        while not self.is_homing_done():
-            time.sleep(0.1)
+        try:
+            wait_until(self.is_homing_done,
+                       self.HOMING_TIMEOUT,
+                       "hood valve homing",
+                       initial_interval=0.01,
+                       max_interval=0.1)
+        except WaitTimeoutError as error:
+            logger.error(str(error))
+            raise InternalServerError(str(error)) from error
         logger.debug("Homing of the hood valve done")
 
         try:
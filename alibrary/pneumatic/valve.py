@@ -26,17 +26,8 @@ class PneumaticValve:
         self.pcb = pcb
         self.plc = plc
 
-    def __compute_pressure(self, data: int) -> float:
-        """Converts a raw pressure measure in a correct pressure value.
-
-        Args:
-            data: The raw pressure measure
-
-        Returns:
-            A float representing the pressure value
-        """
-        return ((self.p_max - self.p_min) * (data - 0.1 * self.N_MAX) /
-                (0.8 * self.N_MAX) + self.p_min)
+        # The raw measures of the sensor are converted by the PCB snapshot
+        self.pcb.set_sensor_range(self.sensor_index, p_range, self.N_MAX)
 
     def __compute_data(self, pressure: float) -> int:
         """Converts a pressure value in a raw pressure setpoint.
@@ -50,9 +41,16 @@ class PneumaticValve:
         return int((pressure - self.p_min) / (self.p_max - self.p_min) *
                    (0.8 * self.N_MAX) + 0.1 * self.N_MAX)
 
-    def get_pressure(self) -> float:
+    def get_pressure(self, max_age: float | None = None) -> float:
         """Returns the current pressure measured at the valve.
 
+        It is taken from the pressure snapshot shared by every valve of the
+        PCB.
+
+        Args:
+            max_age: The maximum age of the measure [s], by default the one of
+            the PCB
+
         Returns:
             A float representing the measured pressure
 
@@ -61,8 +59,7 @@ class PneumaticValve:
             PCB
         """
         try:
-            return self.__compute_pressure(
-                self.pcb.get_raw_pressures()[self.sensor_index])
+            return float(self.pcb.get_pressures(max_age)[self.sensor_index])
         except PssPCBError as error:
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
@@ -125,7 +122,7 @@ class PneumaticValve:
             PCB
         """
         try:
-            return (self.pcb.check_homing_done() >> self.stepper_index) % 2 == 1
+            return self.pcb.get_stepper_status().is_homed(self.stepper_index)
         except PssPCBError as error:
             logger.error(str(error))
             raise InternalServerError(str(error)) from error
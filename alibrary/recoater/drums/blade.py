@@ -1,6 +1,7 @@
 """Module describing a scraping blade screw"""
 from dataclasses import dataclass
 
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.pcb.command import PCBScrewMotionCommand
 from alibrary.motions.pcb.motor import PCBScrewMotor
 
@@ -39,15 +40,25 @@ class Screw:
         """
         return self.motor.get_command()
 
-    def start_motion(self, command: PCBScrewMotionCommand):
+    def start_motion(self,
+                     command: PCBScrewMotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
+        Args:
+            command: The PCBScrewMotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
-        self.motor.start(command)
+        return self.motor.start(command, track)
 
     def stop_motion(self):
         """Stops any running motion on this motor.
@@ -72,21 +83,30 @@ class Blade(list[Screw]):
         """
         return [screw.get_info() for screw in self]
 
-    def start_motion(self, command: PCBScrewMotionCommand):
+    def start_motion(self,
+                     command: PCBScrewMotionCommand,
+                     track: bool = False) -> list[MotionHandle] | None:
         """Starts a blade motion.
 
-        This will executes the given command on this blade's both screws.
+        This will executes the given command on this blade's both screws. The
+        screws are checked and started together, in one exchange with the PCB
+        each.
 
         Args:
             command: A PssPCBMotionCommand representing the motion to execute
+            track: If True, the MotionHandle of each screw is returned
+
+        Returns:
+            The list of the screws MotionHandle if the motion is tracked, None
+            otherwise
 
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             MotorBusyError: The motor is busy with another motion
         """
-        for screw in self:
-            screw.motor.start(command)
+        return PCBScrewMotor.start_all([screw.motor for screw in self],
+                                       command, track)
 
     def stop_motion(self):
         """Stops a blade motion.
@@ -2,6 +2,7 @@
 blade.
 """
 from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.recoater.drums.blade import Blade
 from alibrary.recoater.drums.interface import DrumInterface
 from alibrary.recoater.drums.decorators.decorator import DrumDecorator
@@ -20,7 +21,9 @@ class BladeDecorator(DrumDecorator):
         """The blade added to this decorated drum."""
         return self._blade
 
-    def start_motion(self, command: MotionCommand):
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
         This override first checks if the blade is above a given threshold
@@ -33,4 +36,4 @@ class BladeDecorator(DrumDecorator):
         """
         if not self.blade.is_above_threshold():
             raise ConflictError("Scraping blade to low to start a drum motion")
-        return super().start_motion(command)
+        return super().start_motion(command, track)
@@ -3,6 +3,7 @@ import numpy as np
 
 from alibrary.recoater.drums.interface import DrumInterface
 from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.abstract.motor import Motor
 
 class DrumDecorator(DrumInterface):
@@ -146,15 +147,25 @@ class DrumDecorator(DrumInterface):
         """
         return self._drum.get_motion_command()
 
-    def start_motion(self, command: MotionCommand):
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
-        self._drum.start_motion(command)
+        return self._drum.start_motion(command, track)
 
     def stop_motion(self):
         """Stops any running motion on this motor.
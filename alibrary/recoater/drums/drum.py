@@ -7,6 +7,7 @@ from pycli.models import CLI
 from alibrary.electronics import ControllinoError, Controllino
 from alibrary.logger import logger
 from alibrary.motions.abstract.command import MotionCommand, MotionType
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.abstract.motor import Motor
 from alibrary.pneumatic.valve import PneumaticValve
 from alibrary.server import BadRequestError, InternalServerError
@@ -218,22 +219,34 @@ class Drum(DrumInterface):
         """
         return self._motor.get_command()
 
-    def start_motion(self, command: MotionCommand):
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
             ConflictError: The motor is busy with another motion
         """
+        # The motor is read once for the whole admission
+        snapshot = self._motor.get_snapshot()
+
         if command.motion_type == MotionType.TURNS:
             command.motion_type = MotionType.RELATIVE
             command.distance = command.turns * self._config.circumference
         if command.motion_type == MotionType.ABSOLUTE:
-            crt_pos = self._motor.get_position()
-            if command.distance < crt_pos:
+            if command.distance < snapshot.position:
                 command.distance += self._config.circumference
-        self._motor.start(command)
+        return self._motor.start(command, track, snapshot=snapshot)
 
     def stop_motion(self):
         """Stops any running motion on this motor.
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 import numpy as np
 from alibrary.electronics.controllino import Controllino
 from alibrary.motions.abstract.command import MotionCommand
+from alibrary.motions.abstract.completion import MotionHandle
 from alibrary.motions.abstract.motor import Motor
 from alibrary.pneumatic.valve import PneumaticValve
 from alibrary.recoater.drums.config import DrumConfig
@@ -133,9 +134,19 @@ class DrumInterface(ABC):
         """
 
     @abstractmethod
-    def start_motion(self, command: MotionCommand):
+    def start_motion(self,
+                     command: MotionCommand,
+                     track: bool = False) -> MotionHandle | None:
         """Starts a motion following the given motion command.
 
+        Args:
+            command: The MotionCommand to perform
+            track: If True, a MotionHandle resolved at the end of the motion
+            is returned
+
+        Returns:
+            A MotionHandle if the motion is tracked, None otherwise
+
         Raises:
             InternalServerError: An error occurs in the process
             BadRequestError: The given command is not valid
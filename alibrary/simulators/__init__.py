@@ -0,0 +1,16 @@
+"""Modules defining local simulators of the electronics hardware.
+
+They serve the same protocols as the real devices on a local port, so that
+the drivers of alibrary can be benchmarked and regression-tested without the
+machine.
+"""
+
+from alibrary.simulators.nanotec import NanotecDriverModel, NanotecSimulator
+from alibrary.simulators.pcb import PssPCBModel, PssPCBSimulator
+
+__all__ = [
+    "NanotecDriverModel",
+    "NanotecSimulator",
+    "PssPCBModel",
+    "PssPCBSimulator",
+]
@@ -0,0 +1,931 @@
+"""Module defining a local simulator of a Nanotec driver.
+
+The simulator serves the Modbus TCP registers used by NanotecStepper and
+NanotecBldc on a local port. Behind the registers, a NanotecDriverModel
+implements the CiA402 state machine of NanotecDriverState and simple
+trapezoidal kinematics for the profile position (1), velocity (3) and homing
+(6) modes. The profile position mode buffers one set-point behind the running
+motion, as the real driver does without the change set immediately bit.
+
+The Nanotec registers hold 32 bits objects addressed by their first register.
+Some objects overlap, e.g. the status word (5000) and the operation mode
+display (5001). A read or a write of two registers therefore accesses the
+object at the given address, as the real driver does from the point of view
+of ModbusComponent.read_registers and write_registers.
+
+The Process Data Interface (PDI) blocks of NanotecPdiMotor are addressed by
+16 bits register instead: the set-values and command code (5996 to 5999) and
+the status block (4996 to 4999). As the real driver, the model executes a PDI
+command when its code changes, and the 32 bits values are sent high word
+first.
+
+Typical usage example:
+
+with NanotecSimulator(port=5020, latency=0.002) as simulator:
+    motor = NanotecStepper(config, "127.0.0.1", port=simulator.port)
+    motor.start(command)
+
+It can also be started from the command line:
+
+python -m alibrary.simulators.nanotec --port 5020 --latency 0.002
+"""
+import argparse
+import asyncio
+import math
+import random
+import struct
+import threading
+import time
+from collections import Counter
+from collections.abc import Sequence
+
+from alibrary.logger import logger
+from alibrary.motions.nanotec.pdi.motor import (NanotecPdiCommand,
+                                                NanotecPdiStatus)
+from alibrary.motions.nanotec.state import NanotecDriverState
+
+# Acceleration used when a set-point acceleration is zero [µm/s²]
+INSTANT_ACCELERATION = 1e12
+
+# Base status word of each simulated state, with the quick stop bit (5) set
+# when the quick stop is not active
+STATUS_WORDS = {
+    NanotecDriverState.SWITCH_ON_DISABLED: 0x40,
+    NanotecDriverState.READY_TO_SWITCH_ON: 0x21,
+    NanotecDriverState.SWITCHED_ON: 0x23,
+    NanotecDriverState.OPERATION_ENABLED: 0x27,
+    NanotecDriverState.QUICK_STOP_ACTIVE: 0x07,
+    NanotecDriverState.FAULT_REACTION_ACTIVE: 0x0F,
+    NanotecDriverState.FAULT: 0x08,
+}
+
+# Modbus TCP header: transaction id, protocol id, length, unit id
+MBAP = struct.Struct(">HHHB")
+
+# Supported Modbus function codes
+READ_HOLDING_REGISTERS = 3
+READ_INPUT_REGISTERS = 4
+WRITE_REGISTER = 6
+WRITE_REGISTERS = 16
+READWRITE_REGISTERS = 23
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_VALUE = 3
+
+# Maximum number of registers read in one request
+MAX_READ_COUNT = 125
+
+
+class _VelocityRamp:
+    """Motion reaching a target velocity with a constant acceleration."""
+
+    def __init__(self, position: float, velocity: float, target: float,
+                 acceleration: float) -> None:
+        self.position = position
+        self.velocity = velocity
+        self.target = target
+        self.acceleration = math.copysign(acceleration, target - velocity)
+        self.duration = (target - velocity) / self.acceleration if (
+            target != velocity) else 0.0
+
+    def sample(self, elapsed: float) -> tuple[float, float, bool]:
+        """Returns the position, the velocity and the end of motion flag."""
+        if elapsed < self.duration:
+            return (self.position + self.velocity * elapsed +
+                    self.acceleration * elapsed**2 / 2,
+                    self.velocity + self.acceleration * elapsed, False)
+
+        ramp = (self.velocity + self.target) * self.duration / 2
+        return (self.position + ramp + self.target *
+                (elapsed - self.duration), self.target, self.target == 0)
+
+
+class _PositionProfile:
+    """Trapezoidal motion to a target position.
+
+    It starts with the current velocity and ends with `end_speed`, which is
+    zero unless the next set-point is blended in the motion.
+    """
+
+    def __init__(self,
+                 position: float,
+                 target: float,
+                 speed: float,
+                 acceleration: float,
+                 deceleration: float,
+                 velocity: float = 0.0,
+                 end_speed: float = 0.0) -> None:
+        self.position = position
+        self.target = target
+        self.direction = 1 if target >= position else -1
+        self.acceleration = acceleration
+        self.deceleration = deceleration
+
+        distance = abs(target - position)
+        if distance == 0 or speed <= 0:
+            self.target = position
+            self.speed = 0.0
+            self.start_speed = 0.0
+            self.end_speed = 0.0
+            self.times = (0.0, 0.0, 0.0)
+            return
+
+        # Only a velocity towards the target is carried over
+        start_speed = min(max(self.direction * velocity, 0.0), speed)
+        end_speed = min(end_speed, speed)
+
+        ramps = ((speed**2 - start_speed**2) / (2 * acceleration) +
+                 (speed**2 - end_speed**2) / (2 * deceleration))
+        if ramps > distance:
+            speed = math.sqrt(
+                (2 * distance * acceleration * deceleration +
+                 start_speed**2 * deceleration + end_speed**2 * acceleration) /
+                (acceleration + deceleration))
+            speed = max(speed, start_speed, end_speed)
+            ramps = distance
+
+        self.speed = speed
+        self.start_speed = start_speed
+        self.end_speed = end_speed
+        acceleration_time = (speed - start_speed) / acceleration
+        cruise_time = (distance - ramps) / speed
+        self.times = (acceleration_time, acceleration_time + cruise_time,
+                      acceleration_time + cruise_time +
+                      (speed - end_speed) / deceleration)
+
+    @property
+    def duration(self) -> float:
+        """Returns the duration of the motion [s]."""
+        return self.times[2]
+
+    def sample(self, elapsed: float) -> tuple[float, float, bool]:
+        """Returns the position, the velocity and the end of motion flag."""
+        acceleration_end, cruise_end, end = self.times
+        if elapsed >= end:
+            return self.target, self.direction * self.end_speed, True
+
+        if elapsed < acceleration_end:
+            distance = (self.start_speed * elapsed +
+                        self.acceleration * elapsed**2 / 2)
+            velocity = self.start_speed + self.acceleration * elapsed
+        elif elapsed < cruise_end:
+            distance = ((self.start_speed + self.speed) * acceleration_end / 2 +
+                        self.speed * (elapsed - acceleration_end))
+            velocity = self.speed
+        else:
+            remaining = end - elapsed
+            distance = (abs(self.target - self.position) -
+                        self.end_speed * remaining -
+                        self.deceleration * remaining**2 / 2)
+            velocity = self.end_speed + self.deceleration * remaining
+
+        return (self.position + self.direction * distance,
+                self.direction * velocity, False)
+
+
+class NanotecDriverModel:
+    """Simulated Nanotec driver, addressed by 32 bits objects.
+
+    Positions are in µm, speeds in µm/s and accelerations in µm/s², as in the
+    registers of the real driver. The home switch is at the raw position 0 and
+    the drum seam sensor is triggered every `seam_period` µm, over
+    `seam_width` µm. The PDI speed set-value is in µm/s as well.
+
+    Attributes:
+        state: The current NanotecDriverState
+        operation_mode: The current mode of operation
+        control_word: The last written control word
+        homed: A flag indicating if a homing has been done
+        error_code: The code of the last injected fault
+        objects: The values of the objects without simulated behaviour
+        pdi_setvalues: The registers of the PDI set-values block
+        pdi_commands: The PDI command codes executed, in order
+    """
+    # Statusword (6041) and Modes of Operation Display (6061)
+    STATUS_WORD_ADDRESS = 5000
+    OPERATION_MODE_READ_ADDRESS = 5001
+
+    # Controlword (6040) and Modes of Operation (6060)
+    CONTROL_WORD_ADDRESS = 6000
+    OPERATION_MODE_WRITE_ADDRESS = 6001
+
+    # Information out registers
+    ACTUAL_POSITION_ADDRESS = 2008
+    ACTUAL_SPEED_ADDRESS = 2010
+    SENSOR_ADDRESS = 2012
+    READ_INFORMATION_ADDRESS = 2014
+
+    # Information in registers
+    TARGET_POSITION_ADDRESS = 3006
+    TARGET_SPEED_ADDRESS = 3008
+    TARGET_ACCELERATION_ADDRESS = 3010
+    TARGET_DECELERATION_ADDRESS = 3012
+    SEARCH_ZERO_SPEED_ADDRESS = 3016
+
+    # PDI set-values block: SetValue1 (32 bits), SetValue2 (16 bits),
+    # SetValue3 in the high byte and the command code in the low byte of the
+    # last register
+    PDI_SETVALUE_ADDRESS = 5996
+    # PDI status block: status, error code and return value (32 bits)
+    PDI_STATUS_ADDRESS = 4996
+    # Number of registers of each PDI block
+    PDI_BLOCK_SIZE = 4
+
+    # Modes of operation
+    PROFILE_POSITION_MODE = 1
+    VELOCITY_MODE = 3
+    HOMING_MODE = 6
+
+    def __init__(self,
+                 position: float = 0.0,
+                 homed: bool = False,
+                 seam_period: float = 100000.0,
+                 seam_width: float = 1000.0) -> None:
+        self.seam_period = seam_period
+        self.seam_width = seam_width
+
+        self.state = NanotecDriverState.SWITCH_ON_DISABLED
+        self.operation_mode = 0
+        self.control_word = 0
+        self.homed = homed
+        self.error_code = 0
+        self.objects: dict[int, int] = {}
+        self.pdi_setvalues = [0] * self.PDI_BLOCK_SIZE
+        self.pdi_commands: list[int] = []
+
+        self.__lock = threading.Lock()
+        self.__position = position
+        self.__velocity = 0.0
+        self.__origin = 0.0
+        self.__profile: _VelocityRamp | _PositionProfile | None = None
+        self.__profile_start = 0.0
+        self.__homing = False
+        self.__acknowledged = False
+        # Buffered set-point: target, speed, acceleration and deceleration
+        self.__buffer: tuple[float, float, float, float] | None = None
+
+    @property
+    def position(self) -> float:
+        """Returns the current position relatively to the homing origin."""
+        with self.__lock:
+            self.__update()
+            return self.__position - self.__origin
+
+    @property
+    def velocity(self) -> float:
+        """Returns the current velocity."""
+        with self.__lock:
+            self.__update()
+            return self.__velocity
+
+    def read(self, address: int) -> int:
+        """Returns the value of the object at the given address.
+
+        Args:
+            address: The Modbus address of the object
+
+        Returns:
+            The value of the object, as an integer
+        """
+        with self.__lock:
+            self.__update()
+
+            if address == self.STATUS_WORD_ADDRESS:
+                return self.__get_status_word()
+            if address == self.OPERATION_MODE_READ_ADDRESS:
+                return self.operation_mode
+            if address == self.ACTUAL_POSITION_ADDRESS:
+                return round(self.__position - self.__origin)
+            if address == self.ACTUAL_SPEED_ADDRESS:
+                return round(self.__velocity)
+            if address == self.SENSOR_ADDRESS:
+                return int(self.__is_sensor_triggered())
+            if address == self.READ_INFORMATION_ADDRESS:
+                return (self.__profile is not None) | self.homed << 1
+            if address == self.CONTROL_WORD_ADDRESS:
+                return self.control_word
+            if address == self.OPERATION_MODE_WRITE_ADDRESS:
+                return self.operation_mode
+            return self.objects.get(address, 0)
+
+    def write(self, address: int, value: int):
+        """Writes the object at the given address and applies its effects.
+
+        Args:
+            address: The Modbus address of the object
+            value: The value to write
+        """
+        with self.__lock:
+            self.__update()
+
+            if address == self.CONTROL_WORD_ADDRESS:
+                self.__write_control_word(value)
+            elif address == self.OPERATION_MODE_WRITE_ADDRESS:
+                self.operation_mode = value
+                self.__follow_target_velocity()
+            else:
+                self.objects[address] = value
+                if address in (self.TARGET_SPEED_ADDRESS,
+                               self.TARGET_ACCELERATION_ADDRESS):
+                    self.__follow_target_velocity()
+
+    def is_pdi_block(self, address: int, count: int) -> bool:
+        """Checks if the given registers all belong to a PDI block."""
+        return any(start <= address and
+                   address + count <= start + self.PDI_BLOCK_SIZE
+                   for start in (self.PDI_SETVALUE_ADDRESS,
+                                 self.PDI_STATUS_ADDRESS))
+
+    def read_pdi(self, address: int, count: int) -> list[int]:
+        """Returns the values of registers of a PDI block.
+
+        The return value of the status block is the actual position.
+
+        Args:
+            address: The Modbus address of the first register
+            count: The number of registers
+
+        Returns:
+            The list of the raw 16 bits values of the registers
+        """
+        with self.__lock:
+            self.__update()
+
+            if address >= self.PDI_SETVALUE_ADDRESS:
+                start, registers = self.PDI_SETVALUE_ADDRESS, self.pdi_setvalues
+            else:
+                position = round(self.__position - self.__origin)
+                start = self.PDI_STATUS_ADDRESS
+                registers = [
+                    self.__get_pdi_status(), self.error_code & 0xFFFF,
+                    *struct.unpack(">2H", struct.pack(">i", position))
+                ]
+
+            offset = address - start
+            return registers[offset:offset + count]
+
+    def write_pdi(self, address: int, values: Sequence[int]):
+        """Writes registers of the PDI set-values block.
+
+        The command code is executed if it differs from the previous one. The
+        status block is read-only, a write to it is ignored.
+
+        Args:
+            address: The Modbus address of the first register
+            values: The raw 16 bits values to write
+        """
+        if address < self.PDI_SETVALUE_ADDRESS:
+            return
+
+        with self.__lock:
+            self.__update()
+
+            previous = self.pdi_setvalues[3] & 0xFF
+            offset = address - self.PDI_SETVALUE_ADDRESS
+            self.pdi_setvalues[offset:offset + len(values)] = values
+            command = self.pdi_setvalues[3] & 0xFF
+            if command != previous:
+                self.__execute_pdi_command(command)
+
+    def inject_fault(self, error_code: int = 0x1000):
+        """Puts the driver in FAULT state, as after a hardware error.
+
+        The running motion is stopped with the deceleration set-point.
+
+        Args:
+            error_code: The error code reported by the driver
+        """
+        with self.__lock:
+            self.__update()
+            self.error_code = error_code
+            self.state = NanotecDriverState.FAULT
+            self.__decelerate()
+
+    def __update(self):
+        """Moves the motor along the running motions up to now.
+
+        When a position motion ends, the buffered set-point is started at the
+        end time of the motion.
+        """
+        now = time.monotonic()
+        while self.__profile is not None:
+            position, velocity, done = self.__profile.sample(
+                now - self.__profile_start)
+            self.__position = position
+            self.__velocity = velocity
+
+            if not done:
+                return
+
+            end = self.__profile_start + self.__profile.duration
+            self.__profile = None
+            if self.__homing:
+                self.__homing = False
+                self.__origin = self.__position
+                self.homed = True
+
+            if self.__buffer is None:
+                self.__velocity = 0.0
+            else:
+                self.__start(
+                    _PositionProfile(self.__position,
+                                     *self.__buffer,
+                                     velocity=self.__velocity))
+                self.__profile_start = end
+                self.__buffer = None
+                if not self.control_word & 0x10:
+                    self.__acknowledged = False
+
+    def __start(self, profile: _VelocityRamp | _PositionProfile):
+        """Replaces the running motion by the given one."""
+        self.__profile = profile
+        self.__profile_start = time.monotonic()
+        self.__homing = False
+
+    def __get_acceleration(self, address: int) -> float:
+        """Returns the acceleration stored at the given address."""
+        return float(self.objects.get(address, 0)) or INSTANT_ACCELERATION
+
+    def __get_status_word(self) -> int:
+        """Builds the status word from the state and the running motion."""
+        status_word = STATUS_WORDS.get(self.state, 0)
+
+        if self.__profile is None:
+            status_word |= 1 << 10
+
+        if self.operation_mode == self.PROFILE_POSITION_MODE:
+            status_word |= self.__acknowledged << 12
+        elif self.operation_mode == self.VELOCITY_MODE:
+            status_word |= (self.__velocity == 0) << 12
+        elif self.operation_mode == self.HOMING_MODE:
+            status_word |= (self.homed and not self.__homing) << 12
+
+        return status_word
+
+    def __get_pdi_status(self) -> int:
+        """Builds the PDI status register from the state and the motion."""
+        status = NanotecPdiStatus(0)
+        if self.state == NanotecDriverState.OPERATION_ENABLED:
+            status |= NanotecPdiStatus.VOLTAGE_ENABLED
+        if self.state == NanotecDriverState.FAULT:
+            status |= NanotecPdiStatus.FAULT
+        if self.__profile is None:
+            status |= NanotecPdiStatus.TARGET_REACHED
+        return status
+
+    def __execute_pdi_command(self, command: int):
+        """Executes a PDI command with the current set-values.
+
+        A motion enables the power stage in profile position mode, unless the
+        driver is in FAULT state.
+        """
+        self.pdi_commands.append(command)
+
+        if command == NanotecPdiCommand.SWITCH_OFF:
+            if self.state != NanotecDriverState.FAULT:
+                self.state = NanotecDriverState.SWITCH_ON_DISABLED
+            # The motor coasts without holding torque
+            self.__buffer = None
+            self.__profile = None
+            self.__velocity = 0.0
+        elif command == NanotecPdiCommand.CLEAR_ERROR:
+            if self.state == NanotecDriverState.FAULT:
+                self.state = NanotecDriverState.SWITCH_ON_DISABLED
+                self.error_code = 0
+        elif command == NanotecPdiCommand.QUICK_STOP:
+            if self.state == NanotecDriverState.OPERATION_ENABLED:
+                self.__decelerate()
+        elif command in (NanotecPdiCommand.MOVE_ABSOLUTE,
+                         NanotecPdiCommand.MOVE_RELATIVE):
+            if self.state == NanotecDriverState.FAULT:
+                return
+
+            target = struct.unpack(
+                ">i", struct.pack(">2H", *self.pdi_setvalues[:2]))[0]
+            if command == NanotecPdiCommand.MOVE_RELATIVE:
+                target += self.__position - self.__origin
+            self.state = NanotecDriverState.OPERATION_ENABLED
+            self.operation_mode = self.PROFILE_POSITION_MODE
+            self.__buffer = None
+            self.__start(
+                _PositionProfile(
+                    self.__position, target + self.__origin,
+                    self.pdi_setvalues[2],
+                    self.__get_acceleration(self.TARGET_ACCELERATION_ADDRESS),
+                    self.__get_acceleration(self.TARGET_DECELERATION_ADDRESS),
+                    velocity=self.__velocity))
+
+    def __is_sensor_triggered(self) -> bool:
+        """Checks if the drum seam is in front of the sensor."""
+        if self.seam_period <= 0:
+            return False
+        return self.__position % self.seam_period < self.seam_width
+
+    def __decelerate(self):
+        """Brings the motor to rest with the deceleration set-point.
+
+        The buffered set-point is discarded.
+        """
+        self.__buffer = None
+        if not self.control_word & 0x10:
+            self.__acknowledged = False
+        if self.__velocity == 0:
+            self.__profile = None
+            self.__homing = False
+        else:
+            self.__start(
+                _VelocityRamp(
+                    self.__position, self.__velocity, 0,
+                    self.__get_acceleration(self.TARGET_DECELERATION_ADDRESS)))
+
+    def __follow_target_velocity(self):
+        """Ramps to the target velocity if the velocity mode is running."""
+        if (self.state != NanotecDriverState.OPERATION_ENABLED or
+                self.operation_mode != self.VELOCITY_MODE or
+                self.control_word & 0x100):
+            return
+
+        self.__start(
+            _VelocityRamp(
+                self.__position, self.__velocity,
+                self.objects.get(self.TARGET_SPEED_ADDRESS, 0),
+                self.__get_acceleration(self.TARGET_ACCELERATION_ADDRESS)))
+
+    def __write_control_word(self, value: int):
+        """Applies a control word to the state machine and the motion."""
+        rising = value & ~self.control_word
+        falling = self.control_word & ~value
+        self.control_word = value
+
+        previous_state = self.state
+        self.__apply_state_transition(value, rising)
+
+        if self.state != NanotecDriverState.OPERATION_ENABLED:
+            if previous_state == NanotecDriverState.OPERATION_ENABLED:
+                self.__decelerate()
+            if (rising & 0x10 and self.operation_mode == self.HOMING_MODE and
+                    self.state == NanotecDriverState.SWITCHED_ON):
+                # Homing on the current position
+                self.__origin = self.__position
+                self.homed = True
+            return
+
+        if falling & 0x10:
+            # Acknowledged until the buffered set-point is started
+            self.__acknowledged = self.__buffer is not None
+
+        if rising & 0x100:
+            self.__decelerate()
+        elif value & 0x100:
+            return
+        elif self.operation_mode == self.VELOCITY_MODE:
+            self.__follow_target_velocity()
+        elif (self.operation_mode == self.PROFILE_POSITION_MODE and
+              rising & 0x10):
+            self.__accept_setpoint(value)
+        elif self.operation_mode == self.HOMING_MODE and rising & 0x10:
+            speed = (self.objects.get(self.SEARCH_ZERO_SPEED_ADDRESS) or
+                     self.objects.get(self.TARGET_SPEED_ADDRESS, 0))
+            self.__start(
+                _PositionProfile(
+                    self.__position, 0, speed,
+                    self.__get_acceleration(self.TARGET_ACCELERATION_ADDRESS),
+                    self.__get_acceleration(self.TARGET_ACCELERATION_ADDRESS)))
+            self.__homing = True
+
+    def __accept_setpoint(self, value: int):
+        """Applies a new set-point of the profile position mode.
+
+        With the change set immediately bit (5), or when no position motion
+        is running, the set-point replaces the running motion. Otherwise it is
+        buffered until the end of the running motion, unless the buffer is
+        already full. With the change on set-point bit (9), the running motion
+        then keeps its speed through its target instead of stopping there.
+        """
+        running = isinstance(self.__profile, _PositionProfile)
+        immediate = value & 0x20 or not running
+        if not immediate and self.__buffer is not None:
+            # Buffer full, the set-point is not acknowledged
+            return
+
+        target = self.objects.get(self.TARGET_POSITION_ADDRESS, 0)
+        if value & 0x40:
+            # Relative to the current position or to the running target
+            target += (self.__position
+                       if immediate else self.__profile.target) - self.__origin
+        setpoint = (target + self.__origin,
+                    self.objects.get(self.TARGET_SPEED_ADDRESS, 0),
+                    self.__get_acceleration(self.TARGET_ACCELERATION_ADDRESS),
+                    self.__get_acceleration(self.TARGET_DECELERATION_ADDRESS))
+        self.__acknowledged = True
+
+        if immediate:
+            self.__buffer = None
+            self.__start(
+                _PositionProfile(self.__position,
+                                 *setpoint,
+                                 velocity=self.__velocity))
+            return
+
+        self.__buffer = setpoint
+        profile = self.__profile
+        continues = (setpoint[0] - profile.target) * profile.direction > 0
+        if value & 0x200 and continues:
+            self.__start(
+                _PositionProfile(self.__position,
+                                 profile.target,
+                                 profile.speed,
+                                 profile.acceleration,
+                                 profile.deceleration,
+                                 velocity=self.__velocity,
+                                 end_speed=setpoint[1]))
+
+    def __apply_state_transition(self, value: int, rising: int):
+        """Applies the CiA402 device control command of a control word."""
+        state = self.state
+
+        if state == NanotecDriverState.FAULT:
+            if rising & 0x80:
+                self.state = NanotecDriverState.SWITCH_ON_DISABLED
+                self.error_code = 0
+            return
+
+        if not value & 0x02:
+            # Disable voltage
+            self.state = NanotecDriverState.SWITCH_ON_DISABLED
+        elif not value & 0x04:
+            # Quick stop
+            if state == NanotecDriverState.OPERATION_ENABLED:
+                self.state = NanotecDriverState.QUICK_STOP_ACTIVE
+            else:
+                self.state = NanotecDriverState.SWITCH_ON_DISABLED
+        elif not value & 0x01:
+            # Shutdown
+            if state != NanotecDriverState.QUICK_STOP_ACTIVE:
+                self.state = NanotecDriverState.READY_TO_SWITCH_ON
+        elif not value & 0x08:
+            # Switch on or disable operation
+            if state in (NanotecDriverState.READY_TO_SWITCH_ON,
+                         NanotecDriverState.OPERATION_ENABLED):
+                self.state = NanotecDriverState.SWITCHED_ON
+        elif state in (NanotecDriverState.READY_TO_SWITCH_ON,
+                       NanotecDriverState.SWITCHED_ON,
+                       NanotecDriverState.QUICK_STOP_ACTIVE):
+            # Enable operation
+            self.state = NanotecDriverState.OPERATION_ENABLED
+
+
+class NanotecSimulator:
+    """Modbus TCP server exposing a NanotecDriverModel on a local port.
+
+    The server runs in a background thread with its own event loop. The
+    requests of a connection are applied to the model in their order of
+    arrival. Each response is then delayed by `latency` seconds plus a random
+    jitter, to mimic the round trip time of the real driver. Pipelined
+    requests are therefore answered concurrently, possibly out of order.
+
+    Attributes:
+        model: The simulated NanotecDriverModel
+        host: The address the server listens on
+        port: The port the server listens on, assigned by the system if 0
+        latency: The fixed delay added to every response [s]
+        jitter: The maximum random delay added to every response [s]
+        requests: The number of served requests, by function code
+    """
+
+    def __init__(self,
+                 model: NanotecDriverModel | None = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0) -> None:
+        self.model = model if model is not None else NanotecDriverModel()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.requests: Counter[int] = Counter()
+
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__server: asyncio.Server | None = None
+        self.__thread: threading.Thread | None = None
+        self.__writers: set[asyncio.StreamWriter] = set()
+
+    def __enter__(self) -> "NanotecSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def start(self):
+        """Starts serving in a background thread.
+
+        It returns once the server is listening.
+
+        Raises:
+            OSError: The server could not listen on the given address
+        """
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever,
+                                         name=f"nanotec simulator {self.port}",
+                                         daemon=True)
+        self.__thread.start()
+        asyncio.run_coroutine_threadsafe(self.__serve(), self.__loop).result()
+
+        logger.info("(Nanotec simulator) Listening on %s:%d", self.host,
+                    self.port)
+
+    def stop(self):
+        """Stops the server, closes the connections and stops the thread."""
+        if self.__loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.__shutdown(),
+                                         self.__loop).result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+        self.__loop = None
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the served requests.
+
+        Returns:
+            A JSON object with the number of requests by function code
+        """
+        return {
+            "requests": sum(self.requests.values()),
+            "by_function_code": {
+                f"FC{code}": count for code, count in self.requests.items()
+            },
+        }
+
+    async def __serve(self):
+        """Starts listening for Modbus TCP connections."""
+        self.__server = await asyncio.start_server(self.__handle_connection,
+                                                   self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+    async def __shutdown(self):
+        """Stops listening and closes the open connections."""
+        self.__server.close()
+        for writer in list(self.__writers):
+            writer.close()
+        await self.__server.wait_closed()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader,
+                                  writer: asyncio.StreamWriter):
+        """Serves the requests of one connection until it is closed."""
+        self.__writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(MBAP.size)
+                transaction_id, _, length, unit = MBAP.unpack(header)
+                request = await reader.readexactly(length - 1)
+
+                self.requests[request[0]] += 1
+                response = self.__process(request)
+                asyncio.create_task(
+                    self.__respond(writer, transaction_id, unit, response))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.__writers.discard(writer)
+            writer.close()
+
+    async def __respond(self, writer: asyncio.StreamWriter,
+                        transaction_id: int, unit: int, response: bytes):
+        """Sends a response after the simulated latency."""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if not writer.is_closing():
+            writer.write(
+                MBAP.pack(transaction_id, 0,
+                          len(response) + 1, unit) + response)
+
+    def __process(self, request: bytes) -> bytes:
+        """Applies a request to the model and builds its response.
+
+        Args:
+            request: The function code followed by the request data
+
+        Returns:
+            The function code followed by the response data, or an exception
+            response
+        """
+        function_code = request[0]
+        try:
+            if function_code in (READ_HOLDING_REGISTERS,
+                                 READ_INPUT_REGISTERS):
+                address, count = struct.unpack_from(">HH", request, 1)
+                return self.__read_response(function_code, address, count)
+
+            if function_code == WRITE_REGISTER:
+                address, value = struct.unpack_from(">HH", request, 1)
+                self.__write(address, (value,))
+                return request
+
+            if function_code == WRITE_REGISTERS:
+                address, count = struct.unpack_from(">HH", request, 1)
+                self.__write(address,
+                             struct.unpack_from(f">{count}H", request, 6))
+                return request[:5]
+
+            if function_code == READWRITE_REGISTERS:
+                read_address, read_count, write_address, write_count = (
+                    struct.unpack_from(">HHHH", request, 1))
+                self.__write(
+                    write_address,
+                    struct.unpack_from(f">{write_count}H", request, 10))
+                return self.__read_response(function_code, read_address,
+                                            read_count)
+        except struct.error:
+            return bytes((function_code | 0x80, ILLEGAL_DATA_VALUE))
+
+        return bytes((function_code | 0x80, ILLEGAL_FUNCTION))
+
+    def __read_response(self, function_code: int, address: int,
+                        count: int) -> bytes:
+        """Reads registers from the model and builds the response.
+
+        A read of two registers or more at an object address returns the 32
+        bits objects starting there, a trailing single register returns the
+        low word of its object. A read inside a PDI block returns its
+        registers.
+        """
+        if not 0 < count <= MAX_READ_COUNT:
+            return bytes((function_code | 0x80, ILLEGAL_DATA_VALUE))
+
+        if self.model.is_pdi_block(address, count):
+            registers = self.model.read_pdi(address, count)
+        else:
+            registers = []
+            while len(registers) < count:
+                value = self.model.read(address + len(registers)) & 0xFFFFFFFF
+                if count - len(registers) >= 2:
+                    registers += (value >> 16, value & 0xFFFF)
+                else:
+                    registers.append(value & 0xFFFF)
+
+        return struct.pack(f">BB{count}H", function_code, 2 * count,
+                           *registers)
+
+    def __write(self, address: int, values: tuple[int, ...]):
+        """Writes registers to the model.
+
+        Pairs of registers are decoded as signed 32 bits objects, most
+        significant word first. A trailing single register is a 16 bits
+        object. A write inside a PDI block writes its registers.
+        """
+        if self.model.is_pdi_block(address, len(values)):
+            self.model.write_pdi(address, values)
+            return
+
+        offset = 0
+        while offset < len(values):
+            if len(values) - offset >= 2:
+                value = struct.unpack(
+                    ">i", struct.pack(">HH", *values[offset:offset + 2]))[0]
+                self.model.write(address + offset, value)
+                offset += 2
+            else:
+                self.model.write(address + offset, values[offset])
+                offset += 1
+
+
+def main():
+    """Runs a Nanotec simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--latency",
+                        type=float,
+                        default=0.0,
+                        help="delay added to every response [s]")
+    parser.add_argument("--jitter",
+                        type=float,
+                        default=0.0,
+                        help="maximum random delay added to every response "
+                        "[s]")
+    parser.add_argument("--homed",
+                        action="store_true",
+                        help="start with a homed motor")
+    args = parser.parse_args()
+
+    simulator = NanotecSimulator(NanotecDriverModel(homed=args.homed),
+                                 args.host, args.port, args.latency,
+                                 args.jitter)
+    simulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
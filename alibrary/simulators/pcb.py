@@ -0,0 +1,491 @@
+"""Module defining a local simulator of the pressure sensors and steppers PCB.
+
+The simulator serves the binary protocol of PssPCB on a local TCP port. The
+request frames are decoded with the same layouts as the ones PssPCB encodes,
+from COMMAND_STRUCTS. Behind the protocol, a PssPCBModel simulates:
+    - steppers moving at a constant step rate, with their busy and homing
+    bitmasks;
+    - pressure sensors following their regulation target with a first order
+    lag and a measurement noise.
+
+Each opcode can be given its own latency, and faults can be injected to test
+the recovery of the clients: a dropped connection, a reply that never comes
+or a reply cut in the middle. Like the PCB, the simulator can refuse any
+new connection while one is open.
+
+Typical usage example:
+
+with PssPCBSimulator(PssPCBModel(n_sensors=4), latency=0.001) as simulator:
+    pcb = PssPCB(4, simulator.host, simulator.port)
+    pcb.get_raw_pressures()
+
+It can also be started from the command line:
+
+python -m alibrary.simulators.pcb --port 5030 --sensors 4 --latency 0.001
+"""
+import argparse
+import asyncio
+import math
+import random
+import struct
+import threading
+import time
+from collections import Counter
+
+from alibrary.electronics.pcb import COMMAND_STRUCTS, PssPCBOpcode
+from alibrary.logger import logger
+
+# Raw measure of a sensor at the bottom of its range, 10% of the full scale
+IDLE_RAW_PRESSURE = 1638
+
+# Layout of the reply of each opcode with a reply
+REPLY_STRUCTS = {
+    PssPCBOpcode.CHECK_HOMING: struct.Struct(">H"),
+    PssPCBOpcode.CHECK_DRIVER_COMMUNICATION: struct.Struct(">BH"),
+    PssPCBOpcode.GET_ACTUAL_POSITION: struct.Struct(">i"),
+    PssPCBOpcode.CHECK_BUSY: struct.Struct(">H"),
+    PssPCBOpcode.CHECKED_DISTANCE_MOTION: struct.Struct(">Bi"),
+    PssPCBOpcode.CHECK_ACTUAL_POSITION: struct.Struct(">i"),
+}
+
+# Injectable faults: the connection is closed, the reply is never sent, or
+# only its first half is sent
+FAULT_MODES = ("drop", "stall", "partial")
+
+
+class PssPCBModel:
+    """Simulated PCB with its steppers and pressure sensors.
+
+    The positions are in microsteps. A stepper moves towards its target at
+    `step_rate` microsteps per second and a homing takes `homing_time`
+    seconds. A sensor regulated by a control follows the raw set-point of the
+    control with a time constant of `pressure_tau` seconds, and returns to
+    IDLE_RAW_PRESSURE when the control is stopped.
+
+    Attributes:
+        n_sensors: The number of pressure sensors
+        n_steppers: The number of steppers
+        step_rate: The speed of the steppers [microsteps/s]
+        homing_time: The duration of a homing [s]
+        pressure_tau: The time constant of the pressure regulation [s]
+        pressure_noise: The standard deviation of the raw measures noise
+        control_sensors: The sensor regulated by each control index, a
+        control regulates the sensor of the same index by default
+        parameters: The last value of the parameters without simulated
+        behaviour (gains, RMS currents, regulating valve), by name and index
+    """
+
+    def __init__(self,
+                 n_sensors: int = 8,
+                 n_steppers: int = 16,
+                 step_rate: float = 20000.0,
+                 homing_time: float = 0.5,
+                 pressure_tau: float = 0.2,
+                 pressure_noise: float = 2.0,
+                 control_sensors: dict[int, int] | None = None) -> None:
+        self.n_sensors = n_sensors
+        self.n_steppers = n_steppers
+        self.step_rate = step_rate
+        self.homing_time = homing_time
+        self.pressure_tau = pressure_tau
+        self.pressure_noise = pressure_noise
+        self.control_sensors = control_sensors or {}
+        self.parameters: dict[tuple[str, int], int] = {}
+
+        self.__lock = threading.Lock()
+        now = time.monotonic()
+        # Position, target and motion start of each stepper
+        self.__positions = [0.0] * n_steppers
+        self.__targets = [0.0] * n_steppers
+        self.__starts = [now] * n_steppers
+        self.__homing_ends = [0.0] * n_steppers
+        self.__homed = 0
+        # Initial value, target and start of the lag of each sensor
+        self.__pressures = [float(IDLE_RAW_PRESSURE)] * n_sensors
+        self.__pressure_targets = [float(IDLE_RAW_PRESSURE)] * n_sensors
+        self.__pressure_starts = [now] * n_sensors
+
+    def get_raw_pressures(self) -> list[int]:
+        """Returns the raw measure of every sensor."""
+        with self.__lock:
+            now = time.monotonic()
+            return [
+                min(max(round(self.__get_pressure(index, now) +
+                              random.gauss(0, self.pressure_noise)), 0),
+                    0xFFFF)
+                for index in range(self.n_sensors)
+            ]
+
+    def get_busy_mask(self) -> int:
+        """Returns the bitmask of the moving or homing steppers."""
+        with self.__lock:
+            now = time.monotonic()
+            return sum(1 << index
+                       for index in range(self.n_steppers)
+                       if self.__is_busy(index, now))
+
+    def get_homed_mask(self) -> int:
+        """Returns the bitmask of the homed steppers."""
+        with self.__lock:
+            now = time.monotonic()
+            return sum(1 << index
+                       for index in range(self.n_steppers)
+                       if self.__homed >> index & 1 and
+                       now >= self.__homing_ends[index])
+
+    def get_position(self, index: int) -> int:
+        """Returns the current position of a stepper [microsteps]."""
+        with self.__lock:
+            return round(self.__get_position(index, time.monotonic()))
+
+    def perform_homing(self, index: int):
+        """Starts the homing of a stepper, back to the position 0."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__positions[index] = 0.0
+            self.__targets[index] = 0.0
+            self.__homing_ends[index] = now + self.homing_time
+            self.__homed |= 1 << index
+
+    def move(self, index: int, target: int):
+        """Starts an absolute motion of a stepper [microsteps]."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__positions[index] = self.__get_position(index, now)
+            self.__targets[index] = float(target)
+            self.__starts[index] = max(now, self.__homing_ends[index])
+
+    def set_position(self, index: int, position: int):
+        """Sets the current position of a stopped stepper [microsteps]."""
+        with self.__lock:
+            self.__positions[index] = float(position)
+            self.__targets[index] = float(position)
+
+    def start_regulation(self, control_index: int, raw_pressure: int):
+        """Starts regulating the sensor of a control at a raw set-point."""
+        self.__set_pressure_target(control_index, raw_pressure)
+
+    def stop_regulation(self, control_index: int):
+        """Stops the regulation of the sensor of a control."""
+        self.__set_pressure_target(control_index, IDLE_RAW_PRESSURE)
+
+    def __set_pressure_target(self, control_index: int, raw_pressure: float):
+        """Starts the lag of the sensor of a control towards a new target."""
+        sensor = self.control_sensors.get(control_index, control_index)
+        if not 0 <= sensor < self.n_sensors:
+            return
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__pressures[sensor] = self.__get_pressure(sensor, now)
+            self.__pressure_targets[sensor] = float(raw_pressure)
+            self.__pressure_starts[sensor] = now
+
+    def __get_pressure(self, sensor: int, now: float) -> float:
+        """Returns the noiseless raw measure of a sensor at the given time."""
+        target = self.__pressure_targets[sensor]
+        elapsed = now - self.__pressure_starts[sensor]
+        return target + (self.__pressures[sensor] - target) * math.exp(
+            -elapsed / self.pressure_tau)
+
+    def __get_position(self, index: int, now: float) -> float:
+        """Returns the position of a stepper at the given time."""
+        position = self.__positions[index]
+        distance = self.__targets[index] - position
+        travel = max(0.0, now - self.__starts[index]) * self.step_rate
+        if travel >= abs(distance):
+            return self.__targets[index]
+        return position + math.copysign(travel, distance)
+
+    def __is_busy(self, index: int, now: float) -> bool:
+        """Checks if a stepper is homing or moving at the given time."""
+        return (now < self.__homing_ends[index] or
+                self.__get_position(index, now) != self.__targets[index])
+
+
+class PssPCBSimulator:
+    """TCP server exposing a PssPCBModel with the PssPCB protocol.
+
+    The server runs in a background thread with its own event loop. The
+    commands of a connection are answered in order, each one after the
+    latency of its opcode plus a random jitter. With `single_client`, the
+    server stops listening while a connection is open, as the TCP stack of
+    the PCB does, so a new connection is refused until the open one is
+    closed.
+
+    Attributes:
+        model: The simulated PssPCBModel
+        host: The address the server listens on
+        port: The port the server listens on, assigned by the system if 0
+        latency: The delay added to every reply [s]
+        jitter: The maximum random delay added to every reply [s]
+        latencies: The delay added to the replies of specific opcodes,
+        replacing `latency` [s]
+        single_client: A flag indicating if one connection at most is served
+        requests: The number of served commands, by opcode
+        faults: The number of injected faults triggered, by mode
+    """
+
+    def __init__(self,
+                 model: PssPCBModel | None = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 latencies: dict[int, float] | None = None,
+                 single_client: bool = False) -> None:
+        self.model = model if model is not None else PssPCBModel()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.latencies = dict(latencies or {})
+        self.single_client = single_client
+        self.requests: Counter[int] = Counter()
+        self.faults: Counter[str] = Counter()
+
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__server: asyncio.Server | None = None
+        self.__thread: threading.Thread | None = None
+        self.__writers: set[asyncio.StreamWriter] = set()
+        self.__stopping = False
+        self.__fault_lock = threading.Lock()
+        # Pending faults: opcode (None for any), mode and remaining count
+        self.__pending_faults: list[list] = []
+
+    def __enter__(self) -> "PssPCBSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def start(self):
+        """Starts serving in a background thread.
+
+        It returns once the server is listening.
+
+        Raises:
+            OSError: The server could not listen on the given address
+        """
+        self.__stopping = False
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever,
+                                         name=f"pcb simulator {self.port}",
+                                         daemon=True)
+        self.__thread.start()
+        asyncio.run_coroutine_threadsafe(self.__serve(), self.__loop).result()
+
+        logger.info("(PCB simulator) Listening on %s:%d", self.host,
+                    self.port)
+
+    def stop(self):
+        """Stops the server, closes the connections and stops the thread."""
+        if self.__loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.__shutdown(),
+                                         self.__loop).result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+        self.__loop = None
+
+    def inject_fault(self,
+                     mode: str,
+                     opcode: PssPCBOpcode | None = None,
+                     count: int = 1):
+        """Makes the next commands fail.
+
+        Args:
+            mode: The fault, "drop" to close the connection, "stall" to never
+            reply or "partial" to send only the first half of the reply
+            opcode: The opcode of the failing commands, None for any
+            count: The number of failing commands
+
+        Raises:
+            ValueError: The mode is unknown
+        """
+        if mode not in FAULT_MODES:
+            raise ValueError(f"Unknown fault mode {mode}, must be one of "
+                             f"{FAULT_MODES}")
+        with self.__fault_lock:
+            self.__pending_faults.append([opcode, mode, count])
+
+    def get_stats(self) -> dict[str,]:
+        """Returns a JSON representation of the served commands.
+
+        Returns:
+            A JSON object with the number of commands by opcode and the
+            number of triggered faults by mode
+        """
+        return {
+            "requests": sum(self.requests.values()),
+            "by_opcode": {
+                PssPCBOpcode(opcode).name.lower(): count
+                for opcode, count in self.requests.items()
+            },
+            "faults": dict(self.faults),
+        }
+
+    async def __serve(self):
+        """Starts listening for connections."""
+        self.__server = await asyncio.start_server(self.__handle_connection,
+                                                   self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+    async def __shutdown(self):
+        """Stops listening and closes the open connections."""
+        self.__stopping = True
+        self.__server.close()
+        for writer in list(self.__writers):
+            writer.close()
+        await self.__server.wait_closed()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader,
+                                  writer: asyncio.StreamWriter):
+        """Serves the commands of one connection until it is closed."""
+        if self.single_client:
+            if self.__writers:
+                # Accepted before the server stopped listening
+                writer.close()
+                return
+            self.__server.close()
+        self.__writers.add(writer)
+        try:
+            while True:
+                opcode = (await reader.readexactly(1))[0]
+                layout = COMMAND_STRUCTS.get(opcode)
+                if layout is None:
+                    logger.warning("(PCB simulator) Unknown opcode %d, "
+                                   "closing the connection", opcode)
+                    return
+
+                frame = bytes((opcode,)) + await reader.readexactly(
+                    layout.size - 1)
+                opcode = PssPCBOpcode(opcode)
+                self.requests[opcode] += 1
+                reply = self.__process(opcode, layout.unpack(frame)[1:])
+
+                delay = self.latencies.get(opcode, self.latency)
+                delay += random.uniform(0, self.jitter)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                fault = self.__take_fault(opcode)
+                if fault == "drop":
+                    return
+                if fault in ("stall", "partial"):
+                    # The connection stays silent until it is closed
+                    if fault == "partial":
+                        writer.write(reply[:len(reply) // 2])
+                    await reader.read()
+                    return
+                if reply:
+                    writer.write(reply)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.__writers.discard(writer)
+            writer.close()
+            if self.single_client and not self.__stopping:
+                await self.__serve()
+
+    def __take_fault(self, opcode: PssPCBOpcode) -> str | None:
+        """Returns the fault to apply to a command, if any."""
+        with self.__fault_lock:
+            for fault in self.__pending_faults:
+                if fault[0] is None or fault[0] == opcode:
+                    fault[2] -= 1
+                    if fault[2] == 0:
+                        self.__pending_faults.remove(fault)
+                    self.faults[fault[1]] += 1
+                    return fault[1]
+        return None
+
+    def __process(self, opcode: PssPCBOpcode, values: tuple) -> bytes:
+        """Applies a command to the model and builds its reply.
+
+        Args:
+            opcode: The PssPCBOpcode of the command
+            values: The decoded arguments of the command
+
+        Returns:
+            The reply frame, empty if the command has no reply
+        """
+        model = self.model
+        if opcode == PssPCBOpcode.GET_PRESSURES:
+            pressures = model.get_raw_pressures()
+            return struct.pack(f">{len(pressures)}H", *pressures)
+        if opcode == PssPCBOpcode.PERFORM_HOMING:
+            model.perform_homing(values[0])
+        elif opcode == PssPCBOpcode.DISTANCE_MOTION:
+            model.move(values[1], values[2])
+        elif opcode == PssPCBOpcode.SET_ACTUAL_POSITION:
+            model.set_position(*values)
+        elif opcode == PssPCBOpcode.START_PRESSURE_CONTROL:
+            model.start_regulation(*values)
+        elif opcode == PssPCBOpcode.STOP_PRESSURE_CONTROL:
+            model.stop_regulation(values[0])
+        elif opcode == PssPCBOpcode.CHECKED_DISTANCE_MOTION:
+            model.move(*values)
+        elif opcode in (PssPCBOpcode.SET_INTEGRAL_GAIN,
+                        PssPCBOpcode.SET_PROPORTIONAL_GAIN,
+                        PssPCBOpcode.SET_RMS_CONTROL):
+            model.parameters[(opcode.name.lower(), values[0])] = values[1]
+        elif opcode in (PssPCBOpcode.SET_RMS_POSITION,
+                        PssPCBOpcode.SET_REGULATING_VALVE):
+            model.parameters[(opcode.name.lower(), 0)] = values[0]
+
+        reply = REPLY_STRUCTS.get(opcode)
+        if reply is None:
+            return b""
+        if opcode == PssPCBOpcode.CHECK_HOMING:
+            return reply.pack(model.get_homed_mask())
+        if opcode == PssPCBOpcode.CHECK_BUSY:
+            return reply.pack(model.get_busy_mask())
+        if opcode == PssPCBOpcode.CHECK_DRIVER_COMMUNICATION:
+            return reply.pack(1, 1)
+        if opcode == PssPCBOpcode.CHECKED_DISTANCE_MOTION:
+            return reply.pack(*values)
+        return reply.pack(model.get_position(values[0]))
+
+
+def main():
+    """Runs a PCB simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5030)
+    parser.add_argument("--sensors",
+                        type=int,
+                        default=8,
+                        help="number of pressure sensors")
+    parser.add_argument("--latency",
+                        type=float,
+                        default=0.0,
+                        help="delay added to every reply [s]")
+    parser.add_argument("--jitter",
+                        type=float,
+                        default=0.0,
+                        help="maximum random delay added to every reply [s]")
+    parser.add_argument("--single-client",
+                        action="store_true",
+                        help="refuse connections while one is open")
+    args = parser.parse_args()
+
+    simulator = PssPCBSimulator(PssPCBModel(n_sensors=args.sensors),
+                                args.host,
+                                args.port,
+                                args.latency,
+                                args.jitter,
+                                single_client=args.single_client)
+    simulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Module defining a deadline-aware wait on a condition.
+
+It replaces the polling loops with fixed sleeps. The condition is polled with
+a short interval first, which grows geometrically up to a maximum, so fast
+transitions are detected quickly and long ones do not flood the hardware with
+requests. Each wait has a hard deadline, can be cancelled from another thread
+and its duration is recorded in shared statistics.
+
+Typical usage example:
+
+elapsed = wait_until(lambda: motor.get_speed() == 0,
+                     timeout=5,
+                     description="motor stop")
+"""
+import threading
+import time
+from collections.abc import Callable
+
+from alibrary.electronics.stats import TransactionStats
+from alibrary.logger import logger
+
+# Statistics of every wait, by description
+wait_stats = TransactionStats()
+
+
+class WaitTimeoutError(TimeoutError):
+    """Exception raised when a condition is not met before the deadline."""
+
+
+class WaitCancelledError(Exception):
+    """Exception raised when a wait is cancelled."""
+
+
+def wait_until(predicate: Callable[[], bool],
+               timeout: float | None,
+               description: str = "condition",
+               initial_interval: float = 0.001,
+               max_interval: float = 0.05,
+               backoff: float = 2.0,
+               cancel_event: threading.Event | None = None) -> float:
+    """Waits until the given predicate returns True.
+
+    The predicate is evaluated at once, then after intervals starting at
+    `initial_interval` and multiplied by `backoff` up to `max_interval`. It is
+    evaluated a last time at the deadline.
+
+    Args:
+        predicate: The condition to wait for
+        timeout: The maximum time to wait [s], None to wait forever
+        description: A description of the condition, used in the errors and
+        as key of the statistics
+        initial_interval: The first polling interval [s]
+        max_interval: The maximum polling interval [s]
+        backoff: The growth factor of the polling interval
+        cancel_event: An event that cancels the wait when it is set
+
+    Returns:
+        The time waited [s]
+
+    Raises:
+        WaitTimeoutError: The predicate is still False at the deadline
+        WaitCancelledError: The cancel event has been set
+        Exception: Any exception raised by the predicate is propagated
+    """
+    start = time.monotonic()
+    deadline = None if timeout is None else start + timeout
+    interval = initial_interval
+
+    try:
+        while not predicate():
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                wait_stats.record(description, now - start, timeout=True)
+                raise WaitTimeoutError(
+                    f"Timeout waiting {description} ({timeout}s)")
+
+            delay = interval if deadline is None else min(
+                interval, deadline - now)
+            if cancel_event is None:
+                time.sleep(delay)
+            elif cancel_event.wait(delay):
+                elapsed = time.monotonic() - start
+                wait_stats.record(description, elapsed, error=True)
+                raise WaitCancelledError(
+                    f"Wait for {description} cancelled after {elapsed:.3f}s")
+
+            interval = min(interval * backoff, max_interval)
+    except (WaitTimeoutError, WaitCancelledError):
+        raise
+    except Exception:
+        wait_stats.record(description, time.monotonic() - start, error=True)
+        raise
+
+    elapsed = time.monotonic() - start
+    wait_stats.record(description, elapsed)
+    logger.debug("Waited %.3fs for %s", elapsed, description)
+    return elapsed
+
+
+def get_wait_stats() -> dict[str,]:
+    """Returns the statistics of the waits.
+
+    Returns:
+        A JSON object with the number of waits, their errors, timeouts and
+        duration histograms, in total and by description
+    """
+    stats = wait_stats.get_stats()
+    return {"total": stats["total"], "by_description": stats["by_key"]}
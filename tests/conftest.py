@@ -0,0 +1,29 @@
+"""Shared fixtures of the alibrary tests."""
+import logging
+
+import pytest
+
+from alibrary.logger import logger
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fixture_log_file(tmp_path_factory):
+    """Writes the log of the test session outside of the working tree.
+
+    The aerosint logger writes to ./aerosint.log, which is versioned.
+    """
+    handlers = logger.handlers[:]
+    for handler in handlers:
+        logger.removeHandler(handler)
+
+    handler = logging.FileHandler(
+        tmp_path_factory.mktemp("logs") / "aerosint.log")
+    handler.setFormatter(logging.Formatter("[{asctime}] {levelname:>8}: "
+                                           "{message}",
+                                           style="{"))
+    logger.addHandler(handler)
+    yield
+    logger.removeHandler(handler)
+    handler.close()
+    for handler in handlers:
+        logger.addHandler(handler)
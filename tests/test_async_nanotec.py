@@ -0,0 +1,71 @@
+"""Tests of the asynchronous Nanotec readers against the local simulator."""
+import asyncio
+
+import pytest
+
+from alibrary.motions.nanotec import (AsyncNanotecStepper, NanotecStepperConfig,
+                                      gather_info, gather_telemetry)
+from alibrary.server import InternalServerError
+from alibrary.simulators import NanotecDriverModel, NanotecSimulator
+
+STEPPER_CONFIG = NanotecStepperConfig(max_speed=100,
+                                      min_abs_distance=-1000,
+                                      max_abs_distance=1000)
+
+
+async def read_homed(simulators: list[NanotecSimulator]) -> list[bool]:
+    steppers = [
+        AsyncNanotecStepper(STEPPER_CONFIG, simulator.host, simulator.port)
+        for simulator in simulators
+    ]
+    try:
+        for stepper in steppers:
+            await stepper.connect()
+        info = await gather_info(steppers)
+        homed = [await stepper.is_homed() for stepper in steppers]
+    finally:
+        for stepper in steppers:
+            stepper.close()
+    assert len(info) == len(steppers)
+    return homed
+
+
+def test_homed_bit_read_from_info_word():
+    with (NanotecSimulator(NanotecDriverModel(homed=True)) as homed,
+          NanotecSimulator(NanotecDriverModel()) as not_homed):
+        # A running motion sets the bit 0 of the information word
+        homed.model.write(homed.model.OPERATION_MODE_WRITE_ADDRESS,
+                          homed.model.VELOCITY_MODE)
+        homed.model.write(homed.model.TARGET_SPEED_ADDRESS, 1000)
+        for control_word in (0x06, 0x07, 0x0F):
+            homed.model.write(homed.model.CONTROL_WORD_ADDRESS, control_word)
+        assert homed.model.read(homed.model.READ_INFORMATION_ADDRESS) == 3
+
+        assert asyncio.run(read_homed([homed, not_homed])) == [True, False]
+
+
+def test_lost_connection_raises_server_error():
+
+    async def read_after_stop(simulator: NanotecSimulator):
+        stepper = AsyncNanotecStepper(STEPPER_CONFIG,
+                                      simulator.host,
+                                      simulator.port,
+                                      timeout=0.2)
+        await stepper.connect()
+        try:
+            await stepper.get_telemetry()
+            simulator.stop()
+            with pytest.raises(InternalServerError):
+                await gather_telemetry([stepper])
+        finally:
+            stepper.close()
+
+    with NanotecSimulator(NanotecDriverModel()) as simulator:
+        asyncio.run(read_after_stop(simulator))
+
+
+def test_unconnected_driver_raises_server_error():
+    stepper = AsyncNanotecStepper(STEPPER_CONFIG, "127.0.0.1", 1)
+
+    with pytest.raises(InternalServerError):
+        asyncio.run(stepper.get_info())
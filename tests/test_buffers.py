@@ -0,0 +1,53 @@
+"""Tests of the preallocated RingBuffer."""
+import numpy as np
+import pytest
+
+from alibrary.buffers import RingBuffer
+
+
+def test_wrapped_buffer_keeps_newest_samples_in_order():
+    buffer = RingBuffer(4, ("timestamp", "value"))
+    for index in range(6):
+        buffer.append((float(index), 10.0 * index))
+
+    assert buffer.is_full
+    assert len(buffer) == 4
+    np.testing.assert_array_equal(buffer.column("timestamp"), [2, 3, 4, 5])
+    np.testing.assert_array_equal(buffer.column("value"), [20, 30, 40, 50])
+    np.testing.assert_array_equal(buffer.latest(), [5, 50])
+
+
+def test_wrapped_buffer_selects_time_window():
+    buffer = RingBuffer(5, ("timestamp", "value"))
+    for index in range(12):
+        buffer.append((float(index), float(index)))
+
+    np.testing.assert_array_equal(buffer.column("value", start=8.5),
+                                  [9, 10, 11])
+    np.testing.assert_array_equal(buffer.column("value", end=8), [7, 8])
+    np.testing.assert_array_equal(buffer.column("value", 8, 10), [8, 9, 10])
+
+
+def test_samples_are_copies():
+    buffer = RingBuffer(2, ("timestamp", "value"))
+    buffer.append((0.0, 1.0))
+    samples = buffer.get_samples()
+    samples[0, 1] = 5.0
+
+    assert buffer.latest()[1] == 1.0
+
+
+def test_clear_empties_buffer():
+    buffer = RingBuffer(3, ("timestamp",))
+    for index in range(4):
+        buffer.append((float(index),))
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.latest() is None
+    assert buffer.get_samples().shape == (0, 1)
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBuffer(0, ("timestamp",))
@@ -0,0 +1,67 @@
+"""Tests of the read-through ModbusRegisterCache."""
+import time
+
+from alibrary.electronics.modbus_cache import ModbusRegisterCache
+
+
+def test_stored_range_served_until_ttl_expires():
+    cache = ModbusRegisterCache()
+    cache.add_range(5000, 4, ttl=0.05)
+    cached_range = cache.find(5001, 2)
+    assert cache.get(cached_range, 5001, 2) is None
+
+    cache.store(cached_range, [1, 2, 3, 4], time.monotonic())
+
+    assert cache.get(cached_range, 5001, 2) == [2, 3]
+    time.sleep(0.06)
+    assert cache.get(cached_range, 5001, 2) is None
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_registers_outside_ranges_are_not_cached():
+    cache = ModbusRegisterCache()
+    cache.add_range(5000, 2, ttl=1)
+
+    assert cache.find(5001, 2) is None
+    assert cache.find(4999, 1) is None
+
+
+def test_write_invalidates_related_ranges_only():
+    cache = ModbusRegisterCache()
+    cache.add_range(5000, 2, ttl=1, invalidated_by=[(6000, 2)])
+    cache.add_range(2000, 2, ttl=1, invalidated_by=[])
+    status, position = cache.find(5000, 2), cache.find(2000, 2)
+    cache.store(status, [1, 2], time.monotonic())
+    cache.store(position, [3, 4], time.monotonic())
+
+    cache.invalidate(6001, 1)
+
+    assert cache.get(status, 5000, 2) is None
+    assert cache.get(position, 2000, 2) == [3, 4]
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_range_without_list_invalidated_by_any_write():
+    cache = ModbusRegisterCache()
+    cache.add_range(5000, 2, ttl=1)
+    cached_range = cache.find(5000, 2)
+    cache.store(cached_range, [1, 2], time.monotonic())
+
+    cache.invalidate(7000, 2)
+
+    assert cache.get(cached_range, 5000, 2) is None
+
+
+def test_read_older_than_invalidation_is_not_stored():
+    cache = ModbusRegisterCache()
+    cache.add_range(5000, 2, ttl=1)
+    cached_range = cache.find(5000, 2)
+    cache.store(cached_range, [1, 2], time.monotonic())
+    sent = time.monotonic()
+
+    # The write is acknowledged while the read is in flight
+    cache.invalidate(5000, 2)
+    cache.store(cached_range, [1, 2], sent)
+
+    assert cache.get(cached_range, 5000, 2) is None
@@ -0,0 +1,55 @@
+"""Tests of the ModbusPipeline framing against a scripted server."""
+import socket
+import struct
+import time
+
+import pytest
+
+from alibrary.electronics.modbus_pipeline import (MBAP, ModbusPipeline,
+                                                  ModbusPipelineError)
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        server.settimeout(1)
+        yield server
+
+
+def connect(server: socket.socket, pipeline: ModbusPipeline) -> socket.socket:
+    """Connects the pipeline and returns the server side of the connection."""
+    assert pipeline.connect()
+    connection, _ = server.accept()
+    connection.settimeout(1)
+    return connection
+
+
+def test_body_split_from_header_is_reassembled(server):
+    pipeline = ModbusPipeline(*server.getsockname(), timeout=0.2)
+    connection = connect(server, pipeline)
+    with connection:
+        future = pipeline.submit_read(5000, 2)
+        transaction_id = struct.unpack_from(">H", connection.recv(256))[0]
+        connection.sendall(MBAP.pack(transaction_id, 0, 7, 1))
+        time.sleep(0.05)
+        connection.sendall(struct.pack(">BB2H", 4, 4, 0x1234, 0x5678))
+
+        assert future.result(timeout=1) == [0x1234, 0x5678]
+        assert pipeline.connected
+    pipeline.close()
+
+
+def test_stall_between_header_and_body_drops_connection(server):
+    pipeline = ModbusPipeline(*server.getsockname(), timeout=0.1)
+    connection = connect(server, pipeline)
+    with connection:
+        future = pipeline.submit_read(5000, 2)
+        transaction_id = struct.unpack_from(">H", connection.recv(256))[0]
+        connection.sendall(MBAP.pack(transaction_id, 0, 7, 1))
+
+        with pytest.raises(ModbusPipelineError, match="Connection lost"):
+            future.result(timeout=1)
+        # The late body is never parsed as a header
+        assert not pipeline.connected
+        with pytest.raises(ModbusPipelineError):
+            pipeline.submit_read(5000, 2)
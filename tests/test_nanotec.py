@@ -0,0 +1,191 @@
+"""Tests of NanotecStepper against the local Nanotec simulator."""
+import time
+
+import pytest
+
+from alibrary.motions.abstract.command import MotionType
+from alibrary.motions.nanotec import (NanotecBldc, NanotecBldcConfig,
+                                      NanotecBldcMotionCommand,
+                                      NanotecDriverState, NanotecStepper,
+                                      NanotecStepperConfig,
+                                      NanotecStepperMotionCommand,
+                                      start_synchronized)
+from alibrary.server import (BadRequestError, ConflictError,
+                             InternalServerError)
+from alibrary.simulators import NanotecDriverModel, NanotecSimulator
+
+STEPPER_CONFIG = NanotecStepperConfig(max_speed=100,
+                                      min_abs_distance=-1000,
+                                      max_abs_distance=1000)
+
+
+def absolute(distance: float, speed: float = 20) -> NanotecStepperMotionCommand:
+    return NanotecStepperMotionCommand(motion_type=MotionType.ABSOLUTE,
+                                       speed=speed,
+                                       distance=distance)
+
+
+def wait_idle(stepper: NanotecStepper, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while stepper.is_busy():
+        assert time.monotonic() < deadline, "motion not finished"
+        time.sleep(0.01)
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with NanotecSimulator(NanotecDriverModel(homed=True),
+                          latency=0.001) as simulator:
+        yield simulator
+
+
+@pytest.fixture(name="stepper")
+def fixture_stepper(simulator):
+    return NanotecStepper(STEPPER_CONFIG, simulator.host, port=simulator.port)
+
+
+def test_motion_reaches_target(stepper):
+    stepper.start(absolute(10))
+    wait_idle(stepper)
+
+    assert stepper.get_position() == pytest.approx(10)
+
+
+def test_tracked_motion_reaches_target(stepper):
+    handle = stepper.start(absolute(10), track=True)
+    handle.result(timeout=5)
+
+    assert stepper.get_position() == pytest.approx(10)
+    assert not stepper.is_busy()
+
+
+def test_homed_while_running_agrees_with_snapshot(stepper):
+    handle = stepper.start(absolute(20), track=True)
+
+    assert stepper.is_busy()
+    assert stepper.is_homed()
+    assert stepper.is_homed(max_age=0)
+    handle.result(timeout=5)
+
+
+def test_homing_required_before_motion():
+    with NanotecSimulator(NanotecDriverModel(position=3000)) as simulator:
+        stepper = NanotecStepper(STEPPER_CONFIG,
+                                 simulator.host,
+                                 port=simulator.port)
+        with pytest.raises(ConflictError):
+            stepper.start(absolute(10))
+
+        stepper.start(
+            NanotecStepperMotionCommand(motion_type=MotionType.HOMING,
+                                        speed=10))
+        wait_idle(stepper)
+
+        assert stepper.is_homed()
+        assert stepper.get_position() == pytest.approx(0)
+
+
+def test_pipelined_reads_match_their_responses(simulator):
+    stepper = NanotecStepper(STEPPER_CONFIG,
+                             simulator.host,
+                             port=simulator.port,
+                             pipeline_window=4)
+    stepper.start(absolute(12))
+    wait_idle(stepper)
+
+    futures = [
+        stepper.submit_read_block(address, 2)
+        for address in (stepper.ACTUAL_POSITION_ADDRESS,
+                        stepper.READ_INFORMATION_ADDRESS) * 4
+    ]
+    results = [future.result(timeout=2) for future in futures]
+
+    assert results[0::2] == [results[0]] * 4
+    assert results[1::2] == [results[1]] * 4
+    assert results[0] != results[1]
+
+
+def test_queued_motions_run_back_to_back(stepper):
+    handle = stepper.queue_motions([absolute(5), absolute(10), absolute(15)])
+    handle.result(timeout=10)
+
+    assert stepper.get_position() == pytest.approx(15)
+
+
+def test_stuck_setpoint_buffer_fails_queue(stepper, monkeypatch):
+    # The drive never takes the buffered set-point
+    monkeypatch.setattr(stepper, "_NanotecDriver__is_setpoint_buffer_free",
+                        lambda: False)
+    monkeypatch.setattr(stepper, "QUEUE_MARGIN", 0.2)
+
+    handle = stepper.queue_motions([absolute(5), absolute(10), absolute(15)])
+    with pytest.raises(InternalServerError):
+        handle.result(timeout=5)
+
+
+def test_fast_stop_holds_interrupted_motion(simulator, stepper):
+    stepper.start(absolute(500))
+    time.sleep(0.1)
+
+    duration = stepper.stop(fast=True)
+    position = stepper.get_position()
+    time.sleep(0.1)
+
+    assert duration < 0.5
+    assert 0 < position < 500
+    assert stepper.get_position() == pytest.approx(position)
+    assert simulator.model.state == NanotecDriverState.SWITCHED_ON
+
+
+def test_fast_stop_of_speed_motion(simulator):
+    bldc = NanotecBldc(NanotecBldcConfig(max_speed=100),
+                       simulator.host,
+                       port=simulator.port)
+    bldc.start(
+        NanotecBldcMotionCommand(motion_type=MotionType.SPEED, speed=50))
+    time.sleep(0.1)
+
+    bldc.stop(fast=True)
+
+    assert simulator.model.velocity == 0
+    assert simulator.model.state == NanotecDriverState.SWITCHED_ON
+
+
+def test_synchronized_start_of_several_drivers():
+    with (NanotecSimulator(NanotecDriverModel(homed=True)) as first,
+          NanotecSimulator(NanotecDriverModel(homed=True)) as second,
+          NanotecSimulator(NanotecDriverModel(homed=True)) as third):
+        simulators = (first, second, third)
+        steppers = [
+            NanotecStepper(STEPPER_CONFIG,
+                           simulator.host,
+                           port=simulator.port) for simulator in simulators
+        ]
+        report = start_synchronized(
+            [(stepper, absolute(5 * index))
+             for index, stepper in enumerate(steppers, 1)],
+            track=True)
+        for handle in report.handles:
+            handle.result(timeout=5)
+
+        positions = [stepper.get_position() for stepper in steppers]
+
+        assert report.skew < 0.05
+        assert positions == pytest.approx([5, 10, 15])
+
+
+def test_synchronized_start_aborted_by_invalid_command():
+    with (NanotecSimulator(NanotecDriverModel(homed=True)) as first,
+          NanotecSimulator(NanotecDriverModel(homed=True)) as second):
+        simulators = (first, second)
+        steppers = [
+            NanotecStepper(STEPPER_CONFIG,
+                           simulator.host,
+                           port=simulator.port) for simulator in simulators
+        ]
+        with pytest.raises(BadRequestError):
+            start_synchronized([(steppers[0], absolute(5)),
+                                (steppers[1], absolute(5, speed=500))])
+        time.sleep(0.05)
+
+        assert [simulator.model.position for simulator in simulators] == [0, 0]
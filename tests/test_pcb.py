@@ -0,0 +1,235 @@
+"""Tests of PssPCB and its actuators against the local PCB simulator."""
+import os
+import pickle
+import threading
+import time
+
+import pytest
+
+from alibrary.electronics.pcb import PssPCB, PssPCBError, PssPCBOpcode
+from alibrary.electronics.pcb import _SharedSnapshot
+from alibrary.motions.abstract.command import MotionType
+from alibrary.motions.pcb.command import PCBScrewMotionCommand
+from alibrary.motions.pcb.motor import (PCBScrewConfig, PCBScrewMotor,
+                                        load_positions)
+from alibrary.pneumatic.valve import PneumaticValve
+from alibrary.server import ConflictError
+from alibrary.simulators import PssPCBModel, PssPCBSimulator
+from alibrary.wait import wait_until
+
+SCREW_CONFIG = PCBScrewConfig(steps_per_rev=200,
+                              microsteps_per_step=16,
+                              micron_per_rev=500,
+                              min_abs_distance=0,
+                              max_abs_distance=1000)
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    model = PssPCBModel(n_sensors=4, homing_time=0.05, pressure_noise=0)
+    with PssPCBSimulator(model, latency=0.001) as simulator:
+        yield simulator
+
+
+@pytest.fixture(name="pcb")
+def fixture_pcb(simulator):
+    pcb = PssPCB(4,
+                 simulator.host,
+                 simulator.port,
+                 timeout=0.3,
+                 heartbeat_period=None)
+    yield pcb
+    pcb.close()
+
+
+@pytest.fixture(autouse=True)
+def fixture_workdir(tmp_path, monkeypatch):
+    # The screw positions are saved in ./logs
+    monkeypatch.chdir(tmp_path)
+
+
+def test_regulated_pressure_reaches_setpoint(pcb):
+    valve = PneumaticValve(1, 1, 1, (0, 1), pcb, None)
+    valve.activate_regulation(0.5)
+
+    wait_until(lambda: abs(valve.get_pressure(max_age=0) - 0.5) < 0.01, 2,
+               "pressure regulation")
+    assert valve.get_pressure(max_age=0) == pytest.approx(0.5, abs=0.01)
+
+
+def test_stepper_status_read_once_for_concurrent_callers(simulator, pcb):
+    screws = [PCBScrewMotor(index, pcb, SCREW_CONFIG) for index in range(6)]
+    valves = [
+        PneumaticValve(index, index, 8 + index, (0, 1), pcb, None)
+        for index in range(2)
+    ]
+    barrier = threading.Barrier(8)
+
+    def query():
+        barrier.wait()
+        for screw in screws:
+            screw.is_busy()
+        for valve in valves:
+            valve.is_homing_done()
+
+    simulator.requests.clear()
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert simulator.requests[PssPCBOpcode.CHECK_BUSY] == 1
+    assert simulator.requests[PssPCBOpcode.CHECK_HOMING] == 1
+
+
+def test_stepper_status_invalidated_by_motion(pcb):
+    pcb.perform_homing(3)
+    wait_until(lambda: not pcb.get_stepper_status().is_busy(3), 2, "homing")
+
+    pcb.get_stepper_status(max_age=10)
+    pcb.perform_distance_motion(3, 5000)
+
+    assert pcb.get_stepper_status(max_age=10).is_busy(3)
+
+
+def test_shared_snapshot_keeps_newer_flight_after_invalidation():
+
+    class Snapshot:
+        age = 0.0
+
+    shared = _SharedSnapshot()
+    gates = [threading.Event(), threading.Event()]
+    reads = []
+
+    def read(gate):
+
+        def function():
+            reads.append(gate)
+            gate.wait(2)
+            return Snapshot()
+
+        return function
+
+    old = threading.Thread(target=shared.get, args=(-1, read(gates[0])))
+    old.start()
+    wait_until(lambda: len(reads) == 1, 1, "first read")
+    shared.invalidate()
+    new = threading.Thread(target=shared.get, args=(-1, read(gates[1])))
+    new.start()
+    wait_until(lambda: len(reads) == 2, 1, "second read")
+
+    gates[0].set()
+    old.join()
+    follower = threading.Thread(target=shared.get, args=(-1, read(gates[1])))
+    follower.start()
+    wait_until(lambda: shared.counters["joins"] == 1, 1, "join")
+    gates[1].set()
+    new.join()
+    follower.join()
+
+    assert len(reads) == 2
+
+
+def test_stalled_reply_fails_then_reconnects(simulator, pcb):
+    simulator.inject_fault("stall", PssPCBOpcode.CHECK_BUSY)
+
+    with pytest.raises(PssPCBError):
+        pcb.check_busy()
+    assert not pcb.connection.is_connected
+
+    wait_until(lambda: pcb.connection.is_connected, 5, "reconnection")
+    assert pcb.check_busy() == 0
+    assert pcb.get_connection_info()["reconnects"] == 1
+
+
+def test_dropped_connection_fails_fast_until_reconnected(simulator, pcb):
+    simulator.inject_fault("drop")
+
+    with pytest.raises(PssPCBError):
+        pcb.get_raw_pressures(max_age=0)
+    start = time.monotonic()
+    with pytest.raises(PssPCBError):
+        pcb.check_homing_done()
+    assert time.monotonic() - start < 0.1
+
+    wait_until(lambda: pcb.connection.is_connected, 5, "reconnection")
+    assert len(pcb.get_raw_pressures(max_age=0)) == 4
+    assert simulator.faults["drop"] == 1
+
+
+def test_single_client_pcb_reconnects_after_stall():
+    model = PssPCBModel(n_sensors=4, pressure_noise=0)
+    with PssPCBSimulator(model, single_client=True) as simulator:
+        pcb = PssPCB(4,
+                     simulator.host,
+                     simulator.port,
+                     timeout=0.3,
+                     heartbeat_period=None)
+        try:
+            # The connection is served, the server no longer listens
+            assert pcb.check_busy() == 0
+            with pytest.raises(PssPCBError):
+                PssPCB(4, simulator.host, simulator.port, timeout=0.3)
+
+            simulator.inject_fault("stall", PssPCBOpcode.CHECK_BUSY)
+            with pytest.raises(PssPCBError):
+                pcb.check_busy()
+
+            wait_until(lambda: pcb.connection.is_connected, 5, "reconnection")
+            assert pcb.check_busy() == 0
+            assert pcb.get_connection_info()["reconnects"] == 1
+        finally:
+            pcb.close()
+
+
+def test_heartbeat_checks_idle_link(simulator):
+    pcb = PssPCB(4,
+                 simulator.host,
+                 simulator.port,
+                 timeout=0.3,
+                 heartbeat_period=0.05)
+    try:
+        wait_until(
+            lambda: pcb.get_connection_info()["heartbeat"]["count"] >= 2, 2,
+            "heartbeats")
+    finally:
+        pcb.close()
+
+
+def test_blade_screws_start_in_one_exchange(simulator, pcb):
+    screws = [PCBScrewMotor(index, pcb, SCREW_CONFIG) for index in (0, 1)]
+    absolute = PCBScrewMotionCommand(motion_type=MotionType.ABSOLUTE,
+                                     distance=200)
+
+    with pytest.raises(ConflictError):
+        PCBScrewMotor.start_all(screws, absolute)
+
+    homing = PCBScrewMotionCommand(motion_type=MotionType.HOMING, distance=0)
+    for handle in PCBScrewMotor.start_all(screws, homing, track=True):
+        handle.result(timeout=5)
+
+    simulator.requests.clear()
+    handles = PCBScrewMotor.start_all(screws, absolute, track=True)
+    for handle in handles:
+        handle.result(timeout=5)
+
+    assert simulator.requests[PssPCBOpcode.CHECK_BUSY] >= 1
+    assert simulator.requests[PssPCBOpcode.DISTANCE_MOTION] == 2
+    assert pcb.get_stats()["by_key"]["distance_motions"]["count"] == 1
+    assert [pcb.get_actual_position(screw.index) for screw in screws] == [
+        1280, 1280
+    ]
+    assert load_positions() == {0: 200, 1: 200}
+
+
+def test_screw_position_loaded_from_legacy_file(pcb):
+    os.makedirs("./logs")
+    with open("./logs/screw_stepper_1_position", "wb") as f:
+        pickle.dump({1: 120.0}, f)
+
+    screw = PCBScrewMotor(1, pcb, SCREW_CONFIG)
+
+    assert screw.position == 120.0
+    # Read over the same connection, after the command without reply
+    assert pcb.get_actual_position(1) == 768
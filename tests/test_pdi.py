@@ -0,0 +1,113 @@
+"""Tests of NanotecPdiMotor against the local Nanotec simulator."""
+import time
+
+import pytest
+
+from alibrary.motions.abstract.command import MotionType
+from alibrary.motions.nanotec.pdi.command import NanotecPdiMotionCommand
+from alibrary.motions.nanotec.pdi.motor import (NanotecPdiCommand,
+                                                NanotecPdiConfig,
+                                                NanotecPdiFeedback,
+                                                NanotecPdiMotor,
+                                                NanotecPdiStatus)
+from alibrary.server import InternalServerError
+from alibrary.simulators import NanotecDriverModel, NanotecSimulator
+
+# One PDI unit is 1 µm (position) or 1 µm/s (speed), as in the simulator
+PDI_CONFIG = NanotecPdiConfig(max_speed=100,
+                              min_abs_distance=-100,
+                              max_abs_distance=100,
+                              position_factor=1000,
+                              speed_factor=1000)
+
+
+def motion(distance: float,
+           motion_type: MotionType = MotionType.ABSOLUTE,
+           speed: float = 100) -> NanotecPdiMotionCommand:
+    return NanotecPdiMotionCommand(motion_type=motion_type,
+                                   speed=speed,
+                                   distance=distance)
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator():
+    with NanotecSimulator(NanotecDriverModel(homed=True),
+                          latency=0.001) as simulator:
+        yield simulator
+
+
+@pytest.fixture(name="motor")
+def fixture_motor(simulator):
+    return NanotecPdiMotor(PDI_CONFIG, simulator.host, port=simulator.port)
+
+
+@pytest.mark.parametrize("status, running", [
+    (NanotecPdiStatus.VOLTAGE_ENABLED, True),
+    (NanotecPdiStatus.VOLTAGE_ENABLED | NanotecPdiStatus.TARGET_REACHED,
+     False),
+    (NanotecPdiStatus.VOLTAGE_ENABLED | NanotecPdiStatus.FAULT, False),
+    (NanotecPdiStatus(0), False),
+])
+def test_running_requires_enabled_power_stage(status, running):
+    feedback = NanotecPdiFeedback(timestamp=0.0,
+                                  status=status,
+                                  error_code=0,
+                                  value=0,
+                                  position=0.0)
+
+    assert feedback.running is running
+
+
+def test_absolute_motion_reaches_target(simulator, motor):
+    # 70 mm is 70000 PDI units, beyond 16 bits: the word order matters
+    handle = motor.start(motion(70), track=True)
+    handle.result(timeout=5)
+
+    assert simulator.model.position == pytest.approx(70000)
+    assert motor.get_position() == pytest.approx(70)
+    assert simulator.requests[23] >= 1
+
+
+def test_repeated_command_is_preceded_by_nop(simulator, motor):
+    motor.start(motion(10), track=True).result(timeout=5)
+    motor.start(motion(20), track=True).result(timeout=5)
+    motor.start(motion(5, MotionType.RELATIVE), track=True).result(timeout=5)
+
+    # The first NOP leaves the initial code unchanged, so it is not executed
+    assert simulator.model.pdi_commands == [
+        NanotecPdiCommand.MOVE_ABSOLUTE, NanotecPdiCommand.NOP,
+        NanotecPdiCommand.MOVE_ABSOLUTE, NanotecPdiCommand.MOVE_RELATIVE
+    ]
+    assert motor.get_position() == pytest.approx(25)
+
+
+def test_fault_blocks_motions_until_cleared(simulator, motor):
+    handle = motor.start(motion(50, speed=10), track=True)
+    simulator.model.inject_fault(0x2310)
+
+    with pytest.raises(InternalServerError, match="0x2310"):
+        handle.result(timeout=5)
+    assert motor.read_feedback().fault
+    with pytest.raises(InternalServerError, match="Clear it"):
+        motor.start(motion(10))
+
+    motor.clear_fault()
+
+    feedback = motor.read_feedback()
+    assert not feedback.fault
+    assert feedback.error_code == 0
+    motor.start(motion(10), track=True).result(timeout=5)
+    assert motor.get_position() == pytest.approx(10)
+
+
+def test_switch_off_disables_the_power_stage(simulator, motor):
+    motor.start(motion(50, speed=10))
+    time.sleep(0.05)
+    assert motor.is_busy()
+
+    motor.switch_off()
+
+    feedback = motor.read_feedback()
+    assert not feedback.running
+    assert NanotecPdiStatus.VOLTAGE_ENABLED not in feedback.status
+    assert simulator.model.pdi_commands[-1] == NanotecPdiCommand.SWITCH_OFF
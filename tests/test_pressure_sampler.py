@@ -0,0 +1,111 @@
+"""Tests of the PressureSampler history and statistics."""
+import time
+
+import numpy as np
+import pytest
+
+from alibrary.electronics.pcb import PressureSnapshot
+from alibrary.electronics.pressure_sampler import PressureSampler
+
+
+class FakePCB:
+    """Stands for a PssPCB whose first sensor counts the reads."""
+    n_sensors = 2
+    ip = "127.0.0.1"
+
+    def __init__(self) -> None:
+        self.pressure_max_age = 0.005
+        self.reads = 0
+
+    def get_pressure_snapshot(self, max_age: float) -> PressureSnapshot:
+        assert max_age == 0
+        self.reads += 1
+        pressures = np.array([float(self.reads), 0.5])
+        return PressureSnapshot(time.monotonic(), pressures, pressures)
+
+
+def append(sampler: PressureSampler, ages: list[float],
+           pressures: list[tuple[float, float]]):
+    now = time.monotonic()
+    for age, values in zip(ages, pressures):
+        sampler.buffer.append((now - age,) + values)
+
+
+def test_running_sampler_records_every_read():
+    pcb = FakePCB()
+    sampler = PressureSampler(pcb, rate=200, duration=1)
+
+    sampler.start()
+    assert pcb.pressure_max_age == pytest.approx(3 / 200)
+    time.sleep(0.1)
+    sampler.stop()
+
+    history = sampler.get_history()
+    assert pcb.pressure_max_age == 0.005
+    assert sampler.samples == pcb.reads == len(history)
+    assert len(history) >= 10
+    np.testing.assert_array_equal(history[:, 1], np.arange(1, pcb.reads + 1))
+    np.testing.assert_array_equal(history[:, 2], 0.5)
+
+
+def test_statistics_over_window():
+    sampler = PressureSampler(FakePCB(), rate=10, duration=1)
+    append(sampler, [3.0, 0.4, 0.3, 0.2, 0.1],
+           [(9.0, 9.0), (0.1, 1.0), (0.2, 1.0), (0.3, 1.0), (0.4, 1.0)])
+
+    statistics = sampler.get_statistics(window=1)
+
+    assert statistics["samples"] == 4
+    first, second = statistics["sensors"]
+    assert first["mean"] == pytest.approx(0.25)
+    assert first["min"] == pytest.approx(0.1)
+    assert first["max"] == pytest.approx(0.4)
+    assert first["variance"] == pytest.approx(0.0125)
+    assert second["variance"] == 0
+
+
+def test_empty_window_has_no_statistics():
+    sampler = PressureSampler(FakePCB(), rate=10, duration=1)
+
+    assert sampler.get_statistics(window=1) == {
+        "samples": 0,
+        "window": 1,
+        "sensors": []
+    }
+
+
+def test_json_history_is_decimated():
+    sampler = PressureSampler(FakePCB(), rate=100, duration=1)
+    append(sampler, [0.01 * index for index in range(100, 0, -1)],
+           [(float(index), 0.0) for index in range(100)])
+
+    result = sampler.to_json(max_points=10)
+
+    assert result["samples"] == 10
+    assert result["step"] == 10
+    assert result["timestamp"][-1] == 0
+    assert result["pressures"][0] == list(range(0, 100, 10))
+
+
+def test_settling_time_measured_from_regulation_step():
+    sampler = PressureSampler(FakePCB(), rate=10, duration=1)
+    since = time.monotonic() - 0.5
+    append(sampler, [0.7, 0.4, 0.3, 0.2, 0.1, 0.0],
+           [(0.2, 0.0), (0.0, 0.0), (0.1, 0.0), (0.25, 0.0), (0.2, 0.0),
+            (0.205, 0.0)])
+
+    # The sample before the step is ignored
+    assert sampler.get_settling_time(0, 0.2, 0.01,
+                                     since) == pytest.approx(0.4, abs=1e-3)
+    # Within the tolerance from the first sample
+    assert sampler.get_settling_time(1, 0.0, 0.01,
+                                     since) == pytest.approx(0.1, abs=1e-3)
+
+
+def test_unsettled_pressure_has_no_settling_time():
+    sampler = PressureSampler(FakePCB(), rate=10, duration=1)
+    since = time.monotonic() - 0.5
+    append(sampler, [0.2, 0.1], [(0.2, 0.0), (0.3, 0.0)])
+
+    assert sampler.get_settling_time(0, 0.2, 0.01, since) is None
+    assert sampler.get_settling_time(0, 0.2, 0.01, time.monotonic()) is None
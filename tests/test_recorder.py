@@ -0,0 +1,67 @@
+"""Tests of NanotecRecorder against the local Nanotec simulator."""
+import time
+
+import numpy as np
+import pytest
+
+from alibrary.motions.abstract.command import MotionType
+from alibrary.motions.nanotec import (NanotecRecorder, NanotecStepper,
+                                      NanotecStepperConfig,
+                                      NanotecStepperMotionCommand)
+from alibrary.simulators import NanotecDriverModel, NanotecSimulator
+
+
+@pytest.fixture(name="stepper")
+def fixture_stepper():
+    with NanotecSimulator(NanotecDriverModel(homed=True),
+                          latency=0.001) as simulator:
+        yield NanotecStepper(NanotecStepperConfig(max_speed=100,
+                                                  min_abs_distance=0,
+                                                  max_abs_distance=100),
+                             simulator.host,
+                             port=simulator.port)
+
+
+def test_capture_records_motion_profile(stepper, tmp_path):
+    recorder = NanotecRecorder(stepper, rate=100, duration=5)
+    command = NanotecStepperMotionCommand(motion_type=MotionType.ABSOLUTE,
+                                          speed=50,
+                                          distance=10)
+
+    with recorder.capture(post=0.05) as capture:
+        stepper.start(command, track=True).result(timeout=5)
+
+    assert not recorder.is_running
+    assert len(capture) > 10
+    assert recorder.get_stats()["samples"] >= len(capture)
+    timestamps = capture.column("timestamp")
+    assert np.all(np.diff(timestamps) > 0)
+    positions = capture.column("position")
+    assert np.all(np.diff(positions) >= 0)
+    assert positions[-1] == pytest.approx(10)
+    assert capture.column("speed").max() == pytest.approx(50, rel=0.05)
+
+    capture.save(tmp_path / "motion.npz")
+    with np.load(tmp_path / "motion.npz") as archive:
+        np.testing.assert_array_equal(archive["position"], positions)
+
+
+def test_capture_json_is_decimated(stepper):
+    recorder = NanotecRecorder(stepper, rate=200, duration=5)
+    recorder.start()
+    try:
+        time.sleep(0.2)
+        with recorder.capture(pre=0.2) as capture:
+            pass
+    finally:
+        recorder.stop()
+
+    result = capture.to_json(max_points=5)
+    assert len(result["position"]) <= 5
+    assert result["samples"] == len(capture)
+    assert result["step"] > 1
+
+
+def test_unknown_field_is_rejected(stepper):
+    with pytest.raises(ValueError):
+        NanotecRecorder(stepper, fields=("position", "torque"))
@@ -0,0 +1,110 @@
+"""Tests of the TransactionStats counters."""
+import threading
+
+import pytest
+
+from alibrary.electronics.stats import TransactionStats
+
+
+def test_counters_by_key_and_total():
+    stats = TransactionStats()
+    stats.record("FC4", 0.0004, bytes_sent=12, bytes_received=13)
+    stats.record("FC4", 0.003, bytes_sent=12, bytes_received=13)
+    stats.record("FC16", 0.002, bytes_sent=17, error=True)
+    stats.record("FC16", 1.5, timeout=True)
+
+    result = stats.get_stats()
+    reads = result["by_key"]["FC4"]
+    assert reads["count"] == 2
+    assert reads["bytes_received"] == 26
+    assert reads["mean_latency_ms"] == pytest.approx(1.7)
+    assert reads["histogram"]["<=0.5ms"] == 1
+    assert reads["histogram"]["<=5ms"] == 1
+    assert result["by_key"]["FC16"]["errors"] == 2
+    assert result["by_key"]["FC16"]["timeouts"] == 1
+    assert result["total"]["count"] == 4
+    assert result["total"]["bytes_sent"] == 41
+    assert result["total"]["max_latency_ms"] == pytest.approx(1500)
+    assert result["total"]["histogram"][">2000ms"] == 0
+
+
+def test_operations_are_tagged_per_thread():
+    stats = TransactionStats()
+    started = threading.Event()
+    release = threading.Event()
+
+    def other_thread():
+        previous = stats.begin_operation("monitor")
+        started.set()
+        release.wait(1)
+        stats.record("FC4", 0.001)
+        stats.end_operation(previous)
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    started.wait(1)
+    previous = stats.begin_operation("start")
+    stats.record("FC16", 0.001)
+    stats.record("FC4", 0.001)
+    release.set()
+    thread.join()
+    stats.end_operation(previous)
+    stats.record("FC4", 0.001)
+
+    operations = stats.get_stats()["by_operation"]
+    assert operations["start"]["count"] == 2
+    assert operations["start"]["calls"] == 1
+    assert operations["monitor"]["count"] == 1
+    assert stats.operation is None
+
+
+def test_transactions_per_call():
+    stats = TransactionStats()
+    for _ in range(3):
+        previous = stats.begin_operation("start")
+        stats.record("FC16", 0.001)
+        stats.record("FC4", 0.001)
+        stats.end_operation(previous)
+
+    start = stats.get_stats()["by_operation"]["start"]
+    assert start["calls"] == 3
+    assert start["transactions_per_call"] == 2
+
+
+def test_reset_clears_counters():
+    stats = TransactionStats()
+    previous = stats.begin_operation("start")
+    stats.record("FC4", 0.001)
+    stats.end_operation(previous)
+
+    stats.reset_stats()
+
+    result = stats.get_stats()
+    assert result["total"]["count"] == 0
+    assert not result["by_key"]
+    assert not result["by_operation"]
+
+
+def test_nested_operations_count_for_every_active_one():
+    stats = TransactionStats()
+    outer = stats.begin_operation("start")
+    stats.record("FC4", 0.001)
+    inner = stats.begin_operation("stop")
+    stats.record("FC16", 0.001)
+    # A re-entrant operation is neither a new call nor counted twice
+    reentrant = stats.begin_operation("start")
+    stats.record("FC4", 0.001)
+    stats.end_operation(reentrant)
+    assert stats.operation == "stop"
+    stats.end_operation(inner)
+    assert stats.operations == ("start",)
+    stats.end_operation(outer)
+    # A transaction completing in another thread keeps its operations
+    stats.record("FC4", 0.001, operations=("start", "stop"))
+
+    operations = stats.get_stats()["by_operation"]
+    assert operations["start"]["count"] == 4
+    assert operations["start"]["calls"] == 1
+    assert operations["stop"]["count"] == 3
+    assert operations["stop"]["calls"] == 1
+    assert stats.operation is None
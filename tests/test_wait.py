@@ -0,0 +1,72 @@
+"""Tests of the deadline-aware wait_until."""
+import threading
+import time
+
+import pytest
+
+from alibrary.wait import (WaitCancelledError, WaitTimeoutError,
+                           get_wait_stats, wait_until)
+
+
+def test_true_predicate_returns_at_once():
+    calls = []
+
+    elapsed = wait_until(lambda: calls.append(1) or True, 1, "test ready")
+
+    assert len(calls) == 1
+    assert elapsed < 0.01
+
+
+def test_polling_interval_grows_up_to_maximum():
+    calls = []
+
+    def predicate():
+        calls.append(time.monotonic())
+        return len(calls) == 8
+
+    wait_until(predicate,
+               1,
+               "test backoff",
+               initial_interval=0.002,
+               max_interval=0.01)
+
+    intervals = [b - a for a, b in zip(calls, calls[1:])]
+    assert intervals[-1] > intervals[0]
+    assert max(intervals) < 0.05
+
+
+def test_timeout_evaluates_predicate_at_deadline():
+    start = time.monotonic()
+
+    with pytest.raises(WaitTimeoutError):
+        wait_until(lambda: False, 0.05, "test timeout", max_interval=1)
+
+    assert 0.05 <= time.monotonic() - start < 0.5
+    assert get_wait_stats()["by_description"]["test timeout"]["timeouts"] == 1
+
+
+def test_cancel_event_interrupts_wait():
+    cancel = threading.Event()
+    threading.Timer(0.02, cancel.set).start()
+    start = time.monotonic()
+
+    with pytest.raises(WaitCancelledError):
+        wait_until(lambda: False,
+                   None,
+                   "test cancel",
+                   max_interval=1,
+                   initial_interval=1,
+                   cancel_event=cancel)
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_predicate_errors_are_propagated():
+
+    def predicate():
+        raise ValueError("broken sensor")
+
+    with pytest.raises(ValueError):
+        wait_until(predicate, 1, "test error")
+
+    assert get_wait_stats()["by_description"]["test error"]["errors"] == 1